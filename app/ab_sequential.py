@@ -0,0 +1,244 @@
+"""
+Akış (streaming) halinde sıralı A/B testi.
+Olaylar geldikçe varyant başına sayaçlar ve harcama için Welford ortalama /
+varyans birikimleri güncellenir; geçmiş olaylar saklanmaz ve yeniden
+taranmaz, bellek olay sayısından bağımsızdır. Olay grupları bincount ile
+özetlenip Chan birleştirme formülüyle eklenir; tekil olaylar O(1) günceller.
+
+Anlamlılık her grup güncellemesinde ve her bakışta karışımlı sıralı olasılık oranı testiyle (mSPRT,
+normal karışım) hesaplanır. Bu testin p-değerleri ve güven dizileri "her an
+geçerlidir": sonuçlar istenildiği kadar sık izlenip test istenildiği anda
+durdurulabilir, klasik testlerdeki "erken bakma" hatası oluşmaz.
+
+Kullanım:
+    python -m app.ab_sequential benchmark --events 10000000 --variants 4
+"""
+
+import argparse
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+ALPHA = 0.05
+MIXTURE_EFFECT = 0.1  # Karışım dağılımının standart sapması (kullanıcı başına standart sapma cinsinden etki)
+HISTORY_SIZE = 500  # Grafikte tutulan en fazla güncelleme sayısı
+
+
+class StreamingABTest:
+    """
+    Varyant başına sabit boyutlu birikimlerle sıralı A/B testi.
+
+    Args:
+        variants (list): Varyant adları; ilki kontrol grubudur
+        alpha (float): Anlamlılık düzeyi
+        mixture_effect (float): mSPRT karışım ölçeği (standartlaştırılmış etki büyüklüğü)
+    """
+
+    def __init__(self, variants=('A', 'B'), alpha=ALPHA, mixture_effect=MIXTURE_EFFECT):
+        self.variants = [str(v) for v in variants]
+        self._codes = {v: i for i, v in enumerate(self.variants)}
+        self.alpha = alpha
+        self.mixture_effect = mixture_effect
+        self.reset()
+
+    def reset(self):
+        k = len(self.variants)
+        self.users = np.zeros(k, dtype=np.int64)
+        self.conversions = np.zeros(k, dtype=np.int64)
+        self.spend_mean = np.zeros(k)  # Dönüşen kullanıcı harcaması (Welford)
+        self.spend_m2 = np.zeros(k)
+        self.events = 0
+        # Her an geçerli p-değerleri zamanla yalnızca azalır
+        self.p_conversion = np.ones(k)
+        self.p_spend = np.ones(k)
+        self.rate_half_width = np.full(k, np.inf)
+        self.spend_half_width = np.full(k, np.inf)
+        self.history = deque(maxlen=HISTORY_SIZE)
+        self._evaluated_events = 0
+
+    def _variant_codes(self, groups):
+        if isinstance(groups, pd.Series) and isinstance(groups.dtype, pd.CategoricalDtype):
+            lookup = np.array([self._codes[str(v)] for v in groups.cat.categories])
+            return lookup[groups.cat.codes.to_numpy()]
+        groups = np.asarray(groups)
+        if groups.dtype.kind in 'iu':
+            return groups.astype(np.int64)
+        codes, uniques = pd.factorize(groups)
+        return np.array([self._codes[str(v)] for v in uniques], dtype=np.int64)[codes]
+
+    def update_event(self, group, converted, spend=0.0):
+        """
+        Tek olay: sayaçlar ve Welford birikimleri O(1) güncellenir.
+
+        Testler bir sonraki results() çağrısında (bakışta) değerlendirilir; mSPRT p-değerleri
+        hangi anlarda bakıldığından bağımsız olarak geçerlidir.
+        """
+        i = self._codes[str(group)]
+        self.users[i] += 1
+        self.events += 1
+        if converted:
+            self.conversions[i] += 1
+            delta = spend - self.spend_mean[i]
+            self.spend_mean[i] += delta / self.conversions[i]
+            self.spend_m2[i] += delta * (spend - self.spend_mean[i])
+
+    def update(self, groups, converted, spend):
+        """
+        Olay grubunu ekler; grup istatistikleri bincount ile özetlenip birikimlerle birleştirilir.
+
+        Args:
+            groups: Varyant adları ya da kodları
+            converted: Dönüşüm (0/1)
+            spend: Harcama (yalnızca dönüşen olaylarda kullanılır)
+        """
+        k = len(self.variants)
+        codes = self._variant_codes(groups)
+        converted = np.asarray(converted).astype(bool)
+        values = np.asarray(spend, dtype=np.float64)[converted]
+        converted_codes = codes[converted]
+
+        batch_users = np.bincount(codes, minlength=k)
+        batch_n = np.bincount(converted_codes, minlength=k)
+        batch_mean = np.bincount(converted_codes, weights=values, minlength=k) / np.maximum(batch_n, 1)
+        batch_m2 = np.bincount(converted_codes, weights=(values - batch_mean[converted_codes]) ** 2, minlength=k)
+
+        # Chan paralel birleştirme: (n_a, ortalama_a, M2_a) + (n_b, ortalama_b, M2_b)
+        total = self.conversions + batch_n
+        delta = batch_mean - self.spend_mean
+        share = np.divide(batch_n, total, out=np.zeros(k), where=total > 0)
+        self.spend_m2 += batch_m2 + delta ** 2 * self.conversions * share
+        self.spend_mean += delta * share
+        self.conversions = total
+        self.users += batch_users
+        self.events += len(codes)
+        self._update_tests()
+
+    @property
+    def spend_var(self):
+        return np.divide(self.spend_m2, self.conversions - 1, out=np.zeros(len(self.variants)),
+                         where=self.conversions > 1)
+
+    def _msprt(self, diff, variance, unit_variance):
+        """
+        Normal karışımlı mSPRT olasılık oranı ve her an geçerli güven dizisi yarı genişliği.
+
+        diff: kontrol ile fark tahmini, variance: tahminin varyansı, unit_variance: kullanıcı başına varyans
+        """
+        tau2 = self.mixture_effect ** 2 * unit_variance
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_ratio = 0.5 * np.log(variance / (variance + tau2)) + \
+                tau2 * diff ** 2 / (2 * variance * (variance + tau2))
+            half_width = np.sqrt(variance * (variance + tau2) / tau2 *
+                                 (2 * np.log(1 / self.alpha) + np.log((variance + tau2) / variance)))
+        valid = (variance > 0) & (tau2 > 0)
+        return np.where(valid, log_ratio, 0.0), np.where(valid, half_width, np.inf)
+
+    def _update_tests(self):
+        self._evaluated_events = self.events
+        c = 0
+        rate = self.conversions / np.maximum(self.users, 1)
+        pooled = (self.conversions + self.conversions[c]) / np.maximum(self.users + self.users[c], 1)
+        rate_variance = pooled * (1 - pooled) * (1 / np.maximum(self.users, 1) + 1 / max(self.users[c], 1))
+        log_ratio, self.rate_half_width = self._msprt(rate - rate[c], rate_variance, pooled * (1 - pooled))
+        self.p_conversion = np.minimum(self.p_conversion, np.minimum(1, np.exp(-log_ratio)))
+
+        var = self.spend_var
+        spend_variance = var / np.maximum(self.conversions, 1) + var[c] / max(self.conversions[c], 1)
+        log_ratio, self.spend_half_width = self._msprt(self.spend_mean - self.spend_mean[c], spend_variance,
+                                                       (var + var[c]) / 2)
+        self.p_spend = np.minimum(self.p_spend, np.minimum(1, np.exp(-log_ratio)))
+        self.p_conversion[c] = self.p_spend[c] = 1.0
+        self.history.append((self.events, *self.p_conversion[1:], *self.p_spend[1:]))
+
+    def results(self):
+        """Varyant başına güncel istatistikler, her an geçerli p-değerleri ve güven dizileri."""
+        if self.events != self._evaluated_events:
+            self._update_tests()
+        rate = self.conversions / np.maximum(self.users, 1) * 100
+        rate_diff = rate - rate[0]
+        spend_diff = self.spend_mean - self.spend_mean[0]
+        table = pd.DataFrame({
+            'Kullanıcı': self.users,
+            'Dönüşüm Oranı (%)': rate,
+            'Oran Farkı (puan)': rate_diff,
+            'Oran Farkı Alt (puan)': rate_diff - self.rate_half_width * 100,
+            'Oran Farkı Üst (puan)': rate_diff + self.rate_half_width * 100,
+            'p (dönüşüm)': self.p_conversion,
+            'Ortalama Harcama (TL)': self.spend_mean,
+            'Harcama Farkı (TL)': spend_diff,
+            'Harcama Farkı Alt (TL)': spend_diff - self.spend_half_width,
+            'Harcama Farkı Üst (TL)': spend_diff + self.spend_half_width,
+            'p (harcama)': self.p_spend,
+        }, index=pd.Index(self.variants, name='varyant'))
+        table.iloc[0, [3, 4, 5, 8, 9, 10]] = np.nan
+        table['Dönüşüm Anlamlı'] = table['p (dönüşüm)'] < self.alpha
+        table['Harcama Anlamlı'] = table['p (harcama)'] < self.alpha
+        return table
+
+    def history_frame(self):
+        """Güncelleme başına her an geçerli p-değerleri (uzun tablo, grafik için)."""
+        treatments = self.variants[1:]
+        columns = ['Olay'] + [f'{v} dönüşüm' for v in treatments] + [f'{v} harcama' for v in treatments]
+        history = pd.DataFrame(list(self.history), columns=columns)
+        return history.melt(id_vars='Olay', var_name='Test', value_name='p-değeri')
+
+
+def benchmark_streaming(n_events=10_000_000, n_variants=4, batch_size=100_000):
+    """Akış güncellemesini her grupta tüm geçmişi yeniden tarayan groupby ile karşılaştırır."""
+    from app.datascience import generate_ab_test_data
+
+    variants = [chr(ord('A') + i) for i in range(n_variants)]
+    rates = {v: 0.12 + 0.005 * i for i, v in enumerate(variants)}
+    spending = {v: (150 + 2 * i, 30) for i, v in enumerate(variants)}
+    test = StreamingABTest(variants)
+
+    streaming, rescan, seen = 0.0, 0.0, []
+    for batch in range(n_events // batch_size):
+        data = generate_ab_test_data(batch_size, rates, spending, seed=batch)
+        start = time.perf_counter()
+        test.update(data['grup'], data['donusum'], data['harcama'])
+        streaming += time.perf_counter() - start
+
+        # Karşılaştırma: ilk 20 grupta geçmişin tamamı tutulup her grupta yeniden özetlenir
+        if batch < 20:
+            seen.append(data)
+            start = time.perf_counter()
+            history = pd.concat(seen, ignore_index=True)
+            history[history['donusum'] == 1].groupby('grup', observed=True)['harcama'].agg(['mean', 'var'])
+            rescan += time.perf_counter() - start
+
+    batches = n_events // batch_size
+    rescan_estimate = rescan / 20 ** 2 * batches ** 2  # Yeniden tarama maliyeti grup sayısının karesiyle büyür
+    print(f"{n_events:,} olay, {n_variants} varyant, {batch_size:,} olaylık gruplar")
+    print(f"  Akış güncellemesi: toplam {streaming:.2f} sn ({n_events / streaming:,.0f} olay/sn); durum varyant "
+          f"başına 5 sayı ve son {HISTORY_SIZE} güncellemenin p-değerleri, olay sayısından bağımsız")
+    print(f"  Geçmişi yeniden tarama (tahmini): {rescan_estimate:.1f} sn")
+
+    start = time.perf_counter()
+    single = StreamingABTest(variants)
+    for group, converted, spend in zip(data['grup'].astype(str)[:10_000], data['donusum'][:10_000],
+                                       data['harcama'][:10_000]):
+        single.update_event(group, converted, spend)
+    single.results()
+    print(f"  Tekil olay güncellemesi: {(time.perf_counter() - start) / 10_000 * 1e6:.1f} µs/olay")
+    print(test.results()[['Dönüşüm Oranı (%)', 'Oran Farkı (puan)', 'p (dönüşüm)', 'Harcama Farkı (TL)',
+                          'p (harcama)']].round(4).to_string())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Akış halinde sıralı A/B testi")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    bench_parser = subparsers.add_parser('benchmark', help="Akış güncellemesi ile yeniden taramayı karşılaştır")
+    bench_parser.add_argument('--events', type=int, default=10_000_000)
+    bench_parser.add_argument('--variants', type=int, default=4)
+    bench_parser.add_argument('--batch-size', type=int, default=100_000)
+
+    args = parser.parse_args(argv)
+    if args.command == 'benchmark':
+        benchmark_streaming(args.events, args.variants, args.batch_size)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+"""
+A/B(/n) test anlamlılık motoru.
+Varyant başına yeterli istatistikler (kullanıcı, dönüşüm, harcama toplamı ve
+kareler toplamı) tek geçişte bincount ile toplanır; tüm varyantlar kontrol
+grubuna karşı aynı anda (vektörel) test edilir:
+    - Dönüşüm oranı: iki oranlı z-testi
+    - Harcama (dönüşen kullanıcılar): Welch t-testi
+    - Güven aralıkları: 10.000 yeniden örneklemeli bootstrap; örneklemler satır
+      indeksleri yerine değer frekansları üzerinden tek binom / multinom matris
+      çekilişiyle üretilir, maliyet kullanıcı sayısından bağımsızdır
+Çoklu varyantta p-değerleri Holm yöntemiyle düzeltilir. Student t dağılımı için
+scipy isteğe bağlıdır; kurulu değilse normal yaklaşım kullanılır.
+
+Kullanım:
+    python -m app.ab_testing benchmark --users 5000000 --variants 4
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+import pandas as pd
+
+N_BOOTSTRAP = 10_000
+BOOTSTRAP_BINS = 256  # Farklı harcama değeri bundan fazlaysa kantil kutularının ortalamaları kullanılır
+ALPHA = 0.05
+
+
+def normal_sf(z):
+    """Standart normal dağılımın sağ kuyruk olasılığı."""
+    z = np.asarray(z, dtype=np.float64)
+    return 0.5 * np.frompyfunc(math.erfc, 1, 1)(z / math.sqrt(2)).astype(np.float64)
+
+
+def t_sf(t, df):
+    """Student t dağılımının sağ kuyruk olasılığı (scipy yoksa normal yaklaşım)."""
+    try:
+        from scipy.special import stdtr
+    except ImportError:
+        return normal_sf(t)
+    return stdtr(df, -np.asarray(t, dtype=np.float64))
+
+
+def holm_adjust(p_values):
+    """Holm-Bonferroni düzeltilmiş p-değerleri."""
+    p_values = np.asarray(p_values, dtype=np.float64)
+    order = np.argsort(p_values)
+    adjusted = np.maximum.accumulate(p_values[order] * (len(p_values) - np.arange(len(p_values))))
+    result = np.empty_like(p_values)
+    result[order] = np.minimum(adjusted, 1)
+    return result
+
+
+def _statistics(codes, variants, converted, values):
+    n_variants = len(variants)
+    return pd.DataFrame({
+        'kullanıcı': np.bincount(codes, minlength=n_variants),
+        'dönüşüm': np.bincount(codes[converted], minlength=n_variants),
+        'harcama_toplam': np.bincount(codes[converted], weights=values[converted], minlength=n_variants),
+        'harcama_kare_toplam': np.bincount(codes[converted], weights=values[converted] ** 2, minlength=n_variants),
+    }, index=pd.Index([str(v) for v in variants], name='varyant'))
+
+
+def variant_statistics(data, group_col='grup', conversion_col='donusum', value_col='harcama'):
+    """
+    Varyant başına yeterli istatistikler (tek geçiş).
+
+    Returns:
+        DataFrame: varyant indeksli; kullanıcı, dönüşüm, harcama_toplam, harcama_kare_toplam
+    """
+    codes, variants = pd.factorize(data[group_col], sort=True)
+    return _statistics(codes, variants, data[conversion_col].to_numpy().astype(bool),
+                       data[value_col].to_numpy(dtype=np.float64))
+
+
+def two_proportion_ztest(conversions_a, n_a, conversions_b, n_b):
+    """İki oranlı z-testi (birleştirilmiş varyans); dizilerle tüm varyantlar aynı anda test edilir."""
+    p_a, p_b = np.asarray(conversions_a) / n_a, np.asarray(conversions_b) / n_b
+    pooled = (np.asarray(conversions_a) + conversions_b) / (np.asarray(n_a) + n_b)
+    se = np.sqrt(pooled * (1 - pooled) * (1 / np.asarray(n_a) + 1 / np.asarray(n_b)))
+    z = np.divide(p_b - p_a, se, out=np.zeros(np.broadcast(p_a, p_b).shape), where=se > 0)
+    return z, 2 * normal_sf(np.abs(z))
+
+
+def welch_ttest(mean_a, var_a, n_a, mean_b, var_b, n_b):
+    """Welch t-testi (eşit olmayan varyanslar); t, serbestlik derecesi ve iki yönlü p-değeri."""
+    se_a, se_b = np.asarray(var_a) / n_a, np.asarray(var_b) / n_b
+    se = np.sqrt(se_a + se_b)
+    t = np.divide(np.asarray(mean_b) - mean_a, se, out=np.zeros(np.broadcast(se_a, se_b).shape), where=se > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        df = (se_a + se_b) ** 2 / (se_a ** 2 / (np.asarray(n_a) - 1) + se_b ** 2 / (np.asarray(n_b) - 1))
+    return t, df, 2 * t_sf(np.abs(t), df)
+
+
+def _value_frequencies(values, bins=BOOTSTRAP_BINS):
+    """
+    Bootstrap için değerler, frekansları ve kutu içi varyanslar.
+
+    Çok sayıda farklı değer eşit frekanslı kantil kutularına indirgenir; her kutu ortalaması ve
+    (popülasyon) varyansıyla temsil edilir. Tam değerlerde varyanslar sıfırdır.
+    """
+    ordered = np.sort(values)
+    starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])
+    if len(starts) <= bins:
+        counts = np.diff(np.r_[starts, len(ordered)])
+        return ordered[starts], counts, np.zeros(len(starts))
+    # Sıralı dizide eşit uzunluklu dilimler
+    starts = np.unique(np.arange(bins) * len(ordered) // bins)
+    counts = np.diff(np.r_[starts, len(ordered)])
+    levels = np.add.reduceat(ordered, starts) / counts
+    deviations = ordered - np.repeat(levels, counts)
+    return levels, counts, np.add.reduceat(deviations ** 2, starts) / counts
+
+
+def bootstrap_mean(values, n_resamples=N_BOOTSTRAP, rng=None):
+    """
+    Ortalamanın bootstrap dağılımı (n_resamples,).
+
+    Yeniden örneklem, değer frekansları üzerinden tek multinom çekilişiyle (n_resamples × farklı değer)
+    matris olarak üretilir; n satırlık indeks matrisi oluşturulmaz. Kantil kutularına indirgenmiş
+    verilerde bir kutudan çekilen k değerin toplamı k·ortalama etrafında k·varyans varyanslı normal
+    kabul edilir; kutu içi varyans böylece her yeniden örnekleme tek normal sapma olarak geri eklenir.
+    """
+    rng = rng or np.random.default_rng()
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) == 0:
+        return np.full(n_resamples, np.nan)
+    levels, counts, within = _value_frequencies(values)
+    draws = rng.multinomial(len(values), counts / counts.sum(), size=n_resamples)
+    totals = draws @ levels
+    if within.any():
+        totals += np.sqrt(draws @ within) * rng.standard_normal(n_resamples)
+    return totals / len(values)
+
+
+def bootstrap_proportion(conversions, n, n_resamples=N_BOOTSTRAP, rng=None):
+    """0/1 ortalamasının bootstrap dağılımı: yeniden örneklem sayımı Binom(n, p) ile tek çekilişte."""
+    rng = rng or np.random.default_rng()
+    return rng.binomial(n, conversions / max(n, 1), size=n_resamples) / max(n, 1)
+
+
+def analyze_ab_test(data, control=None, n_resamples=N_BOOTSTRAP, alpha=ALPHA, seed=0):
+    """
+    Tüm varyantları kontrol grubuna karşı test eder.
+
+    Args:
+        data (DataFrame): grup, donusum, harcama sütunları
+        control (str): Kontrol varyantı (varsayılan: alfabetik ilk varyant)
+        n_resamples (int): Bootstrap yeniden örneklem sayısı
+        alpha (float): Anlamlılık düzeyi
+        seed (int): Bootstrap rastgelelik tohumu
+
+    Returns:
+        DataFrame: Varyant başına dönüşüm ve harcama istatistikleri, fark, test istatistiği,
+            (Holm düzeltilmiş) p-değeri ve bootstrap güven aralıkları; kontrol satırında test sütunları boştur
+    """
+    codes, variants = pd.factorize(data['grup'], sort=True)
+    converted = data['donusum'].to_numpy().astype(bool)
+    values = data['harcama'].to_numpy(dtype=np.float64)
+    stats = _statistics(codes, variants, converted, values)
+    control = control if control is not None else stats.index[0]
+    rng = np.random.default_rng(seed)
+
+    n, conversions = stats['kullanıcı'].to_numpy(), stats['dönüşüm'].to_numpy()
+    rate = conversions / np.maximum(n, 1)
+    mean = stats['harcama_toplam'].to_numpy() / np.maximum(conversions, 1)
+    var = (stats['harcama_kare_toplam'].to_numpy() - conversions * mean ** 2) / np.maximum(conversions - 1, 1)
+
+    c = stats.index.get_loc(control)
+    z, p_conversion = two_proportion_ztest(conversions[c], n[c], conversions, n)
+    t, df, p_spend = welch_ttest(mean[c], var[c], conversions[c], mean, var, conversions)
+
+    # Bootstrap: varyant başına tek matris çekilişi, fark dağılımı kontrolünkiyle eşleştirilir
+    rate_draws = np.stack([bootstrap_proportion(conversions[i], n[i], n_resamples, rng) for i in range(len(n))])
+    spend_draws = np.stack([bootstrap_mean(values[converted & (codes == i)], n_resamples, rng)
+                            for i in range(len(n))])
+    quantiles = [alpha / 2, 1 - alpha / 2]
+    rate_ci = np.quantile((rate_draws - rate_draws[c]) * 100, quantiles, axis=1)
+    spend_ci = np.quantile(spend_draws - spend_draws[c], quantiles, axis=1)
+
+    treatment = np.arange(len(n)) != c
+    adjusted_conversion = np.full(len(n), np.nan)
+    adjusted_spend = np.full(len(n), np.nan)
+    adjusted_conversion[treatment] = holm_adjust(p_conversion[treatment])
+    adjusted_spend[treatment] = holm_adjust(p_spend[treatment])
+
+    result = pd.DataFrame({
+        'Kullanıcı': n,
+        'Dönüşüm': conversions,
+        'Dönüşüm Oranı (%)': rate * 100,
+        'Oran Farkı (puan)': (rate - rate[c]) * 100,
+        'Oran Farkı Alt (puan)': rate_ci[0],
+        'Oran Farkı Üst (puan)': rate_ci[1],
+        'z': z,
+        'p (dönüşüm)': adjusted_conversion,
+        'Ortalama Harcama (TL)': mean,
+        'Harcama Farkı (TL)': mean - mean[c],
+        'Harcama Farkı Alt (TL)': spend_ci[0],
+        'Harcama Farkı Üst (TL)': spend_ci[1],
+        't': t,
+        'p (harcama)': adjusted_spend,
+    }, index=stats.index)
+    result.loc[control, ['Oran Farkı Alt (puan)', 'Oran Farkı Üst (puan)', 'z', 'Harcama Farkı Alt (TL)',
+                         'Harcama Farkı Üst (TL)', 't']] = np.nan
+    result['Dönüşüm Anlamlı'] = result['p (dönüşüm)'] < alpha
+    result['Harcama Anlamlı'] = result['p (harcama)'] < alpha
+    return result
+
+
+def benchmark_ab_test(n_users=5_000_000, n_variants=4, n_resamples=N_BOOTSTRAP):
+    """Vektörel veri üretimini satır bazlı apply ile, anlamlılık motorunu uçtan uca ölçer."""
+    from app.datascience import generate_ab_test_data
+
+    variants = [chr(ord('A') + i) for i in range(n_variants)]
+    rates = {v: 0.12 + 0.01 * i for i, v in enumerate(variants)}
+    spending = {v: (150 + 3 * i, 30) for i, v in enumerate(variants)}
+
+    start = time.perf_counter()
+    data = generate_ab_test_data(n_users, rates, spending)
+    generate = time.perf_counter() - start
+
+    # Eski satır bazlı yöntem (np.random.choice ile apply), 100k satırdan ölçeklenerek
+    sample = pd.Series(np.random.choice(variants, size=100_000))
+    start = time.perf_counter()
+    sample.apply(lambda v: np.random.choice([0, 1], p=[1 - rates[v], rates[v]]))
+    per_row = (time.perf_counter() - start) / len(sample)
+
+    start = time.perf_counter()
+    result = analyze_ab_test(data, n_resamples=n_resamples)
+    analyze = time.perf_counter() - start
+
+    print(f"{n_users:,} kullanıcı, {n_variants} varyant")
+    print(f"  Veri üretimi: {generate:.2f} sn (satır bazlı apply ile tahmini {per_row * n_users:.0f} sn)")
+    print(f"  z / Welch testleri + {n_resamples:,} bootstrap: {analyze:.2f} sn")
+    print(result[['Dönüşüm Oranı (%)', 'Oran Farkı (puan)', 'p (dönüşüm)', 'Harcama Farkı (TL)',
+                  'p (harcama)']].round(4).to_string())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="A/B test anlamlılık motoru")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    bench_parser = subparsers.add_parser('benchmark', help="Veri üretimi ve analiz süresini ölç")
+    bench_parser.add_argument('--users', type=int, default=5_000_000)
+    bench_parser.add_argument('--variants', type=int, default=4)
+    bench_parser.add_argument('--resamples', type=int, default=N_BOOTSTRAP)
+
+    args = parser.parse_args(argv)
+    if args.command == 'benchmark':
+        benchmark_ab_test(args.users, args.variants, args.resamples)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+"""
+Yaklaşık tekil sayım (HyperLogLog) modülü.
+Cohort ve segment kardinaliteleri için birleştirilebilir taslaklar sağlar;
+tam hash kümesi yerine hücre başına sabit boyutlu register dizisi tutar.
+"""
+
+import numpy as np
+import pandas as pd
+
+MIN_PRECISION = 4
+MAX_PRECISION = 18
+
+
+def hash_values(values):
+    """Değerleri 64 bit'lik hash değerlerine dönüştürür."""
+    if isinstance(values, (pd.Series, pd.Index)):
+        values = values.to_numpy()
+    values = np.asarray(values)
+    if values.dtype.kind not in 'iufb':
+        values = values.astype(object)
+    return pd.util.hash_array(values, categorize=False)
+
+
+def _leading_zeros(words):
+    """64 bit'lik işaretsiz tamsayılarda baştaki sıfır bit sayısını hesaplar."""
+    words = words.astype(np.uint64, copy=True)
+    zeros = np.zeros(len(words), dtype=np.uint8)
+    for shift in (32, 16, 8, 4, 2, 1):
+        mask = words < np.uint64(1 << (64 - shift))
+        zeros[mask] += shift
+        words[mask] <<= np.uint64(shift)
+    zeros[words == 0] = 64
+    return zeros
+
+
+def _register_updates(hashes, precision):
+    """Hash değerlerinden (register indeksi, rho) çiftlerini üretir."""
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    index = (hashes >> np.uint64(64 - precision)).astype(np.int64)
+    remainder = hashes << np.uint64(precision)
+    rho = np.minimum(_leading_zeros(remainder) + 1, 64 - precision + 1).astype(np.uint8)
+    return index, rho
+
+
+def _estimate(registers, precision):
+    """Register dizilerinden (son eksende) kardinalite tahmini yapar."""
+    m = 1 << precision
+    registers = np.atleast_2d(registers)
+    if m == 16:
+        alpha = 0.673
+    elif m == 32:
+        alpha = 0.697
+    elif m == 64:
+        alpha = 0.709
+    else:
+        alpha = 0.7213 / (1 + 1.079 / m)
+
+    raw = alpha * m * m / np.exp2(-registers.astype(np.float64)).sum(axis=1)
+    empty = (registers == 0).sum(axis=1)
+
+    # Küçük kardinalitelerde doğrusal sayım daha isabetlidir
+    linear = np.where(empty > 0, m * np.log(m / np.maximum(empty, 1)), raw)
+    return np.where((raw <= 2.5 * m) & (empty > 0), linear, raw)
+
+
+def _check_precision(precision):
+    if not MIN_PRECISION <= precision <= MAX_PRECISION:
+        raise ValueError(f"precision {MIN_PRECISION} ile {MAX_PRECISION} arasında olmalıdır: {precision}")
+
+
+class HyperLogLog:
+    """Tek bir küme için birleştirilebilir HyperLogLog taslağı."""
+
+    def __init__(self, precision=12):
+        """
+        Args:
+            precision (int): Register sayısı 2**precision olur; göreli hata ~1.04/sqrt(2**precision)
+        """
+        _check_precision(precision)
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, values):
+        """Değerleri taslağa ekler."""
+        self.add_hashes(hash_values(values))
+        return self
+
+    def add_hashes(self, hashes):
+        """Önceden hesaplanmış hash değerlerini taslağa ekler."""
+        index, rho = _register_updates(hashes, self.precision)
+        np.maximum.at(self.registers, index, rho)
+        return self
+
+    def merge(self, other):
+        """Başka bir taslağı bu taslakla birleştirir (küme birleşimi)."""
+        if other.precision != self.precision:
+            raise ValueError("Farklı hassasiyetteki taslaklar birleştirilemez")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def copy(self):
+        clone = HyperLogLog(self.precision)
+        clone.registers = self.registers.copy()
+        return clone
+
+    def count(self):
+        """Tahmini tekil eleman sayısını döndürür."""
+        return float(_estimate(self.registers, self.precision)[0])
+
+    def __len__(self):
+        return int(round(self.count()))
+
+
+class CellSketches:
+    """
+    Anahtar hücreleri (ör. cohort, index) başına HyperLogLog taslakları.
+    Bölümler ve zaman aralıkları arasında birleştirilebilir.
+    """
+
+    def __init__(self, key_names, precision=12):
+        _check_precision(precision)
+        self.key_names = list(key_names)
+        self.precision = precision
+        self.keys = []
+        self._positions = {}
+        self.registers = np.zeros((0, 1 << precision), dtype=np.uint8)
+
+    def _rows_for(self, keys):
+        """Anahtar demetleri için register satırlarını döndürür, yoksa oluşturur."""
+        new_keys = [key for key in dict.fromkeys(keys) if key not in self._positions]
+        if new_keys:
+            for key in new_keys:
+                self._positions[key] = len(self.keys)
+                self.keys.append(key)
+            grown = np.zeros((len(self.keys), self.registers.shape[1]), dtype=np.uint8)
+            grown[:len(self.registers)] = self.registers
+            self.registers = grown
+        return np.array([self._positions[key] for key in keys], dtype=np.int64)
+
+    def add_frame(self, df, value_column):
+        """Bir veri bölümündeki olayları ilgili hücre taslaklarına ekler."""
+        if len(df) == 0:
+            return self
+        codes, uniques = pd.MultiIndex.from_frame(df[self.key_names]).factorize()
+        rows = self._rows_for(list(uniques))[codes]
+        # Eksik değerler tekil sayıma girmez; yalnızca eksik değer içeren hücreler 0 sayılır
+        present = df[value_column].notna().to_numpy()
+        rows = rows[present]
+        index, rho = _register_updates(hash_values(df[value_column][present]), self.precision)
+        np.maximum.at(self.registers, (rows, index), rho)
+        return self
+
+    def merge(self, other):
+        """Başka bir bölümün taslaklarını hücre bazında birleştirir."""
+        if other.precision != self.precision or other.key_names != self.key_names:
+            raise ValueError("Uyumsuz taslaklar birleştirilemez")
+        if other.keys:
+            rows = self._rows_for(other.keys)
+            np.maximum.at(self.registers, rows, other.registers)
+        return self
+
+    def rollup(self, key_names):
+        """Hücreleri verilen anahtarlara göre birleştirerek yeni taslaklar üretir."""
+        key_names = list(key_names)
+        positions = [self.key_names.index(name) for name in key_names]
+        rolled = CellSketches(key_names, self.precision)
+        if not self.keys:
+            return rolled
+        keys = [tuple(key[i] for i in positions) for key in self.keys]
+        rows = rolled._rows_for(keys)
+        np.maximum.at(rolled.registers, rows, self.registers)
+        return rolled
+
+    def total(self):
+        """Tüm hücrelerin birleşimi için tek bir taslak döndürür."""
+        sketch = HyperLogLog(self.precision)
+        if self.keys:
+            sketch.registers = self.registers.max(axis=0)
+        return sketch
+
+    def counts(self, name='count'):
+        """Hücre başına tahmini tekil sayıları Series olarak döndürür."""
+        index = pd.MultiIndex.from_tuples(self.keys, names=self.key_names)
+        if len(self.key_names) == 1:
+            index = index.get_level_values(0)
+        estimates = _estimate(self.registers, self.precision) if self.keys else []
+        return pd.Series(np.round(estimates), index=index, name=name).sort_index()
+
+    @classmethod
+    def from_frame(cls, df, key_names, value_column, precision=12, partition_size=500_000):
+        """Veriyi bölümler halinde tarayıp bölüm taslaklarını birleştirir."""
+        sketches = cls(key_names, precision)
+        for start in range(0, len(df), partition_size):
+            part = cls(key_names, precision).add_frame(df.iloc[start:start + partition_size], value_column)
+            sketches.merge(part)
+        return sketches
+
+
+def distinct_count(values, approximate=False, precision=12):
+    """Tekil eleman sayısını tam ya da HyperLogLog ile yaklaşık olarak hesaplar."""
+    values = pd.Series(values)
+    if not approximate:
+        return int(values.nunique())
+    # nunique gibi eksik değerler (None / NaN) sayılmaz
+    return len(HyperLogLog(precision).add(values.dropna()))
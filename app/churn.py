@@ -0,0 +1,212 @@
+"""
+Churn Prediction veri üretimi ve model yardımcıları modülü.
+Müşteri veri setini satır döngüsü yerine sütun bazında (vektörel) üretir,
+özellikleri sabit kodlamayla hazırlar ve eğitilmiş modeli saklar/yükler.
+"""
+
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+
+# Türkiye'ye özgü kategoriler
+PRODUCT_CATEGORIES = ['Elektronik', 'Giyim', 'Ev & Yaşam', 'Kitap', 'Spor', 'Kozmetik']
+PAYMENT_METHODS = ['Kredi Kartı', 'Havale', 'Kapıda Ödeme', 'Mobil Ödeme']
+PAYMENT_PROBS = [0.5, 0.2, 0.2, 0.1]
+CITIES = ['İstanbul', 'Ankara', 'İzmir', 'Bursa', 'Antalya', 'Adana', 'Konya']
+CITY_PROBS = [0.35, 0.15, 0.12, 0.1, 0.08, 0.1, 0.1]
+
+CHURN_RATE = 0.30
+
+# Model özellikleri
+NUMERIC_FEATURES = ['DaysSinceLastOrder', 'TotalOrders', 'AvgOrderValue', 'TotalSpent',
+                    'CustomerLifetimeDays', 'OrderFrequency', 'Complaints', 'SupportTickets',
+                    'DiscountUsage', 'EmailOpenRate', 'LastNPSScore']
+CATEGORY_LEVELS = {
+    'PreferredCategory': PRODUCT_CATEGORIES,
+    'PreferredPayment': PAYMENT_METHODS,
+    'City': CITIES,
+}
+CHURN_FEATURES = NUMERIC_FEATURES + [f'{col}_Encoded' for col in CATEGORY_LEVELS]
+
+# Risk segmentleri
+RISK_BINS = [0, 25, 50, 75, 100]
+RISK_LABELS = ['Düşük Risk', 'Orta Risk', 'Yüksek Risk', 'Kritik Risk']
+
+# Saklanan model dosyası
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models')
+CHURN_MODEL_PATH = os.path.join(MODEL_DIR, 'churn_model.joblib')
+COMPILED_CHURN_MODEL_PATH = os.path.join(MODEL_DIR, 'churn_forest.npz')
+
+# Sütun -> (churn olmuş müşteri aralığı, aktif müşteri aralığı); tamsayılarda üst sınır hariç
+_INT_RANGES = {
+    'DaysSinceLastOrder': ((90, 365), (1, 89)),
+    'TotalOrders': ((1, 8), (3, 50)),
+    'CustomerLifetimeDays': ((60, 400), (90, 800)),
+    'Complaints': ((0, 4), (0, 2)),
+    'SupportTickets': ((0, 5), (0, 3)),
+    'DiscountUsage': ((0, 3), (1, 8)),
+    'LastNPSScore': ((1, 6), (6, 11)),
+}
+_FLOAT_RANGES = {
+    'AvgOrderValue': ((50, 300), (100, 1000)),
+    'EmailOpenRate': ((0, 0.4), (0.3, 0.9)),
+}
+
+
+def _conditional(rng, churned, ranges, integer):
+    """Churn maskesine göre alt/üst sınırları seçip tek seferde örnekleme yapar."""
+    (churn_low, churn_high), (active_low, active_high) = ranges
+    low = np.where(churned, churn_low, active_low)
+    high = np.where(churned, churn_high, active_high)
+    if integer:
+        return rng.integers(low, high)
+    return rng.uniform(low, high)
+
+
+def _customer_ids(n_customers):
+    """C00000 biçiminde müşteri kimlikleri üretir."""
+    return np.char.add('C', np.char.zfill(np.arange(n_customers).astype(str), 5))
+
+
+def generate_churn_data(n_customers=2000, seed=42):
+    """
+    Churn tahmini için sentetik müşteri veri seti oluşturur.
+
+    Önce churn/aktif maskesi çekilir, ardından her özellik sütunu bu maskeye
+    koşullu olarak toplu şekilde örneklenir.
+
+    Args:
+        n_customers (int): Müşteri sayısı
+        seed (int): Rastgele sayı üreteci tohumu
+
+    Returns:
+        pd.DataFrame: 16 sütunlu müşteri veri seti
+    """
+    rng = np.random.default_rng(seed)
+
+    # %30 churn olmuş müşteri
+    churned = rng.random(n_customers) < CHURN_RATE
+
+    columns = {name: _conditional(rng, churned, ranges, integer=True) for name, ranges in _INT_RANGES.items()}
+    columns.update({name: _conditional(rng, churned, ranges, integer=False) for name, ranges in _FLOAT_RANGES.items()})
+
+    total_orders = columns['TotalOrders']
+    avg_order_value = columns['AvgOrderValue']
+    lifetime_days = columns['CustomerLifetimeDays']
+
+    return pd.DataFrame({
+        'CustomerID': _customer_ids(n_customers),
+        'DaysSinceLastOrder': columns['DaysSinceLastOrder'],
+        'TotalOrders': total_orders,
+        'AvgOrderValue': avg_order_value.round(2),
+        'TotalSpent': (total_orders * avg_order_value).round(2),
+        'CustomerLifetimeDays': lifetime_days,
+        'OrderFrequency': (total_orders / (lifetime_days / 30)).round(2),
+        'Complaints': columns['Complaints'],
+        'SupportTickets': columns['SupportTickets'],
+        'DiscountUsage': columns['DiscountUsage'],
+        'EmailOpenRate': columns['EmailOpenRate'].round(2),
+        'LastNPSScore': columns['LastNPSScore'],
+        'PreferredCategory': pd.Categorical.from_codes(
+            rng.integers(0, len(PRODUCT_CATEGORIES), n_customers), PRODUCT_CATEGORIES),
+        'PreferredPayment': pd.Categorical.from_codes(
+            rng.choice(len(PAYMENT_METHODS), size=n_customers, p=PAYMENT_PROBS), PAYMENT_METHODS),
+        'City': pd.Categorical.from_codes(
+            rng.choice(len(CITIES), size=n_customers, p=CITY_PROBS), CITIES),
+        'IsChurned': churned.astype(np.int64)
+    })
+
+
+def encode_churn_features(df):
+    """
+    Model özelliklerini hazırlar.
+
+    Kategorik sütunlar sabit kategori listeleriyle kodlanır; böylece parça parça
+    okunan dosyalarda da her parça aynı kodları alır (bilinmeyen değer -1).
+    """
+    encoded = df[NUMERIC_FEATURES].astype(np.float64)
+    for col, levels in CATEGORY_LEVELS.items():
+        encoded[f'{col}_Encoded'] = pd.Categorical(df[col], categories=levels).codes
+    return encoded[CHURN_FEATURES]
+
+
+def risk_segments(scores):
+    """0-100 arası churn risk skorlarını risk segmentlerine ayırır."""
+    return pd.cut(scores, bins=RISK_BINS, labels=RISK_LABELS, include_lowest=True)
+
+
+def risk_segment_codes(scores):
+    """risk_segments ile aynı aralıklarla segment kodlarını (0..3) döndürür; sayım için bincount ile kullanılır."""
+    return np.searchsorted(RISK_BINS[1:-1], np.asarray(scores), side='left').astype(np.int8)
+
+
+def fit_churn_model(X_train, y_train, n_estimators=100, max_depth=10, random_state=42, n_jobs=None,
+                    **forest_params):
+    """StandardScaler + RandomForest churn modelini eğitir ve (scaler, model) döndürür."""
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.preprocessing import StandardScaler
+
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train)
+    model = RandomForestClassifier(n_estimators=n_estimators, max_depth=max_depth, random_state=random_state,
+                                   class_weight='balanced', n_jobs=n_jobs, **forest_params)
+    model.fit(X_train_scaled, y_train)
+    return scaler, model
+
+
+def churn_model_version(forest_version, params):
+    """
+    Model dosyalarına (joblib, derlenmiş orman, ONNX) yazılan sürüm kimliği.
+
+    Derlenmiş ormanın içerik hash'i ve eğitim parametrelerinden türetilir; aynı model
+    her yeniden çalıştırmada aynı kimliği alır.
+    """
+    digest = hashlib.sha1(str(forest_version).encode('utf-8'))
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def saved_model_version():
+    """Son kaydedilen modelin sürüm kimliği (derlenmiş orman ya da sklearn dosyasından); yoksa None."""
+    if os.path.exists(COMPILED_CHURN_MODEL_PATH):
+        with np.load(COMPILED_CHURN_MODEL_PATH, allow_pickle=False) as data:
+            return str(data['model_version']) if 'model_version' in data else None
+    if os.path.exists(CHURN_MODEL_PATH):
+        return load_churn_model(CHURN_MODEL_PATH).get('version')
+    return None
+
+
+def save_churn_model(scaler, model, path=CHURN_MODEL_PATH, version=None):
+    """Eğitilmiş scaler ve modeli (sürüm kimliğiyle) tek bir dosyada saklar; okuyucular yarım dosya görmez."""
+    import joblib
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    joblib.dump({'scaler': scaler, 'model': model, 'features': CHURN_FEATURES, 'version': version}, tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_churn_model(path=CHURN_MODEL_PATH):
+    """Saklanan scaler ve modeli yükler."""
+    import joblib
+
+    bundle = joblib.load(path)
+    if bundle['features'] != CHURN_FEATURES:
+        raise ValueError("Saklanan modelin özellik listesi güncel şema ile uyuşmuyor")
+    return bundle
+
+
+def predict_churn_proba(bundle, df, features=None):
+    """
+    Müşteri verisi için churn olasılıklarını hesaplar (sklearn ya da ONNX modeli).
+
+    `features` verilirse (encode_churn_features çıktısı) kodlama yeniden yapılmaz.
+    """
+    features = encode_churn_features(df) if features is None else features
+    if 'onnx' in bundle:
+        return bundle['onnx'].predict_proba(features.to_numpy())[:, 1]
+    X = bundle['scaler'].transform(features)
+    return bundle['model'].predict_proba(X)[:, 1]
@@ -0,0 +1,173 @@
+"""
+Churn model girdileri için dağılım kayması (drift) izleme.
+Eğitim verisinden her özellik için kantil sınırları ve kutu oranları saklanır.
+Her skorlama grubunda 14 özelliğin tamamı tek bir yayınlanmış (broadcast)
+karşılaştırma ve tek bincount ile kutulanır; PSI ve kutulanmış KS istatistikleri
+bu sayımlardan hesaplanır.
+
+Kullanım:
+    python -m app.churn_drift benchmark
+"""
+
+import argparse
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.churn import CHURN_FEATURES, MODEL_DIR
+
+DRIFT_REFERENCE_PATH = os.path.join(MODEL_DIR, 'churn_drift_reference.npz')
+DEFAULT_BINS = 10
+PSI_THRESHOLDS = (0.1, 0.25)
+DRIFT_LABELS = ['Stabil', 'Orta Kayma', 'Belirgin Kayma']
+_EPSILON = 1e-6
+
+
+class DriftReference:
+    """Eğitim dağılımının özellik başına kutu sınırları ve oranları."""
+
+    def __init__(self, edges, proportions, feature_names=None):
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.proportions = np.asarray(proportions, dtype=np.float64)
+        self.feature_names = list(feature_names) if feature_names is not None else list(CHURN_FEATURES)
+
+    @property
+    def n_bins(self):
+        return self.edges.shape[1] + 1
+
+    @classmethod
+    def fit(cls, X, n_bins=DEFAULT_BINS, feature_names=None):
+        """Eğitim matrisinden kantil tabanlı kutu sınırlarını ve referans oranlarını çıkarır."""
+        X = np.asarray(X, dtype=np.float64)
+        edges = np.quantile(X, np.linspace(0, 1, n_bins + 1)[1:-1], axis=0).T
+        reference = cls(edges, np.zeros((X.shape[1], n_bins)), feature_names)
+        counts = reference.bin_counts(X)
+        reference.proportions = counts / counts.sum(axis=1, keepdims=True)
+        return reference
+
+    def bin_counts(self, X):
+        """Tüm özelliklerin kutu sayımlarını (n_features, n_bins) tek geçişte hesaplar."""
+        X = np.asarray(X, dtype=np.float64)
+        n_features, n_bins = self.edges.shape[0], self.n_bins
+        codes = (X[:, :, None] > self.edges[None, :, :]).sum(axis=2)
+        flat = (codes + np.arange(n_features) * n_bins).ravel()
+        return np.bincount(flat, minlength=n_features * n_bins).reshape(n_features, n_bins)
+
+    def compare(self, counts):
+        """Kutu sayımlarını referansla karşılaştırıp özellik başına PSI ve KS döndürür."""
+        actual = counts / np.maximum(counts.sum(axis=1, keepdims=True), 1)
+        expected = np.clip(self.proportions, _EPSILON, None)
+        observed = np.clip(actual, _EPSILON, None)
+        psi = ((observed - expected) * np.log(observed / expected)).sum(axis=1)
+        ks = np.abs(np.cumsum(actual, axis=1) - np.cumsum(self.proportions, axis=1)).max(axis=1)
+        status = np.array(DRIFT_LABELS, dtype=object)[np.searchsorted(PSI_THRESHOLDS, psi, side='right')]
+        return pd.DataFrame({'Feature': self.feature_names, 'PSI': psi, 'KS': ks, 'Durum': status})
+
+    def save(self, path=DRIFT_REFERENCE_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp.npz'
+        np.savez_compressed(tmp_path, edges=self.edges, proportions=self.proportions,
+                            feature_names=np.array(self.feature_names))
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path=DRIFT_REFERENCE_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['edges'], data['proportions'], data['feature_names'].tolist())
+
+
+class DriftMonitor:
+    """
+    Skorlama gruplarının kutu sayımlarını biriktirerek kaymayı izler.
+
+    Hem son grubun hem de izleme başladığından beri tüm grupların raporunu verir.
+    Skorlama servisinde birden çok iş parçacığından güncellendiği için sayaçlar
+    bir kilitle korunur; kutulama kilit dışında yapılır.
+    """
+
+    def __init__(self, reference):
+        self.reference = reference
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.total_counts = np.zeros_like(self.reference.proportions, dtype=np.int64)
+            self.last_counts = None
+            self.batches = 0
+            self.rows = 0
+
+    def update(self, X):
+        """Bir skorlama grubunu izlemeye ekler ve grubun kayma raporunu döndürür."""
+        counts = self.reference.bin_counts(X)
+        with self._lock:
+            self.total_counts += counts
+            self.last_counts = counts
+            self.batches += 1
+            self.rows += int(counts[0].sum())
+        return self.reference.compare(counts)
+
+    def report(self, last_batch=False):
+        """Biriken (ya da son grubun) kayma raporunu döndürür."""
+        with self._lock:
+            counts = self.last_counts if last_batch else self.total_counts.copy()
+        if counts is None or counts.sum() == 0:
+            return None
+        return self.reference.compare(counts)
+
+    def summary(self):
+        """Metrik endpoint'i için JSON uyumlu özet."""
+        with self._lock:
+            counts, batches, rows = self.total_counts.copy(), self.batches, self.rows
+        report = self.reference.compare(counts) if counts.sum() else None
+        features = [] if report is None else [
+            {'feature': row.Feature, 'psi': round(float(row.PSI), 5), 'ks': round(float(row.KS), 5), 'status': row.Durum}
+            for row in report.itertuples()]
+        return {'batches': batches, 'rows': rows,
+                'max_psi': max((f['psi'] for f in features), default=0.0), 'features': features}
+
+
+def benchmark_drift_overhead(n_rows=250_000, repeats=3):
+    """Derlenmiş orman ile skorlamaya kayma kontrolünün eklediği süreyi ölçer."""
+    from app.churn import generate_churn_data, encode_churn_features, fit_churn_model
+    from app.forest_compiler import compile_forest
+
+    train = generate_churn_data(n_customers=2000, seed=42)
+    X_train = encode_churn_features(train)
+    scaler, model = fit_churn_model(X_train, train['IsChurned'])
+    forest = compile_forest(model, scaler, CHURN_FEATURES)
+    monitor = DriftMonitor(DriftReference.fit(X_train))
+
+    X = encode_churn_features(generate_churn_data(n_customers=n_rows, seed=7)).to_numpy()
+    timings = {'skorlama': [], 'kayma': []}
+    for _ in range(repeats):
+        start = time.perf_counter()
+        forest.predict_proba(X)
+        timings['skorlama'].append(time.perf_counter() - start)
+        start = time.perf_counter()
+        monitor.update(X)
+        timings['kayma'].append(time.perf_counter() - start)
+
+    scoring, drift = min(timings['skorlama']), min(timings['kayma'])
+    print(f"{n_rows:,} satır: skorlama {scoring:.3f} sn, kayma kontrolü {drift:.3f} sn "
+          f"(ek yük %{drift / scoring * 100:.2f})")
+    print(monitor.report().round(4).to_string(index=False))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Churn girdi kayması izleme")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    bench_parser = subparsers.add_parser('benchmark', help="Kayma kontrolünün skorlamaya ek yükünü ölç")
+    bench_parser.add_argument('--rows', type=int, default=250_000)
+
+    args = parser.parse_args(argv)
+    if args.command == 'benchmark':
+        benchmark_drift_overhead(args.rows)
+
+
+if __name__ == '__main__':
+    main()
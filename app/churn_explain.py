@@ -0,0 +1,96 @@
+"""
+Müşteri bazında churn açıklamaları.
+Derlenmiş orman üzerinde vektörel ağaç yolu (Saabas) katkılarından, riski en çok
+artıran özellikleri "neden kodları" olarak çıkarır. Sonuçlar model sürümü
+(CompiledForest.version) ve veri hash'i ile bellekte ve model dizininde önbelleğe alınır.
+"""
+
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from app.churn import MODEL_DIR
+
+EXPLANATION_CACHE_DIR = os.path.join(MODEL_DIR, 'explanations')
+DEFAULT_TOP_K = 3
+MEMORY_CACHE_SIZE = 8
+
+_memory_cache = {}
+
+
+def _data_digest(X):
+    return hashlib.sha1(np.ascontiguousarray(X, dtype=np.float64).tobytes()).hexdigest()
+
+
+def _display_name(feature):
+    return feature[:-len('_Encoded')] if feature.endswith('_Encoded') else feature
+
+
+def reason_codes(contributions, feature_names, top_k=DEFAULT_TOP_K):
+    """
+    Her satır için riski en çok artıran `top_k` özelliği seçer.
+
+    Args:
+        contributions (ndarray): (n_samples, n_features) katkı matrisi
+        feature_names (list): Özellik isimleri
+        top_k (int): Satır başına neden sayısı
+
+    Returns:
+        DataFrame: Reason1..k (özellik) ve Reason1..k_Impact (olasılık puanı) sütunları;
+        pozitif katkı yoksa boş bırakılır
+    """
+    top_k = min(top_k, contributions.shape[1])
+    top = np.argpartition(-contributions, top_k - 1, axis=1)[:, :top_k]
+    impacts = np.take_along_axis(contributions, top, axis=1)
+    order = np.argsort(-impacts, axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+    impacts = np.take_along_axis(impacts, order, axis=1)
+
+    names = np.array([_display_name(name) for name in feature_names], dtype=object)
+    positive = impacts > 0
+    reasons = {}
+    for k in range(top_k):
+        reasons[f'Reason{k + 1}'] = np.where(positive[:, k], names[top[:, k]], None)
+        reasons[f'Reason{k + 1}_Impact'] = np.where(positive[:, k], impacts[:, k] * 100, np.nan)
+    return pd.DataFrame(reasons)
+
+
+def explain_customers(forest, X, top_k=DEFAULT_TOP_K, cache_dir=EXPLANATION_CACHE_DIR):
+    """
+    Müşterilerin churn skorlarını özellik katkılarına ayırır ve neden kodlarını üretir.
+
+    Args:
+        forest (CompiledForest): Derlenmiş churn modeli
+        X: Kodlanmış özellik matrisi (CHURN_FEATURES sırasıyla)
+        top_k (int): Müşteri başına neden sayısı
+        cache_dir (str): Katkıların saklanacağı dizin (None: yalnızca bellek içi)
+
+    Returns:
+        dict: bias, contributions (ndarray) ve reasons (DataFrame)
+    """
+    X = np.asarray(X, dtype=np.float64)
+    key = f"{forest.version[:16]}_{_data_digest(X)[:16]}"
+    cached = _memory_cache.get(key)
+    cache_path = os.path.join(cache_dir, f'{key}.npz') if cache_dir else None
+
+    if cached is None and cache_path and os.path.exists(cache_path):
+        with np.load(cache_path) as data:
+            cached = (float(data['bias']), data['contributions'])
+    if cached is None:
+        cached = forest.contributions(X)
+        if cache_path:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                np.savez_compressed(cache_path, bias=cached[0], contributions=cached[1])
+            except OSError:
+                pass  # Disk önbelleği isteğe bağlıdır
+    _memory_cache[key] = cached
+    while len(_memory_cache) > MEMORY_CACHE_SIZE:
+        _memory_cache.pop(next(iter(_memory_cache)))
+
+    bias, contributions = cached
+    feature_names = forest.feature_names or [f'f{i}' for i in range(forest.n_features)]
+    return {'bias': bias, 'contributions': contributions,
+            'reasons': reason_codes(contributions, feature_names, top_k)}
@@ -0,0 +1,190 @@
+"""
+Churn modelinin ONNX dışa aktarımı ve onnxruntime ile skorlama.
+Eğitilmiş StandardScaler + RandomForestClassifier tek bir ONNX grafiğine
+(pipeline) dönüştürülür. Ölçekleme sklearn'deki gibi float64 yapılır ve ağaçlardan
+önce float32'ye çevrilir; böylece eşik karşılaştırmaları sklearn ile birebir
+aynı kalır. onnxruntime ile sklearn olmadan toplu ve HTTP
+skorlamada kullanılabilir. skl2onnx (dışa aktarma) ve onnxruntime (çıkarım)
+isteğe bağlı bağımlılıklardır:
+
+    pip install skl2onnx onnxruntime
+
+Kullanım:
+    python -m app.churn_onnx export
+    python -m app.churn_onnx parity
+    python -m app.churn_onnx benchmark
+"""
+
+import argparse
+import importlib.util
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.churn import (generate_churn_data, encode_churn_features, load_churn_model, CHURN_FEATURES,
+                       CHURN_MODEL_PATH, MODEL_DIR)
+
+CHURN_ONNX_PATH = os.path.join(MODEL_DIR, 'churn_model.onnx')
+PARITY_TOLERANCE = 1e-4
+MODEL_VERSION_KEY = 'churn_model_version'
+
+
+def onnxruntime_available():
+    """onnxruntime kurulu mu (import etmeden kontrol eder)."""
+    return importlib.util.find_spec('onnxruntime') is not None
+
+
+def export_churn_onnx(scaler, model, path=CHURN_ONNX_PATH, version=None):
+    """
+    Scaler + Random Forest'ı tek bir ONNX modeline dönüştürüp kaydeder.
+
+    Args:
+        scaler: Eğitilmiş StandardScaler
+        model: Eğitilmiş RandomForestClassifier
+        path (str): Çıktı .onnx dosyası
+        version (str): Modelin sürüm kimliği (app.churn.churn_model_version); ONNX metadata'sına yazılır
+
+    Returns:
+        str: Kaydedilen dosya yolu
+    """
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import DoubleTensorType
+    from skl2onnx.sklapi import CastTransformer
+    from sklearn.pipeline import make_pipeline
+
+    # float32 ölçekleme eşiğe yakın satırları farklı yaprağa düşürür (%1'den fazla satırda fark)
+    pipeline = make_pipeline(scaler, CastTransformer(dtype=np.float32), model)
+    onnx_model = convert_sklearn(
+        pipeline,
+        initial_types=[('features', DoubleTensorType([None, len(CHURN_FEATURES)]))],
+        options={id(model): {'zipmap': False}},  # Olasılıklar sözlük yerine matris olarak döner
+        target_opset={'': 17, 'ai.onnx.ml': 3},
+    )
+    if version is not None:
+        entry = onnx_model.metadata_props.add()
+        entry.key, entry.value = MODEL_VERSION_KEY, str(version)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(onnx_model.SerializeToString())
+    os.replace(tmp_path, path)
+    return path
+
+
+class OnnxChurnModel:
+    """onnxruntime oturumu üzerinden churn olasılıkları üreten model."""
+
+    def __init__(self, path=CHURN_ONNX_PATH, intra_op_threads=0):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = intra_op_threads  # 0: onnxruntime varsayılanı
+        self.path = path
+        self.session = ort.InferenceSession(path, sess_options=options, providers=['CPUExecutionProvider'])
+        model_input = self.session.get_inputs()[0]
+        self._input_name = model_input.name
+        self._input_dtype = np.float64 if model_input.type == 'tensor(double)' else np.float32
+        self._proba_name = next(output.name for output in self.session.get_outputs() if 'prob' in output.name)
+        self.model_version = self.session.get_modelmeta().custom_metadata_map.get(MODEL_VERSION_KEY)
+
+    def predict_proba(self, X):
+        """Kodlanmış özellik matrisi (CHURN_FEATURES sırasıyla) için sınıf olasılıkları."""
+        X = np.ascontiguousarray(X, dtype=self._input_dtype)
+        if X.ndim == 1:
+            X = X[None, :]
+        return self.session.run([self._proba_name], {self._input_name: X})[0]
+
+
+def load_onnx_bundle(path=CHURN_ONNX_PATH):
+    """Toplu skorlamada kullanılan model sözlüğünü ONNX modeliyle oluşturur (bkz. predict_churn_proba)."""
+    return {'onnx': OnnxChurnModel(path), 'features': CHURN_FEATURES}
+
+
+def check_parity(bundle, onnx_model, X, tolerance=PARITY_TOLERANCE):
+    """
+    ONNX ve sklearn olasılıklarını karşılaştırır.
+
+    Args:
+        X (DataFrame): Kodlanmış özellik matrisi
+
+    Returns:
+        dict: max_abs_diff, mismatch_rate (toleransı aşan satır oranı) ve passed
+    """
+    expected = bundle['model'].predict_proba(bundle['scaler'].transform(X))[:, 1]
+    actual = onnx_model.predict_proba(np.asarray(X))[:, 1]
+    diff = np.abs(expected - actual)
+    mismatch_rate = float((diff > tolerance).mean())
+    return {'max_abs_diff': float(diff.max()), 'mismatch_rate': mismatch_rate, 'passed': mismatch_rate == 0}
+
+
+def _bundle_or_demo(model_path):
+    if os.path.exists(model_path):
+        return load_churn_model(model_path)
+    from app.churn_scoring import _demo_bundle
+
+    return _demo_bundle()
+
+
+def benchmark_engines(bundle, onnx_model, batch_sizes=(1, 100, 10_000, 100_000), repeats=5):
+    """sklearn, derlenmiş orman ve onnxruntime için gecikme ve verimi karşılaştırır."""
+    from app.forest_compiler import compile_forest
+
+    compiled = compile_forest(bundle['model'], bundle['scaler'], CHURN_FEATURES)
+    X_all = encode_churn_features(generate_churn_data(n_customers=max(batch_sizes), seed=7)).to_numpy()
+    engines = {
+        'sklearn': lambda X: bundle['model'].predict_proba(
+            bundle['scaler'].transform(pd.DataFrame(X, columns=CHURN_FEATURES))),
+        'derlenmiş': compiled.predict_proba,
+        'onnxruntime': onnx_model.predict_proba,
+    }
+
+    rows = []
+    for batch_size in batch_sizes:
+        X = X_all[:batch_size]
+        for name, predict in engines.items():
+            predict(X)  # Isınma
+            start = time.perf_counter()
+            for _ in range(repeats):
+                predict(X)
+            seconds = (time.perf_counter() - start) / repeats
+            rows.append({'motor': name, 'batch': batch_size, 'gecikme_ms': seconds * 1000,
+                         'satır_sn': batch_size / seconds})
+            print(f"batch={batch_size:>7,} {name:>12}: {seconds * 1000:9.2f} ms, {batch_size / seconds:>12,.0f} satır/sn")
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Churn modeli ONNX araçları")
+    parser.add_argument('--model', default=CHURN_MODEL_PATH, help="Saklanan sklearn modeli (yoksa demo modeli)")
+    parser.add_argument('--onnx', default=CHURN_ONNX_PATH)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('export', help="sklearn modelini ONNX'e aktar")
+    parity_parser = subparsers.add_parser('parity', help="ONNX ve sklearn tahminlerini karşılaştır")
+    parity_parser.add_argument('--rows', type=int, default=100_000)
+    bench_parser = subparsers.add_parser('benchmark', help="Gecikme / verim karşılaştırması")
+    bench_parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 100, 10_000, 100_000])
+
+    args = parser.parse_args(argv)
+    bundle = _bundle_or_demo(args.model)
+    if args.command == 'export' or not os.path.exists(args.onnx):
+        path = export_churn_onnx(bundle['scaler'], bundle['model'], args.onnx, version=bundle.get('version'))
+        print(f"ONNX modeli yazıldı: {path}")
+    if args.command == 'export':
+        return
+
+    onnx_model = OnnxChurnModel(args.onnx)
+    if args.command == 'parity':
+        X = encode_churn_features(generate_churn_data(n_customers=args.rows, seed=11))
+        result = check_parity(bundle, onnx_model, X)
+        print(f"{args.rows:,} satır: en büyük fark {result['max_abs_diff']:.2e}, "
+              f"tolerans dışı oran %{result['mismatch_rate'] * 100:.3f} -> {'GEÇTİ' if result['passed'] else 'KALDI'}")
+        if not result['passed']:
+            raise SystemExit(1)
+    else:
+        benchmark_engines(bundle, onnx_model, args.batch_sizes)
+
+
+if __name__ == '__main__':
+    main()
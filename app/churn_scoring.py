@@ -0,0 +1,207 @@
+"""
+Toplu churn skorlama modülü.
+Müşteri özellik dosyasını (CSV/Parquet) parçalar halinde okur, saklanan scaler ve
+model ile skorlar ve ChurnRiskScore / RiskSegment sütunlarını çıktı dosyasına yazar.
+
+Kullanım:
+    python -m app.churn_scoring score musteriler.csv skorlar.csv
+    python -m app.churn_scoring score musteriler.csv skorlar.csv --engine onnx
+    python -m app.churn_scoring benchmark --sizes 100000 1000000 10000000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from app.churn import (generate_churn_data, encode_churn_features, fit_churn_model, load_churn_model,
+                       predict_churn_proba, risk_segments, CHURN_MODEL_PATH)
+from app.churn_drift import DriftMonitor, DriftReference, DRIFT_REFERENCE_PATH
+
+DEFAULT_CHUNKSIZE = 250_000
+BENCHMARK_SIZES = (100_000, 1_000_000, 10_000_000)
+
+
+def _is_parquet(path):
+    return path.lower().endswith(('.parquet', '.pq'))
+
+
+def iter_feature_chunks(path, chunksize=DEFAULT_CHUNKSIZE):
+    """Özellik dosyasını en fazla `chunksize` satırlık DataFrame parçaları halinde okur."""
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+class ChunkWriter:
+    """Skorlanan parçaları sırayla CSV ya da Parquet dosyasına ekler."""
+
+    def __init__(self, path):
+        self.path = path
+        self._parquet_writer = None
+        self._first_chunk = True
+
+    def write(self, df):
+        if _is_parquet(self.path):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table)
+        else:
+            df.to_csv(self.path, mode='w' if self._first_chunk else 'a', header=self._first_chunk, index=False)
+        self._first_chunk = False
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def score_frame(bundle, df, features=None):
+    """Bir müşteri parçasını skorlar ve CustomerID, ChurnRiskScore, RiskSegment döndürür."""
+    scores = predict_churn_proba(bundle, df, features) * 100
+    return pd.DataFrame({
+        'CustomerID': df['CustomerID'].to_numpy(),
+        'ChurnRiskScore': scores.round(2),
+        'RiskSegment': risk_segments(scores)
+    })
+
+
+def score_churn_file(input_path, output_path, model_path=CHURN_MODEL_PATH, chunksize=DEFAULT_CHUNKSIZE,
+                     n_jobs=-1, bundle=None, monitor=None):
+    """
+    Özellik dosyasını parça parça skorlayıp çıktı dosyasına yazar.
+
+    Args:
+        input_path (str): Müşteri özellik dosyası (CSV ya da Parquet)
+        output_path (str): Skor çıktı dosyası (CSV ya da Parquet)
+        model_path (str): Saklanan scaler + model dosyası
+        chunksize (int): Parça başına satır sayısı
+        n_jobs (int): Ağaç değerlendirmesi için kullanılacak çekirdek sayısı (-1: tümü)
+        bundle (dict): Önceden yüklenmiş model (sklearn ya da load_onnx_bundle); verilirse model_path kullanılmaz
+        monitor (DriftMonitor): Verilirse her parça girdi kayması için izlenir
+
+    Returns:
+        dict: rows, seconds, rows_per_sec ve (monitor verildiyse) drift özeti
+    """
+    if bundle is None:
+        bundle = load_churn_model(model_path)
+    if 'model' in bundle:
+        bundle['model'].set_params(n_jobs=n_jobs)
+
+    rows = 0
+    start = time.perf_counter()
+    with ChunkWriter(output_path) as writer:
+        for chunk in iter_feature_chunks(input_path, chunksize):
+            # Parça bir kez kodlanır; aynı özellikler hem modele hem kayma izleyicisine verilir
+            features = encode_churn_features(chunk)
+            writer.write(score_frame(bundle, chunk, features))
+            if monitor is not None:
+                monitor.update(features)
+            rows += len(chunk)
+    seconds = time.perf_counter() - start
+
+    stats = {'rows': rows, 'seconds': seconds, 'rows_per_sec': rows / seconds if seconds > 0 else float('inf')}
+    if monitor is not None:
+        stats['drift'] = monitor.summary()
+    return stats
+
+
+def _demo_bundle():
+    """Saklanan model yoksa demo verisiyle hızlıca bir model eğitir."""
+    df = generate_churn_data(n_customers=2000, seed=42)
+    scaler, model = fit_churn_model(encode_churn_features(df), df['IsChurned'])
+    return {'scaler': scaler, 'model': model}
+
+
+def _write_benchmark_input(path, n_rows, chunksize):
+    """Benchmark için sentetik özellik dosyasını parça parça yazar."""
+    with ChunkWriter(path) as writer:
+        for i, start in enumerate(range(0, n_rows, chunksize)):
+            chunk = generate_churn_data(n_customers=min(chunksize, n_rows - start), seed=i)
+            writer.write(chunk.drop(columns='IsChurned'))
+
+
+def benchmark_batch_scoring(sizes=BENCHMARK_SIZES, model_path=CHURN_MODEL_PATH, file_format='csv',
+                            chunksize=DEFAULT_CHUNKSIZE, n_jobs=-1):
+    """Farklı satır sayılarında uçtan uca (okuma + skorlama + yazma) verimi ölçer."""
+    bundle = load_churn_model(model_path) if os.path.exists(model_path) else _demo_bundle()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for n_rows in sizes:
+            input_path = os.path.join(tmpdir, f'features_{n_rows}.{file_format}')
+            output_path = os.path.join(tmpdir, f'scores_{n_rows}.{file_format}')
+            _write_benchmark_input(input_path, n_rows, chunksize)
+
+            stats = score_churn_file(input_path, output_path, chunksize=chunksize, n_jobs=n_jobs, bundle=bundle)
+            results.append(stats)
+            print(f"{n_rows:>12,} satır: {stats['seconds']:8.2f} sn, {stats['rows_per_sec']:>12,.0f} satır/sn")
+
+            os.remove(input_path)
+            os.remove(output_path)
+
+    return pd.DataFrame(results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Toplu churn skorlama")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    score_parser = subparsers.add_parser('score', help="Özellik dosyasını skorla")
+    score_parser.add_argument('input_path')
+    score_parser.add_argument('output_path')
+    score_parser.add_argument('--model', default=CHURN_MODEL_PATH)
+    score_parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    score_parser.add_argument('--n-jobs', type=int, default=-1)
+    score_parser.add_argument('--engine', choices=['sklearn', 'onnx'], default='sklearn',
+                              help="onnx: app.churn_onnx ile dışa aktarılan model onnxruntime ile skorlanır")
+    score_parser.add_argument('--onnx-model', default=None, help="ONNX model dosyası (varsayılan: models/churn_model.onnx)")
+    score_parser.add_argument('--drift-reference', default=DRIFT_REFERENCE_PATH,
+                              help="Eğitim dağılımı referansı (yoksa kayma kontrolü atlanır)")
+
+    bench_parser = subparsers.add_parser('benchmark', help="Skorlama verimini ölç")
+    bench_parser.add_argument('--sizes', type=int, nargs='+', default=list(BENCHMARK_SIZES))
+    bench_parser.add_argument('--model', default=CHURN_MODEL_PATH)
+    bench_parser.add_argument('--format', choices=['csv', 'parquet'], default='csv')
+    bench_parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    bench_parser.add_argument('--n-jobs', type=int, default=-1)
+
+    args = parser.parse_args(argv)
+    if args.command == 'score':
+        monitor = (DriftMonitor(DriftReference.load(args.drift_reference))
+                   if os.path.exists(args.drift_reference) else None)
+        bundle = None
+        if args.engine == 'onnx':
+            from app.churn_onnx import load_onnx_bundle, CHURN_ONNX_PATH
+
+            bundle = load_onnx_bundle(args.onnx_model or CHURN_ONNX_PATH)
+        stats = score_churn_file(args.input_path, args.output_path, model_path=args.model,
+                                 chunksize=args.chunksize, n_jobs=args.n_jobs, bundle=bundle, monitor=monitor)
+        print(f"{stats['rows']:,} satır {stats['seconds']:.2f} sn içinde skorlandı "
+              f"({stats['rows_per_sec']:,.0f} satır/sn)")
+        if monitor is not None:
+            drifted = [f"{f['feature']} (PSI {f['psi']:.3f})" for f in stats['drift']['features'] if f['status'] != 'Stabil']
+            print(f"Girdi kayması: {', '.join(drifted) if drifted else 'tüm özellikler stabil'}")
+    else:
+        benchmark_batch_scoring(args.sizes, model_path=args.model, file_format=args.format,
+                                chunksize=args.chunksize, n_jobs=args.n_jobs)
+
+
+if __name__ == '__main__':
+    main()
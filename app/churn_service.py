@@ -0,0 +1,399 @@
+"""
+Churn skorlama HTTP servisi.
+Eşzamanlı gelen istekleri mikro-gruplar (micro-batch) halinde toplar: bir grup
+en fazla `max_batch_size` satıra ulaştığında ya da ilk isteğin üzerinden
+`max_wait_ms` geçtiğinde tek bir vektörel model çağrısıyla iş parçacığı
+havuzunda skorlanır. Gecikme (p50/p99) ve grup boyutu metrikleri tutulur.
+
+Endpoint'ler (app/wsgi.py içindeki aiohttp uygulamasına eklenir):
+    POST /score/churn    JSON (tek nesne, liste ya da {"customers": [...]}) veya NDJSON
+    GET  /metrics/churn  Gecikme ve grup boyutu metrikleri
+    GET  /metrics/churn/drift  Eğitim dağılımına göre özellik başına PSI / KS
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from aiohttp import web
+
+from app.churn import (encode_churn_features, load_churn_model, predict_churn_proba, risk_segments,
+                       saved_model_version, CATEGORY_LEVELS, CHURN_FEATURES, CHURN_MODEL_PATH, COMPILED_CHURN_MODEL_PATH,
+                       NUMERIC_FEATURES)
+from app.churn_drift import DriftMonitor, DriftReference, DRIFT_REFERENCE_PATH
+from app.forest_compiler import CompiledForest
+
+MAX_BATCH_SIZE = int(os.environ.get('CHURN_MAX_BATCH_SIZE', 512))
+MAX_WAIT_MS = float(os.environ.get('CHURN_MAX_WAIT_MS', 5))
+SCORING_THREADS = int(os.environ.get('CHURN_SCORING_THREADS', 2))
+SCORING_ENGINES = ('auto', 'onnx', 'compiled', 'sklearn')
+SCORING_ENGINE = os.environ.get('CHURN_SCORING_ENGINE', 'auto')
+METRICS_WINDOW = 10_000
+REQUIRED_COLUMNS = NUMERIC_FEATURES + list(CATEGORY_LEVELS)
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+
+
+class ScoringModel:
+    """
+    Skorlama servisinde kayıtlı model: churn olasılıkları.
+
+    predict_fn, CHURN_FEATURES sırasındaki kodlanmış özellik matrisini (n × 14, float64) alır.
+    """
+
+    def __init__(self, predict_fn, source):
+        self._predict_fn = predict_fn
+        self.source = source
+
+    def predict_features(self, X):
+        return self._predict_fn(X)
+
+    def predict_proba(self, df):
+        return self._predict_fn(encode_churn_features(df).to_numpy(dtype=np.float64))
+
+
+def _require(path, engine):
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"'{engine}' skorlama motoru için model dosyası bulunamadı: {path}")
+
+
+def load_registered_model(engine=None):
+    """
+    Servisin kullanacağı modeli yükler.
+
+    'auto' öncelik sırası: ONNX modeli (onnxruntime kuruluysa ve sürümü son
+    kaydedilen modelle aynıysa; küçük gruplarda en düşük gecikme), derlenmiş orman
+    (yalnızca NumPy), saklanan sklearn modeli, hiçbiri yoksa demo verisiyle eğitilip
+    derlenen model. Açıkça seçilen motor yüklenemezse hata verilir.
+
+    Args:
+        engine (str): auto, onnx, compiled ya da sklearn (varsayılan: CHURN_SCORING_ENGINE)
+    """
+    from app.churn_onnx import onnxruntime_available, OnnxChurnModel, CHURN_ONNX_PATH
+
+    engine = engine or SCORING_ENGINE
+    if engine not in SCORING_ENGINES:
+        raise ValueError(f"Bilinmeyen skorlama motoru: {engine} (seçenekler: {', '.join(SCORING_ENGINES)})")
+
+    if engine == 'onnx' or (engine == 'auto' and os.path.exists(CHURN_ONNX_PATH) and onnxruntime_available()):
+        _require(CHURN_ONNX_PATH, engine)
+        if not onnxruntime_available():
+            raise ImportError("'onnx' skorlama motoru için onnxruntime kurulu olmalı")
+        onnx_model = OnnxChurnModel(CHURN_ONNX_PATH, intra_op_threads=1)
+        current = saved_model_version()
+        # Churn sekmesi yeniden eğitince joblib / .npz güncellenir; eski ONNX dosyası sessizce skorlamasın
+        if onnx_model.model_version == current:
+            return ScoringModel(lambda X: onnx_model.predict_proba(X)[:, 1], CHURN_ONNX_PATH)
+        if engine == 'onnx':
+            raise ValueError(f"ONNX modeli ({onnx_model.model_version}) kayıtlı modelle ({current}) aynı sürüm değil; "
+                             "'python -m app.churn_onnx export' ile yeniden dışa aktarın")
+
+    if engine == 'sklearn' or (engine == 'auto' and not os.path.exists(COMPILED_CHURN_MODEL_PATH)
+                               and os.path.exists(CHURN_MODEL_PATH)):
+        _require(CHURN_MODEL_PATH, engine)
+        bundle = load_churn_model(CHURN_MODEL_PATH)
+        return ScoringModel(lambda X: predict_churn_proba(bundle, None, pd.DataFrame(X, columns=CHURN_FEATURES)),
+                            CHURN_MODEL_PATH)
+
+    if engine == 'compiled' or os.path.exists(COMPILED_CHURN_MODEL_PATH):
+        _require(COMPILED_CHURN_MODEL_PATH, engine)
+        forest = CompiledForest.load(COMPILED_CHURN_MODEL_PATH)
+        source = COMPILED_CHURN_MODEL_PATH
+    else:
+        from app.churn_scoring import _demo_bundle
+        from app.forest_compiler import compile_forest
+
+        bundle = _demo_bundle()
+        forest = compile_forest(bundle['model'], bundle['scaler'], CHURN_FEATURES)
+        source = 'demo'
+    return ScoringModel(lambda X: forest.predict_proba(X)[:, 1], source)
+
+
+class ServiceMetrics:
+    """Son METRICS_WINDOW isteğin gecikmelerini ve grup boyutlarını tutar."""
+
+    def __init__(self, window=METRICS_WINDOW):
+        self.latencies_ms = deque(maxlen=window)
+        self.batch_sizes = deque(maxlen=window)
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+        self.errors = 0
+
+    def record_request(self, latency_ms, n_rows):
+        self.latencies_ms.append(latency_ms)
+        self.requests += 1
+        self.rows += n_rows
+
+    def record_batch(self, n_rows):
+        self.batch_sizes.append(n_rows)
+        self.batches += 1
+
+    def snapshot(self):
+        latencies = np.fromiter(self.latencies_ms, dtype=np.float64)
+        sizes = np.fromiter(self.batch_sizes, dtype=np.float64)
+        p50, p99 = np.percentile(latencies, [50, 99]) if len(latencies) else (np.nan, np.nan)
+        return {
+            'requests': self.requests,
+            'rows': self.rows,
+            'batches': self.batches,
+            'errors': self.errors,
+            'latency_p50_ms': round(float(p50), 3),
+            'latency_p99_ms': round(float(p99), 3),
+            'batch_size_mean': round(float(sizes.mean()), 2) if len(sizes) else 0.0,
+            'batch_size_max': int(sizes.max()) if len(sizes) else 0,
+        }
+
+
+class MicroBatcher:
+    """
+    İstekleri kuyrukta toplayıp mikro-gruplar halinde skorlayan asyncio işçisi.
+
+    Args:
+        model (ScoringModel): Skorlama modeli
+        max_batch_size (int): Bir gruptaki en fazla satır sayısı
+        max_wait_ms (float): İlk istekten sonra grubun dolması için beklenecek en uzun süre
+        executor: Model çağrılarının yapılacağı havuz (None: iş parçacığı havuzu)
+        metrics (ServiceMetrics): Grup boyutu metrikleri
+        monitor (DriftMonitor): Verilirse her grup girdi kayması için izlenir
+    """
+
+    def __init__(self, model, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS, executor=None,
+                 metrics=None, monitor=None):
+        self.model = model
+        self.monitor = monitor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.executor = executor or ThreadPoolExecutor(max_workers=SCORING_THREADS)
+        self._max_in_flight = getattr(self.executor, '_max_workers', SCORING_THREADS)
+        self.metrics = metrics or ServiceMetrics()
+        self._queue = None
+        self._worker = None
+        self._tasks = set()  # çalışan skorlama görevleri (çöp toplayıcı tamamlanmadan silmesin)
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self.executor.shutdown(wait=False)
+
+    async def submit(self, X):
+        """Bir isteğin kodlanmış özellik matrisini kuyruğa ekler ve olasılıkları bekler."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((X, future))
+        return await future
+
+    async def _collect(self):
+        """İlk isteği bekler, ardından grup dolana ya da süre bitene kadar toplar."""
+        items = [await self._queue.get()]
+        n_rows = len(items[0][0])
+        deadline = time.perf_counter() + self.max_wait
+        while n_rows < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            items.append(item)
+            n_rows += len(item[0])
+        return items, n_rows
+
+    async def _run(self):
+        # Aynı anda havuzdaki iş parçacığı sayısı kadar grup skorlanır; diğerleri toplanmaya devam eder
+        slots = asyncio.Semaphore(self._max_in_flight)
+        while True:
+            items, n_rows = await self._collect()
+            self.metrics.record_batch(n_rows)
+            await slots.acquire()
+            task = asyncio.create_task(self._score(items))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            task.add_done_callback(lambda _: slots.release())
+
+    def _predict(self, X):
+        """Havuzda çalışır: grubu skorlar ve kayma izleyicisini günceller."""
+        proba = self.model.predict_features(X)
+        if self.monitor is not None:
+            self.monitor.update(X)
+        return proba
+
+    async def _score(self, items):
+        arrays = [X for X, _ in items]
+        loop = asyncio.get_running_loop()
+        try:
+            batch = arrays[0] if len(arrays) == 1 else np.concatenate(arrays)
+            proba = await loop.run_in_executor(self.executor, self._predict, batch)
+        except Exception as e:
+            if len(items) == 1:
+                if not items[0][1].done():
+                    items[0][1].set_exception(e)
+                return
+            # Grup başarısızsa istekler tek tek skorlanır; yalnızca hatalı istek hata alır
+            for X, future in items:
+                try:
+                    result = await loop.run_in_executor(self.executor, self._predict, X)
+                except Exception as item_error:
+                    if not future.done():
+                        future.set_exception(item_error)
+                else:
+                    if not future.done():
+                        future.set_result(result)
+            return
+
+        # Olasılıklar isteklerin satır sayılarına göre geri dağıtılır
+        bounds = np.cumsum([len(X) for X in arrays])[:-1]
+        for (_, future), part in zip(items, np.split(proba, bounds)):
+            if not future.done():
+                future.set_result(part)
+
+
+def _numeric_column(records, col):
+    """Sayısal alanı float64 dizisine çevirir; sayı olmayan ya da sonlu olmayan ilk değer için hata verir."""
+    values = [record.get(col) for record in records]
+    try:
+        array = np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        array = np.array([_to_float(value) for value in values])
+    invalid = ~np.isfinite(array)
+    if invalid.any():
+        row = int(np.flatnonzero(invalid)[0])
+        raise ValueError(f"Geçersiz sayısal değer: {col}={values[row]!r} (kayıt {row})")
+    return array
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _category_codes(records, col, levels):
+    """Kategorik alanı sabit kategori listesindeki kodlara çevirir; bilinmeyen ilk değer için hata verir."""
+    lookup = {level: code for code, level in enumerate(levels)}
+    values = [record.get(col) for record in records]
+    codes = np.array([lookup.get(value, -1) if isinstance(value, str) else -1 for value in values],
+                     dtype=np.float64)
+    invalid = codes < 0
+    if invalid.any():
+        row = int(np.flatnonzero(invalid)[0])
+        raise ValueError(f"Bilinmeyen kategori: {col}={values[row]!r} (kayıt {row}; seçenekler: {', '.join(levels)})")
+    return codes
+
+
+def parse_customers(body, content_type):
+    """
+    JSON ya da NDJSON gövdesini modelin kodlanmış özellik matrisine çevirir.
+
+    Tipler istek başına burada, DataFrame oluşturulmadan doğrulanır; hatalı bir istek
+    mikro-gruptaki diğer istekleri bozmaz ve gruplar dizilerin birleştirilmesiyle kurulur.
+
+    Returns:
+        tuple: (X: CHURN_FEATURES sırasında n × 14 float64 dizi, CustomerID listesi)
+    """
+    if content_type == NDJSON_CONTENT_TYPE:
+        records = [json.loads(line) for line in body.splitlines() if line.strip()]
+    else:
+        payload = json.loads(body)
+        if isinstance(payload, dict):
+            payload = payload.get('customers', [payload])
+        records = payload
+    if not records:
+        raise ValueError("Skorlanacak müşteri bulunamadı")
+    if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+        raise ValueError("Müşteri kayıtları JSON nesnesi olmalı")
+
+    missing = [col for col in REQUIRED_COLUMNS if not any(col in record for record in records)]
+    if missing:
+        raise ValueError(f"Eksik alanlar: {', '.join(missing)}")
+
+    X = np.empty((len(records), len(CHURN_FEATURES)), dtype=np.float64)
+    for j, col in enumerate(NUMERIC_FEATURES):
+        X[:, j] = _numeric_column(records, col)
+    for j, (col, levels) in enumerate(CATEGORY_LEVELS.items(), start=len(NUMERIC_FEATURES)):
+        X[:, j] = _category_codes(records, col, levels)
+    return X, [record.get('CustomerID') for record in records]
+
+
+def _score_records(customer_ids, proba):
+    scores = np.round(proba * 100, 2)
+    segments = risk_segments(scores).astype(str)
+    return [{'CustomerID': customer_id, 'ChurnRiskScore': float(score), 'RiskSegment': segment}
+            for customer_id, score, segment in zip(customer_ids, scores, segments)]
+
+
+async def handle_score_churn(request):
+    """POST /score/churn: müşteri özelliklerini mikro-gruplu model ile skorlar."""
+    start = time.perf_counter()
+    batcher = request.app['churn_batcher']
+    try:
+        X, customer_ids = parse_customers(await request.text(), request.content_type)
+    except (ValueError, TypeError) as e:
+        batcher.metrics.errors += 1
+        return web.json_response({'error': str(e)}, status=400)
+
+    try:
+        proba = await batcher.submit(X)
+    except Exception as e:
+        batcher.metrics.errors += 1
+        return web.json_response({'error': f"Skorlama hatası: {e}"}, status=500)
+    records = _score_records(customer_ids, proba)
+    batcher.metrics.record_request((time.perf_counter() - start) * 1000, len(X))
+
+    if request.content_type == NDJSON_CONTENT_TYPE:
+        body = '\n'.join(json.dumps(record, ensure_ascii=False) for record in records) + '\n'
+        return web.Response(text=body, content_type=NDJSON_CONTENT_TYPE)
+    return web.json_response({'scores': records})
+
+
+async def handle_churn_metrics(request):
+    """GET /metrics/churn: gecikme ve grup boyutu metrikleri."""
+    batcher = request.app['churn_batcher']
+    return web.json_response({**batcher.metrics.snapshot(), 'model': batcher.model.source,
+                              'max_batch_size': batcher.max_batch_size,
+                              'max_wait_ms': batcher.max_wait * 1000})
+
+
+async def handle_churn_drift(request):
+    """GET /metrics/churn/drift: skorlanan grupların eğitim dağılımına göre kayması."""
+    monitor = request.app['churn_batcher'].monitor
+    if monitor is None:
+        return web.json_response({'error': "Kayma referansı bulunamadı"}, status=404)
+    return web.json_response(monitor.summary())
+
+
+def load_drift_monitor(path=DRIFT_REFERENCE_PATH):
+    """Eğitim sırasında saklanan kayma referansı varsa izleyici oluşturur."""
+    return DriftMonitor(DriftReference.load(path)) if os.path.exists(path) else None
+
+
+def setup_churn_routes(app, model=None, monitor=None, **batcher_options):
+    """Churn skorlama endpoint'lerini ve mikro-grup işçisini aiohttp uygulamasına ekler."""
+
+    async def start_batcher(app):
+        app['churn_batcher'] = MicroBatcher(model or load_registered_model(),
+                                            monitor=monitor or load_drift_monitor(), **batcher_options)
+        app['churn_batcher'].start()
+
+    async def stop_batcher(app):
+        await app['churn_batcher'].stop()
+
+    app.on_startup.append(start_batcher)
+    app.on_cleanup.append(stop_batcher)
+    app.router.add_post('/score/churn', handle_score_churn)
+    app.router.add_get('/metrics/churn', handle_churn_metrics)
+    app.router.add_get('/metrics/churn/drift', handle_churn_drift)
+    return app
@@ -0,0 +1,179 @@
+"""
+Churn modeli için eşik (threshold) analizi.
+Skorlar bir kez sıralanır; kümülatif toplamlarla her farklı skor eşiğindeki
+TP/FP/TN/FN, TPR/FPR, precision/recall ve F1 tek geçişte hesaplanır. Herhangi
+bir eşikteki confusion matrix farklı eşikler üzerinde ikili arama ile bulunur,
+model yeniden çalıştırılmaz. Sonuçlar model sürümü ve veri hash'i ile bellekte
+önbelleğe alınır.
+
+Kullanım:
+    python -m app.churn_threshold benchmark --rows 1000000
+"""
+
+import argparse
+import hashlib
+import time
+
+import numpy as np
+import pandas as pd
+
+MEMORY_CACHE_SIZE = 8
+
+_sweep_cache = {}
+
+
+class ThresholdSweep:
+    """
+    Tüm farklı skor eşiklerinde sınıflandırma metrikleri.
+
+    Args:
+        y_true: Gerçek etiketler (0/1)
+        scores: Pozitif sınıf olasılıkları; skor >= eşik olan satırlar churn tahmin edilir
+    """
+
+    def __init__(self, y_true, scores):
+        scores = np.asarray(scores, dtype=np.float64)
+        y_true = np.asarray(y_true).astype(np.int64)
+        order = np.argsort(-scores, kind='mergesort')
+        self.sorted_scores = scores[order]
+
+        # k: en yüksek skorlu k satır churn tahmin edildiğinde TP / FP sayıları
+        self.tps = np.concatenate([[0], np.cumsum(y_true[order])])
+        self.fps = np.arange(len(scores) + 1) - self.tps
+        self.positives = int(self.tps[-1])
+        self.negatives = len(scores) - self.positives
+
+        # Eşik olarak yalnızca farklı skorlar anlamlıdır (eşit skorlar birlikte sınıflanır)
+        self.cuts = np.concatenate([[0], np.flatnonzero(np.diff(self.sorted_scores)) + 1, [len(scores)]])
+        self.thresholds = np.concatenate([[np.inf], self.sorted_scores[self.cuts[1:] - 1]])
+        self._descending = -self.thresholds
+
+    @property
+    def tp(self):
+        return self.tps[self.cuts]
+
+    @property
+    def fp(self):
+        return self.fps[self.cuts]
+
+    @property
+    def tpr(self):
+        return self.tp / max(self.positives, 1)
+
+    @property
+    def fpr(self):
+        return self.fp / max(self.negatives, 1)
+
+    @property
+    def precision(self):
+        predicted = self.cuts
+        return np.divide(self.tp, predicted, out=np.ones(len(predicted)), where=predicted > 0)
+
+    @property
+    def roc_auc(self):
+        fpr, tpr = self.fpr, self.tpr
+        return float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2))
+
+    def curve(self):
+        """Her farklı eşik için metrik tablosu."""
+        tp, fp = self.tp, self.fp
+        precision, recall = self.precision, self.tpr
+        f1 = np.divide(2 * precision * recall, precision + recall,
+                       out=np.zeros(len(tp)), where=(precision + recall) > 0)
+        return pd.DataFrame({'Threshold': self.thresholds, 'TP': tp, 'FP': fp,
+                             'FN': self.positives - tp, 'TN': self.negatives - fp,
+                             'TPR': recall, 'FPR': self.fpr, 'Precision': precision, 'Recall': recall, 'F1': f1})
+
+    def _predicted_positive(self, threshold):
+        # Eşiğe eşit ya da büyük farklı skorların sayısı -> churn tahmin edilen satır sayısı
+        return int(self.cuts[np.searchsorted(self._descending, -threshold, side='right') - 1])
+
+    def confusion_matrix(self, threshold=0.5):
+        """Eşikteki confusion matrix ([[TN, FP], [FN, TP]]; satırlar gerçek, sütunlar tahmin)."""
+        k = self._predicted_positive(threshold)
+        tp, fp = int(self.tps[k]), int(self.fps[k])
+        return np.array([[self.negatives - fp, fp], [self.positives - tp, tp]])
+
+    def costs(self, cost_fp, cost_fn):
+        """Her farklı eşikteki toplam maliyet (yanlış alarm ve kaçırılan churn maliyetleri)."""
+        return self.fp * cost_fp + (self.positives - self.tp) * cost_fn
+
+    def optimal_threshold(self, cost_fp, cost_fn):
+        """
+        Toplam maliyeti en aza indiren eşik ve maliyet.
+
+        Hiçbir müşteriyi churn olarak işaretlememek en ucuzsa eşik np.inf döner
+        (1.0 skoru olan müşteriler 1.0 eşiğinde işaretlenirdi).
+        """
+        costs = self.costs(cost_fp, cost_fn)
+        best = int(np.argmin(costs))
+        return float(self.thresholds[best]), float(costs[best])
+
+
+def _data_digest(y_true, scores):
+    digest = hashlib.sha1(np.ascontiguousarray(scores, dtype=np.float64).tobytes())
+    digest.update(np.ascontiguousarray(y_true, dtype=np.int8).tobytes())
+    return digest.hexdigest()
+
+
+def cached_threshold_sweep(model_version, y_true, scores):
+    """
+    Eşik analizini model sürümü ve veri hash'i başına bir kez hesaplar.
+
+    Args:
+        model_version (str): Model sürümü (ör. CompiledForest.version)
+        y_true: Gerçek etiketler
+        scores: Pozitif sınıf olasılıkları
+
+    Returns:
+        ThresholdSweep
+    """
+    key = (model_version, _data_digest(y_true, scores))
+    sweep = _sweep_cache.get(key)
+    if sweep is None:
+        sweep = ThresholdSweep(y_true, scores)
+    _sweep_cache[key] = sweep
+    while len(_sweep_cache) > MEMORY_CACHE_SIZE:
+        _sweep_cache.pop(next(iter(_sweep_cache)))
+    return sweep
+
+
+def benchmark_sweep(n_rows=1_000_000, lookups=1000):
+    """Eşik analizinin kurulumunu ve kaydırıcı başına confusion matrix süresini ölçer."""
+    rng = np.random.default_rng(0)
+    y_true = rng.random(n_rows) < 0.3
+    scores = np.clip(np.round(0.35 * y_true + rng.normal(0.35, 0.2, n_rows), 2), 0, 1)
+
+    start = time.perf_counter()
+    sweep = ThresholdSweep(y_true, scores)
+    curve = sweep.curve()
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for threshold in np.linspace(0, 1, lookups):
+        sweep.confusion_matrix(threshold)
+    lookup = (time.perf_counter() - start) / lookups
+
+    start = time.perf_counter()
+    for threshold in np.linspace(0, 1, 10):
+        predicted = scores >= threshold
+        np.bincount(y_true * 2 + predicted, minlength=4)
+    naive = (time.perf_counter() - start) / 10
+
+    print(f"{n_rows:,} satır, {len(curve):,} farklı eşik: analiz {build:.3f} sn, ROC-AUC {sweep.roc_auc:.4f}")
+    print(f"Eşik başına confusion matrix: {lookup * 1e6:.1f} µs (tam tarama {naive * 1000:.1f} ms)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Churn eşik analizi")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    bench_parser = subparsers.add_parser('benchmark', help="Eşik analizi ve kaydırıcı süresini ölç")
+    bench_parser.add_argument('--rows', type=int, default=1_000_000)
+
+    args = parser.parse_args(argv)
+    if args.command == 'benchmark':
+        benchmark_sweep(args.rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,211 @@
+"""
+Churn modeli için paralel, çapraz doğrulamalı hiperparametre araması.
+Stratified k-fold CV parametre ızgarası üzerinde süreç havuzunda çalışır; fold
+sonuçları (veri hash'i, parametreler) anahtarıyla önbelleğe alınır, böylece
+tekrarlanan aramalar yalnızca eksik fold'ları hesaplar. Zaman bütçesi ve
+successive halving (ardışık yarılama) ile zayıf adaylar erken elenir.
+"""
+
+import hashlib
+import itertools
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+
+import numpy as np
+import pandas as pd
+
+from app.churn import fit_churn_model, MODEL_DIR
+
+DEFAULT_PARAM_GRID = {
+    'n_estimators': [100, 200, 400],
+    'max_depth': [6, 10, 16, None],
+    'min_samples_leaf': [1, 5],
+}
+TUNING_CACHE_PATH = os.path.join(MODEL_DIR, 'churn_tuning_cache.json')
+
+# Süreç havuzundaki her işçiye bir kez aktarılan veri
+_WORKER_DATA = {}
+
+
+def data_hash(X, y):
+    """Özellik matrisi ve hedef için kararlı bir içerik hash'i üretir."""
+    digest = hashlib.sha1()
+    digest.update(pd.util.hash_pandas_object(pd.DataFrame(X), index=False).to_numpy().tobytes())
+    digest.update(np.asarray(y).astype(np.int64).tobytes())
+    return digest.hexdigest()
+
+
+def expand_grid(param_grid):
+    """Parametre ızgarasını parametre sözlüklerinin listesine açar."""
+    names = sorted(param_grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(param_grid[name] for name in names))]
+
+
+class FoldCache:
+    """Fold skorlarını JSON dosyasında saklayan basit önbellek."""
+
+    def __init__(self, path=TUNING_CACHE_PATH):
+        self.path = path
+        self.scores = {}
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.scores = json.load(f)
+
+    @staticmethod
+    def key(digest, params, n_splits, fold, random_state):
+        return f"{digest}|{json.dumps(params, sort_keys=True)}|{n_splits}|{fold}|{random_state}"
+
+    def get(self, key):
+        return self.scores.get(key)
+
+    def set(self, key, score):
+        self.scores[key] = score
+
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.scores, f)
+        os.replace(tmp_path, self.path)
+
+
+def _init_worker(X, y, folds):
+    _WORKER_DATA['X'] = X
+    _WORKER_DATA['y'] = y
+    _WORKER_DATA['folds'] = folds
+
+
+def _evaluate_fold(params, fold, random_state):
+    """Tek bir (parametre, fold) çiftini eğitip doğrulama ROC-AUC değerini döndürür."""
+    from sklearn.metrics import roc_auc_score
+
+    X, y = _WORKER_DATA['X'], _WORKER_DATA['y']
+    train_idx, test_idx = _WORKER_DATA['folds'][fold]
+    scaler, model = fit_churn_model(X[train_idx], y[train_idx], random_state=random_state, **params)
+    proba = model.predict_proba(scaler.transform(X[test_idx]))[:, 1]
+    return roc_auc_score(y[test_idx], proba)
+
+
+def tune_churn_model(X, y, param_grid=None, n_splits=5, eta=3, time_budget=None, max_workers=None,
+                     random_state=42, cache_path=TUNING_CACHE_PATH):
+    """
+    Stratified k-fold CV ile successive halving hiperparametre araması yapar.
+
+    Her turda adaylar artan sayıda fold üzerinde (1, eta, eta², ... , n_splits)
+    değerlendirilir ve yalnızca en iyi 1/eta oranı bir sonraki tura geçer. Süre
+    dolduğunda yeni tur başlatılmaz, bekleyen fold'lar iptal edilir ve çalışmakta
+    olanlar beklenmez; sonuç o ana kadar tamamlanan fold'lardan oluşur.
+
+    Args:
+        X: Özellik matrisi (DataFrame ya da ndarray)
+        y: Hedef değişken
+        param_grid (dict): Parametre adı -> denenecek değerler
+        n_splits (int): Fold sayısı
+        eta (int): Her turda elenme oranı
+        time_budget (float): Saniye cinsinden süre sınırı (None: sınırsız)
+        max_workers (int): Süreç sayısı (None: tüm çekirdekler)
+        random_state (int): Fold bölme ve model tohumu
+        cache_path (str): Fold sonuç önbelleği (None: yalnızca bellek içi)
+
+    Returns:
+        dict: best_params, best_score, results (DataFrame), evaluated ve cached fold sayıları;
+        hiçbir fold tamamlanmadıysa best_params ve best_score None
+    """
+    from sklearn.model_selection import StratifiedKFold
+
+    start = time.perf_counter()
+    deadline = start + time_budget if time_budget else math.inf
+
+    X_values = np.asarray(X, dtype=np.float64)
+    y_values = np.asarray(y).astype(np.int64)
+    digest = data_hash(X_values, y_values)
+    folds = list(StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state).split(X_values, y_values))
+
+    candidates = expand_grid(param_grid or DEFAULT_PARAM_GRID)
+    scores = [dict() for _ in candidates]
+    cache = FoldCache(cache_path)
+    evaluated = cached = 0
+
+    pool = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                               initargs=(X_values, y_values, folds))
+    timed_out = False
+    try:
+        alive = list(range(len(candidates)))
+        rung = 0
+        while alive and time.perf_counter() < deadline:
+            n_folds = min(n_splits, eta ** rung)
+            pending = {}
+            for i in alive:
+                for fold in range(n_folds):
+                    if fold in scores[i]:
+                        continue
+                    key = FoldCache.key(digest, candidates[i], n_splits, fold, random_state)
+                    hit = cache.get(key)
+                    if hit is not None:
+                        scores[i][fold] = hit
+                        cached += 1
+                    else:
+                        future = pool.submit(_evaluate_fold, candidates[i], fold, random_state)
+                        pending[future] = (i, fold, key)
+
+            try:
+                # Bekleme süre sınırıyla kesilir; yalnızca tamamlanmış fold'lar sonuca girer
+                timeout = None if deadline == math.inf else max(deadline - time.perf_counter(), 0)
+                for future in as_completed(pending, timeout=timeout):
+                    i, fold, key = pending[future]
+                    scores[i][fold] = future.result()
+                    cache.set(key, scores[i][fold])
+                    evaluated += 1
+            except FuturesTimeoutError:
+                timed_out = True
+
+            cache.save()
+            if timed_out or n_folds == n_splits:
+                break
+
+            # Bu turu tamamlayan adaylar fold ortalamasına göre sıralanır
+            complete = [i for i in alive if len(scores[i]) >= n_folds]
+            complete.sort(key=lambda i: np.mean(list(scores[i].values())), reverse=True)
+            alive = complete[:max(1, len(complete) // eta)]
+            rung += 1
+    finally:
+        # Süre dolduysa kuyruktaki fold'lar iptal edilir, çalışan süreçler arka planda sonlanır
+        pool.shutdown(wait=not timed_out, cancel_futures=True)
+
+    results = pd.DataFrame([
+        {**params,
+         'mean_auc': np.mean(list(fold_scores.values())) if fold_scores else np.nan,
+         'std_auc': np.std(list(fold_scores.values())) if fold_scores else np.nan,
+         'n_folds': len(fold_scores)}
+        for params, fold_scores in zip(candidates, scores)
+    ])
+    # En çok fold'da değerlendirilen adaylar arasından en iyisi seçilir
+    results = results.sort_values(['n_folds', 'mean_auc'], ascending=[False, False]).reset_index(drop=True)
+    best = results.iloc[0]
+    # Süre hiçbir fold tamamlanmadan dolduysa önerilecek parametre yoktur
+    completed = best['n_folds'] > 0
+
+    return {
+        'best_params': {name: _to_python(best[name]) for name in candidates[0]} if completed else None,
+        'best_score': float(best['mean_auc']) if completed else None,
+        'results': results,
+        'evaluated_folds': evaluated,
+        'cached_folds': cached,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def _to_python(value):
+    """Pandas/NumPy skalerlerini sklearn'in beklediği Python tiplerine çevirir."""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
@@ -0,0 +1,158 @@
+"""
+Churn "what-if" simülasyonu.
+Senaryo ayarları (ör. şikayetleri azaltma, email açma oranını artırma) yalnızca
+seçilen müşteri segmentine uygulanır. Her ayar değişikliğinde yalnızca özellikleri
+gerçekten değişen satırlar yeniden skorlanır; başlangıç değerlerine dönen satırlar
+modele gitmeden başlangıç skorlarını alır. RiskSegment sayıları bincount ile
+artımlı güncellenir.
+
+Kullanım:
+    python -m app.churn_whatif benchmark --customers 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.churn import risk_segment_codes, CHURN_FEATURES, RISK_LABELS
+
+# Senaryo kolu -> (özellik, alt sınır, üst sınır); değer başlangıç özelliğine eklenir
+SCENARIO_LEVERS = {
+    'Complaints': (0, None),
+    'SupportTickets': (0, None),
+    'EmailOpenRate': (0.0, 1.0),
+    'LastNPSScore': (1, 10),
+    'DaysSinceLastOrder': (0, None),
+    'DiscountUsage': (0, None),
+}
+
+
+class WhatIfSimulator:
+    """
+    Kodlanmış özellik matrisi üzerinde artımlı what-if simülatörü.
+
+    Args:
+        predict_fn: Özellik matrisi (ndarray) -> 0-100 arası churn risk skorları
+        X: Başlangıç özellik matrisi (CHURN_FEATURES sırasıyla)
+        base_scores: Başlangıç skorları (verilmezse predict_fn ile hesaplanır)
+    """
+
+    def __init__(self, predict_fn, X, base_scores=None):
+        self.predict_fn = predict_fn
+        self.base_X = np.array(X, dtype=np.float64)
+        self.base_scores = (np.asarray(base_scores, dtype=np.float64) if base_scores is not None
+                            else np.asarray(predict_fn(self.base_X), dtype=np.float64))
+        self.base_codes = risk_segment_codes(self.base_scores)
+        self.base_counts = np.bincount(self.base_codes, minlength=len(RISK_LABELS))
+        self.reset()
+
+    @property
+    def n_rows(self):
+        return len(self.base_X)
+
+    def reset(self):
+        """Simülasyonu başlangıç durumuna döndürür."""
+        self.X = self.base_X.copy()
+        self.scores = self.base_scores.copy()
+        self.codes = self.base_codes.copy()
+        self.counts = self.base_counts.copy()
+        self._touched = set()
+
+    def _target_column(self, col, delta, mask):
+        """Bir özellik sütununun senaryo sonrası değerlerini hesaplar."""
+        base = self.base_X[:, col]
+        if not delta:
+            return base
+        low, high = SCENARIO_LEVERS[CHURN_FEATURES[col]]
+        adjusted = np.clip(base + delta, low, high)
+        return adjusted if mask is None else np.where(mask, adjusted, base)
+
+    def apply(self, adjustments, mask=None):
+        """
+        Senaryoyu uygular ve yalnızca değişen satırları yeniden skorlar.
+
+        Args:
+            adjustments (dict): Özellik adı -> başlangıç değerine eklenecek miktar
+            mask (ndarray): Senaryonun uygulanacağı satırlar (None: tüm müşteriler)
+
+        Returns:
+            dict: counts (segment sayıları), delta (başlangıca göre fark), rescored ve predicted satır sayıları
+        """
+        unknown = set(adjustments) - set(SCENARIO_LEVERS)
+        if unknown:
+            raise ValueError(f"Desteklenmeyen senaryo özellikleri: {', '.join(sorted(unknown))}")
+
+        # Önceki senaryoda değişmiş sütunlar da başlangıca dönebilmesi için yeniden hesaplanır
+        columns = {CHURN_FEATURES.index(name) for name, delta in adjustments.items() if delta} | self._touched
+        changed = np.zeros(self.n_rows, dtype=bool)
+        targets = {}
+        for col in columns:
+            targets[col] = self._target_column(col, adjustments.get(CHURN_FEATURES[col], 0), mask)
+            changed |= targets[col] != self.X[:, col]
+        rows = np.flatnonzero(changed)
+
+        predicted = 0
+        if len(rows):
+            for col, target in targets.items():
+                self.X[rows, col] = target[rows]
+
+            # Başlangıç değerlerine dönen satırlar modele gitmeden başlangıç skorunu alır
+            new_scores = self.base_scores[rows]
+            differs = (self.X[rows] != self.base_X[rows]).any(axis=1)
+            if differs.any():
+                new_scores[differs] = self.predict_fn(self.X[rows[differs]])
+                predicted = int(differs.sum())
+
+            new_codes = risk_segment_codes(new_scores)
+            self.counts -= np.bincount(self.codes[rows], minlength=len(RISK_LABELS))
+            self.counts += np.bincount(new_codes, minlength=len(RISK_LABELS))
+            self.scores[rows] = new_scores
+            self.codes[rows] = new_codes
+
+        self._touched = {col for col in columns if (targets[col] != self.base_X[:, col]).any()}
+        return {
+            'counts': dict(zip(RISK_LABELS, self.counts.tolist())),
+            'delta': dict(zip(RISK_LABELS, (self.counts - self.base_counts).tolist())),
+            'rescored': len(rows),
+            'predicted': predicted,
+        }
+
+
+def benchmark_whatif(n_customers=1_000_000, steps=(1, 2, 2, 0)):
+    """1M müşteride ardışık senaryo değişikliklerinin süresini ölçer."""
+    from app.churn import generate_churn_data, encode_churn_features, fit_churn_model
+    from app.forest_compiler import compile_forest
+
+    train = generate_churn_data(n_customers=2000, seed=42)
+    scaler, model = fit_churn_model(encode_churn_features(train), train['IsChurned'])
+    forest = compile_forest(model, scaler, CHURN_FEATURES)
+
+    df = generate_churn_data(n_customers=n_customers, seed=7)
+    start = time.perf_counter()
+    simulator = WhatIfSimulator(lambda X: forest.predict_proba(X)[:, 1] * 100, encode_churn_features(df))
+    print(f"Başlangıç skorlaması ({n_customers:,} müşteri): {time.perf_counter() - start:.2f} sn")
+
+    # Senaryo yalnızca kritik risk segmentine uygulanır
+    mask = simulator.base_codes == len(RISK_LABELS) - 1
+    for reduction in steps:
+        start = time.perf_counter()
+        result = simulator.apply({'Complaints': -reduction}, mask=mask)
+        print(f"Şikayet -{reduction}: {time.perf_counter() - start:.3f} sn, "
+              f"{result['rescored']:,} satır değişti, {result['predicted']:,} satır skorlandı, "
+              f"kritik risk farkı {result['delta'][RISK_LABELS[-1]]:+,}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Churn what-if simülasyonu")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    bench_parser = subparsers.add_parser('benchmark', help="Artımlı yeniden skorlama süresini ölç")
+    bench_parser.add_argument('--customers', type=int, default=1_000_000)
+
+    args = parser.parse_args(argv)
+    if args.command == 'benchmark':
+        benchmark_whatif(args.customers)
+
+
+if __name__ == '__main__':
+    main()
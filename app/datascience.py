@@ -1,35 +1,265 @@
+"""
+Veri Bilimi sekmesi için örnek veri setleri, modeller ve görselleştirmeler.
+
+Model eğitimi çalışma zamanında seçilen bir arka uca (backend) devredilir:
+    - 'sklearn'  : Random Forest sınıflandırma / regresyon, MiniBatchKMeans (scikit-learn)
+    - 'numpy'    : Gradyan artırmalı karar kütükleri, ridge regresyon ve mini-batch
+                   k-means (yalnızca NumPy)
+    - 'compiled' : Düz NumPy dizilerine derlenmiş Random Forest (app/forest_compiler.py);
+                   derlenmiş dosyalar varsa sklearn gerektirmez
+    - 'auto'     : sklearn kuruluysa 'sklearn', değilse 'numpy'
+
+Arka uç modülleri ancak ilk kullanıldığında import edilir; böylece uygulama
+açılışında yalnızca gerçekten kullanılan arka ucun maliyeti ödenir. Varsayılan
+arka uç DATASCIENCE_BACKEND ortam değişkeni ya da set_backend() ile seçilir.
+
+Kullanım:
+    python -m app.datascience benchmark
+    python -m app.datascience compile
+    python -m app.datascience plot-benchmark --customers 100000 1000000
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import os
+import subprocess
+import sys
+import time
+
 import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
-from sklearn.datasets import make_classification, make_regression
-from sklearn.metrics import accuracy_score
-from sklearn.preprocessing import StandardScaler
-from sklearn.cluster import KMeans
+
+__all__ = [
+    'BACKENDS', 'available_backends', 'set_backend', 'get_backend',
+    'generate_classification_data', 'create_random_forest_plot',
+    'generate_ab_test_data', 'create_ab_test_plot',
+    'CUSTOMER_PROFILES', 'SEGMENT_FEATURES', 'customer_features',
+    'generate_customer_segmentation_data', 'create_segmentation_plot',
+    'segment_view', 'voxel_aggregate', 'stratified_sample', 'SCATTER_BYTE_BUDGET', 'LOD_MODES',
+    'generate_regression_data', 'create_regression_plot',
+    'accuracy_score',
+]
+
+BACKENDS = ('sklearn', 'numpy', 'compiled')
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models')
+COMPILED_MODEL_PATHS = {
+    'classifier': os.path.join(MODEL_DIR, 'datascience_classifier.npz'),
+    'regressor': os.path.join(MODEL_DIR, 'datascience_regressor.npz'),
+}
+
+_default_backend = os.environ.get('DATASCIENCE_BACKEND', 'auto')
+_backend_cache = {}
+
+
+class SklearnBackend:
+    """scikit-learn Random Forest arka ucu."""
+
+    name = 'sklearn'
+    classifier_label = 'Random Forest'
+    regressor_label = 'Random Forest'
+    classifier_code = "RandomForestClassifier(\n    n_estimators=100,  # Ağaç sayısı\n    random_state=42,   # Sonuçların tekrarlanabilirliği için\n)"
+    regressor_code = "RandomForestRegressor(\n    n_estimators=100,  # Ağaç sayısı\n    random_state=42    # Sonuçların tekrarlanabilirliği için\n)"
+
+    def __init__(self):
+        from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+
+        self._classifier_cls = RandomForestClassifier
+        self._regressor_cls = RandomForestRegressor
+
+    def classifier(self):
+        return self._classifier_cls(n_estimators=100, random_state=42)
+
+    def regressor(self):
+        return self._regressor_cls(n_estimators=100, random_state=42)
+
+    def clusterer(self, n_clusters):
+        from sklearn.cluster import MiniBatchKMeans
+
+        return MiniBatchKMeans(n_clusters=n_clusters, batch_size=1024, n_init=3, random_state=42)
+
+
+class NumpyBackend:
+    """Yalnızca NumPy ile çalışan hafif model arka ucu."""
+
+    name = 'numpy'
+    classifier_label = 'Gradyan Artırma'
+    regressor_label = 'Ridge Regresyon'
+    classifier_code = "GradientBoostedStumpsClassifier(\n    n_estimators=100,   # Karar kütüğü sayısı\n    learning_rate=0.1,  # Öğrenme oranı\n)"
+    regressor_code = "RidgeRegression(\n    alpha=1.0  # L2 düzenlileştirme katsayısı\n)"
+
+    def __init__(self):
+        from app.numpy_models import GradientBoostedStumpsClassifier, RidgeRegression
+
+        self._classifier_cls = GradientBoostedStumpsClassifier
+        self._regressor_cls = RidgeRegression
+
+    def classifier(self):
+        return self._classifier_cls(n_estimators=100, learning_rate=0.1)
+
+    def regressor(self):
+        return self._regressor_cls(alpha=1.0)
+
+    def clusterer(self, n_clusters):
+        from app.numpy_models import MiniBatchKMeans
+
+        return MiniBatchKMeans(n_clusters=n_clusters, batch_size=1024, random_state=42)
+
+
+class _CompiledEstimator:
+    """
+    Tahminleri derlenmiş ormandan veren sarmalayıcı.
+
+    Eğitim verisiyle eşleşen derlenmiş dosya varsa sklearn'süz yüklenir; yoksa orman
+    sklearn ile eğitilip derlenir ve dosyaya yazılır (sklearn kurulu değilse hata).
+    """
+
+    def __init__(self, make_estimator, path, task):
+        self._make_estimator = make_estimator
+        self._path = path
+        self._task = task
+        self.forest_ = None
+
+    def _training_key(self, X, y):
+        """Eğitim verisinden türetilen sürüm; veri değişince derlenmiş dosya yeniden üretilir."""
+        digest = hashlib.sha1(self._task.encode())
+        digest.update(np.ascontiguousarray(X, dtype=np.float64).tobytes())
+        digest.update(np.ascontiguousarray(y, dtype=np.float64).tobytes())
+        return digest.hexdigest()[:16]
+
+    def fit(self, X, y):
+        from app.forest_compiler import CompiledForest, compile_forest
+
+        key = self._training_key(X, y)
+        if os.path.exists(self._path):
+            forest = CompiledForest.load(self._path)
+            if forest.model_version == key:
+                self.forest_ = forest
+        if self.forest_ is None:
+            if self._make_estimator is None:
+                raise RuntimeError(f"Derlenmiş model bulunamadı ({self._path}); "
+                                   "'python -m app.datascience compile' ile sklearn kurulu bir ortamda üretin")
+            estimator = self._make_estimator().fit(X, y)
+            self.forest_ = compile_forest(estimator, feature_names=getattr(X, 'columns', None))
+            self.forest_.model_version = key
+            try:
+                os.makedirs(os.path.dirname(self._path), exist_ok=True)
+                self.forest_.save(self._path)
+            except OSError:
+                pass  # Salt okunur dağıtımlarda derlenmiş orman yalnızca bellekte kalır
+        self.feature_importances_ = self.forest_.feature_importances_
+        return self
+
+    def predict(self, X):
+        return self.forest_.predict(np.asarray(X, dtype=np.float64))
+
+    def predict_proba(self, X):
+        return self.forest_.predict_proba(np.asarray(X, dtype=np.float64))
+
+
+class CompiledBackend:
+    """
+    Random Forest'ı düz NumPy dizilerine derleyip tahmini sklearn'süz yapan arka uç.
+
+    Derlenmiş dosyalar (COMPILED_MODEL_PATHS) varsa sklearn gerekmez; eğitim yalnızca
+    sklearn kuruluysa yapılır. Kümeleme sklearn yoksa NumPy arka ucuna bırakılır.
+    """
+
+    name = 'compiled'
+    classifier_label = 'Derlenmiş Random Forest'
+    regressor_label = 'Derlenmiş Random Forest'
+    classifier_code = SklearnBackend.classifier_code
+    regressor_code = SklearnBackend.regressor_code
+
+    def _trainer(self, kind):
+        """sklearn tahmin edicisi üreten fonksiyon; sklearn yalnızca eğitim gerekirse import edilir."""
+        if not _has_sklearn():
+            return None
+        return lambda: getattr(get_backend('sklearn'), kind)()
+
+    def classifier(self):
+        return _CompiledEstimator(self._trainer('classifier'), COMPILED_MODEL_PATHS['classifier'], 'classification')
+
+    def regressor(self):
+        return _CompiledEstimator(self._trainer('regressor'), COMPILED_MODEL_PATHS['regressor'], 'regression')
+
+    def clusterer(self, n_clusters):
+        return get_backend('sklearn' if _has_sklearn() else 'numpy').clusterer(n_clusters)
+
+
+_BACKEND_CLASSES = {'sklearn': SklearnBackend, 'numpy': NumpyBackend, 'compiled': CompiledBackend}
+
+
+def _has_sklearn():
+    return importlib.util.find_spec('sklearn') is not None
+
+
+def available_backends():
+    """Bu ortamda kullanılabilecek arka uçları (import etmeden) listeler."""
+    has_sklearn = _has_sklearn()
+    has_compiled = all(os.path.exists(path) for path in COMPILED_MODEL_PATHS.values())
+    return [name for name in BACKENDS
+            if name == 'numpy' or has_sklearn or (name == 'compiled' and has_compiled)]
+
+
+def _resolve(name):
+    name = name or _default_backend
+    if name == 'auto':
+        return 'sklearn' if 'sklearn' in available_backends() else 'numpy'
+    if name not in _BACKEND_CLASSES:
+        raise ValueError(f"Bilinmeyen arka uç: {name} (seçenekler: {', '.join(BACKENDS)}, auto)")
+    return name
+
+
+def set_backend(name):
+    """Varsayılan model arka ucunu değiştirir ('sklearn', 'numpy', 'compiled' ya da 'auto')."""
+    global _default_backend
+    _resolve(name)
+    _default_backend = name
+
+
+def get_backend(name=None):
+    """Arka ucu (ilk kullanımda import ederek) döndürür."""
+    name = _resolve(name)
+    if name not in _backend_cache:
+        _backend_cache[name] = _BACKEND_CLASSES[name]()
+    return _backend_cache[name]
+
 
 def generate_classification_data():
     """İkili sınıflandırma için örnek veri seti oluşturur."""
-    X, y = make_classification(
-        n_samples=500,
-        n_features=6,
-        n_informative=4,
-        n_redundant=1,
-        n_repeated=0,
-        n_classes=2,
-        random_state=42
-    )
+    np.random.seed(42)
+    n_samples = 500
     
-    # Özelliklere anlamlı isimler verme
-    feature_names = ['yaş', 'gelir', 'kredi_skoru', 'harcama_oranı', 'üyelik_süresi', 'etkileşim']
-    X = pd.DataFrame(X, columns=feature_names)
+    # Özellikler için rastgele veriler oluştur
+    features = {
+        'yaş': np.random.normal(40, 10, n_samples),
+        'gelir': np.random.normal(50000, 15000, n_samples),
+        'kredi_skoru': np.random.normal(700, 100, n_samples),
+        'harcama_oranı': np.random.normal(0.3, 0.1, n_samples),
+        'üyelik_süresi': np.random.normal(5, 3, n_samples),
+        'etkileşim': np.random.normal(100, 30, n_samples)
+    }
+
+    X = pd.DataFrame(features)
+
+    # Sınıf etiketlerini standartlaştırılmış özelliklerin lojistik bir fonksiyonundan üret
+    weights = np.array([0.4, 1.2, 0.9, -0.8, 0.5, 0.1])
+    Z = (X - X.mean()) / X.std()
+    p = 1 / (1 + np.exp(-(Z.to_numpy() @ weights)))
+    y = (np.random.random(n_samples) < p).astype(int)
     
     return X, y
 
-def create_random_forest_plot(X, y):
-    """Random Forest modeli oluşturur ve özellik önemlerini görselleştirir."""
-    # Random Forest modelini oluştur ve eğit
-    model = RandomForestClassifier(n_estimators=100, random_state=42)
+def create_random_forest_plot(X, y, backend=None):
+    """Seçili arka uçla sınıflandırma modeli oluşturur ve özellik önemlerini görselleştirir."""
+    backend = get_backend(backend)
+
+    # Modeli oluştur ve eğit
+    model = backend.classifier()
     model.fit(X, y)
     
     # Özellik önemleri
@@ -44,7 +274,7 @@ def create_random_forest_plot(X, y):
         x='önem',
         y='özellik',
         orientation='h',
-        title='Random Forest Özellik Önemleri',
+        title=f'{backend.classifier_label} Özellik Önemleri',
         color='önem',
         color_continuous_scale='Blues',
         labels={'önem': 'Önem Skoru', 'özellik': 'Özellik'}
@@ -60,34 +290,43 @@ def create_random_forest_plot(X, y):
     
     return model, fig
 
-def generate_ab_test_data():
-    """A/B test için örnek veri seti oluşturur."""
-    # Parametreler
-    n_samples = 1000
-    conversion_rate_a = 0.12
-    conversion_rate_b = 0.15
+AB_CONVERSION_RATES = {'A': 0.12, 'B': 0.15}
+AB_SPENDING = {'A': (150, 30), 'B': (160, 35)}  # Dönüşen kullanıcı harcaması: (ortalama, std)
     
-    # Kullanıcı grupları
-    np.random.seed(42)
-    data = pd.DataFrame({
-        'kullanici_id': range(n_samples),
-        'grup': np.random.choice(['A', 'B'], size=n_samples)
+
+def generate_ab_test_data(n_samples=1000, conversion_rates=None, spending=None, seed=42):
+    """
+    A/B(/n) test için örnek veri seti oluşturur (sütun bazında vektörel).
+
+    Args:
+        n_samples (int): Kullanıcı sayısı
+        conversion_rates (dict): Varyant -> dönüşüm oranı (varsayılan A: %12, B: %15)
+        spending (dict): Varyant -> dönüşen kullanıcı harcaması (ortalama, std)
+        seed (int): Rastgelelik tohumu
+
+    Returns:
+        DataFrame: kullanici_id, grup, donusum, harcama
+    """
+    conversion_rates = conversion_rates or AB_CONVERSION_RATES
+    spending = spending or AB_SPENDING
+    variants = list(conversion_rates)
+    rng = np.random.default_rng(seed)
+
+    # Kullanıcılar varyantlara eşit olasılıkla atanır
+    group_codes = rng.integers(0, len(variants), size=n_samples)
+    rates = np.array([conversion_rates[v] for v in variants])
+    conversions = rng.random(n_samples) < rates[group_codes]
+
+    # Harcama yalnızca dönüşen kullanıcılarda
+    means, stds = np.array([spending[v] for v in variants], dtype=float).T
+    spend = np.where(conversions, rng.normal(means[group_codes], stds[group_codes]), 0.0)
+
+    return pd.DataFrame({
+        'kullanici_id': np.arange(n_samples),
+        'grup': pd.Categorical.from_codes(group_codes, variants),
+        'donusum': conversions.astype(np.int8),
+        'harcama': spend
     })
-    
-    # Dönüşüm durumları
-    data['donusum'] = data['grup'].apply(
-        lambda x: np.random.choice(
-            [0, 1],
-            p=[1-conversion_rate_a, conversion_rate_a] if x == 'A' else [1-conversion_rate_b, conversion_rate_b]
-        )
-    )
-    
-    # Harcama miktarları (dönüşüm varsa)
-    data['harcama'] = 0
-    data.loc[(data['grup'] == 'A') & (data['donusum'] == 1), 'harcama'] = np.random.normal(150, 30, size=((data['grup'] == 'A') & (data['donusum'] == 1)).sum())
-    data.loc[(data['grup'] == 'B') & (data['donusum'] == 1), 'harcama'] = np.random.normal(160, 35, size=((data['grup'] == 'B') & (data['donusum'] == 1)).sum())
-    
-    return data
 
 def create_ab_test_plot(data):
     """A/B test sonuçlarını görselleştirir."""
@@ -134,85 +373,192 @@ def create_ab_test_plot(data):
     
     return conversion_fig, spending_fig
 
-def generate_customer_segmentation_data():
-    """Müşteri segmentasyonu için örnek veri seti oluşturur."""
-    np.random.seed(42)
-    n_samples = 500
-    
-    # Yüksek değerli müşteriler
-    high_value = pd.DataFrame({
-        'musteri_id': [f'H{i}' for i in range(100)],
-        'yillik_harcama': np.random.normal(5000, 1000, 100),
-        'alisveris_sikligi': np.random.normal(20, 5, 100),
-        'musteri_suresi': np.random.normal(5, 1, 100),
-        'segment': 'Yüksek Değer'
-    })
-    
-    # Orta değerli müşteriler
-    mid_value = pd.DataFrame({
-        'musteri_id': [f'M{i}' for i in range(200)],
-        'yillik_harcama': np.random.normal(2500, 500, 200),
-        'alisveris_sikligi': np.random.normal(10, 3, 200),
-        'musteri_suresi': np.random.normal(3, 1, 200),
-        'segment': 'Orta Değer'
-    })
-    
-    # Düşük değerli müşteriler
-    low_value = pd.DataFrame({
-        'musteri_id': [f'L{i}' for i in range(150)],
-        'yillik_harcama': np.random.normal(1000, 300, 150),
-        'alisveris_sikligi': np.random.normal(5, 2, 150),
-        'musteri_suresi': np.random.normal(2, 0.5, 150),
-        'segment': 'Düşük Değer'
-    })
-    
-    # Yeni müşteriler
-    new_customers = pd.DataFrame({
-        'musteri_id': [f'N{i}' for i in range(50)],
-        'yillik_harcama': np.random.normal(800, 200, 50),
-        'alisveris_sikligi': np.random.normal(3, 1, 50),
-        'musteri_suresi': np.random.normal(0.5, 0.2, 50),
-        'segment': 'Yeni Müşteri'
-    })
-    
-    # Veri setlerini birleştir
-    data = pd.concat([high_value, mid_value, low_value, new_customers], ignore_index=True)
-    
-    # Negatif değerleri düzelt
-    for col in ['yillik_harcama', 'alisveris_sikligi', 'musteri_suresi']:
-        data.loc[data[col] < 0, col] = 0
-    
-    # Her segment için farklı renkler
-    segment_colors = {
-        'Yüksek Değer': '#1F77B4',  # Mavi
-        'Orta Değer': '#FF7F0E',    # Turuncu
-        'Düşük Değer': '#2CA02C',   # Yeşil
-        'Yeni Müşteri': '#D62728'   # Kırmızı
-    }
-    
+# Örnek müşteri profilleri: (ad, pay, yıllık harcama ort./std, sıklık ort./std, süre ort./std)
+CUSTOMER_PROFILES = [
+    ('Yüksek Değer', 0.2, 5000, 1000, 20, 5, 5, 1),
+    ('Orta Değer', 0.4, 2500, 500, 10, 3, 3, 1),
+    ('Düşük Değer', 0.3, 1000, 300, 5, 2, 2, 0.5),
+    ('Yeni Müşteri', 0.1, 800, 200, 3, 1, 0.5, 0.2),
+]
+SEGMENT_FEATURES = ['yillik_harcama', 'alisveris_sikligi', 'musteri_suresi']
+    
+    
+def customer_features(n_samples, rng):
+    """
+    Profil karışımından müşteri özellik matrisini (n_samples × 3) ve profil kodlarını üretir.
+    Tüm müşteriler tek çekimle oluşturulur; büyük veri setleri parça parça üretilebilir.
+    """
+    profiles = np.array([profile[1:] for profile in CUSTOMER_PROFILES], dtype=np.float64)
+    codes = rng.choice(len(profiles), size=n_samples, p=profiles[:, 0])
+    params = profiles[codes]
+    features = rng.normal(params[:, 1::2], params[:, 2::2])
+    np.maximum(features, 0, out=features)  # Negatif değerleri düzelt
+    return features, codes
+    
+    
+def generate_customer_segmentation_data(n_samples=500, seed=42):
+    """
+    Müşteri segmentasyonu için örnek veri seti oluşturur.
+    
+    'profil' müşterinin üretildiği gerçek gruptur; 'segment' varsayılan olarak profile
+    eşittir ve segmentasyon modelinin atamalarıyla değiştirilebilir.
+    """
+    features, codes = customer_features(n_samples, np.random.default_rng(seed))
+    data = pd.DataFrame(features, columns=SEGMENT_FEATURES)
+    data.insert(0, 'musteri_id', [f'C{i}' for i in range(n_samples)])
+    data['profil'] = pd.Categorical.from_codes(codes, [profile[0] for profile in CUSTOMER_PROFILES])
+    data['segment'] = data['profil']
     return data
 
-def create_segmentation_plot(data):
-    """Müşteri segmentasyonunu 3D görselleştirme ile sunar."""
+SEGMENT_LABELS = {
+    'yillik_harcama': 'Yıllık Harcama (TL)',
+    'alisveris_sikligi': 'Alışveriş Sıklığı (yıllık)',
+    'musteri_suresi': 'Müşteri Süresi (yıl)',
+    'segment': 'Müşteri Segmenti',
+    'musteri_sayisi': 'Müşteri Sayısı',
+}
+SEGMENT_COLORS = {
+    'Yüksek Değer': '#1F77B4',  # Mavi
+    'Orta Değer': '#FF7F0E',    # Turuncu
+    'Düşük Değer': '#2CA02C',   # Yeşil
+    'Yeni Müşteri': '#D62728'   # Kırmızı
+}
+SCATTER_BYTE_BUDGET = int(os.environ.get('SCATTER_BYTE_BUDGET', 1_500_000))  # grafik JSON yükü üst sınırı
+SCATTER_POINT_LIMIT = 50_000  # WebGL 3D saçılımın akıcı kaldığı nokta sayısı
+SCATTER_OVERHEAD_BYTES = 20_000  # düzen, şablon ve iz başına sabit alanlar
+LOD_MODES = ('auto', 'points', 'voxel', 'sample')
+VOXEL_RESOLUTIONS = (96, 48, 32, 24, 16, 12, 8, 6, 4, 3, 2, 1)  # 96'nın bölenleri
+
+
+def _array_bytes(n, itemsize):
+    """n elemanlı sayısal dizinin plotly JSON'undaki (base64) boyutu."""
+    return 4 * -(-n * itemsize // 3)
+
+
+def _point_budget(byte_budget, bytes_per_point):
+    return max(1, min(SCATTER_POINT_LIMIT, (byte_budget - SCATTER_OVERHEAD_BYTES) // bytes_per_point))
+
+
+def segment_view(data, region=None):
+    """Yakınlaştırılan bölgedeki müşteriler; region: {sütun: (alt, üst)}."""
+    if not region:
+        return data
+    mask = np.ones(len(data), dtype=bool)
+    for column, (low, high) in region.items():
+        values = data[column].to_numpy()
+        mask &= (values >= low) & (values <= high)
+    return data[mask]
+
+
+def voxel_aggregate(data, max_points, features=SEGMENT_FEATURES):
+    """
+    Müşterileri segment başına 3D voksel ızgarasında toplar.
+
+    Müşteriler bir kez en ince ızgaraya yerleştirilir; daha kaba ızgaralar bu dolu
+    hücrelerden türetilir ve dolu (segment, voksel) hücre sayısı max_points'e
+    sığan ilk ızgara seçilir. Her hücre için müşteri sayısı ve hücredeki
+    müşterilerin ortalama konumu döndürülür.
+    """
+    X = data[features].to_numpy(dtype=np.float64)
+    segments = pd.Categorical(data['segment'])
+    low, high = X.min(axis=0), X.max(axis=0)
+    span = np.where(high > low, high - low, 1.0)
+    finest = VOXEL_RESOLUTIONS[0]
+    q = np.minimum(((X - low) * (finest / span)).astype(np.int64), finest - 1)
+    codes = ((segments.codes.astype(np.int64) * finest + q[:, 0]) * finest + q[:, 1]) * finest + q[:, 2]
+    grid = len(segments.categories) * finest ** 3
+    if grid <= len(codes):
+        # Izgara veriden küçükse sıralama yerine doğrudan hücre sayımı
+        counts = np.bincount(codes, minlength=grid)
+        cells = np.flatnonzero(counts)
+        counts = counts[cells]
+        sums = np.column_stack([np.bincount(codes, weights=X[:, j], minlength=grid)[cells] for j in range(X.shape[1])])
+    else:
+        cells, inverse = np.unique(codes, return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(cells))
+        sums = np.column_stack([np.bincount(inverse, weights=X[:, j], minlength=len(cells)) for j in range(X.shape[1])])
+
+    seg, rest = np.divmod(cells, finest ** 3)
+    fine_q = np.column_stack([rest // finest ** 2, rest // finest % finest, rest % finest])
+    for resolution in VOXEL_RESOLUTIONS:
+        coarse_q = fine_q // (finest // resolution)
+        coarse = ((seg * resolution + coarse_q[:, 0]) * resolution + coarse_q[:, 1]) * resolution + coarse_q[:, 2]
+        coarse_cells, coarse_inverse = np.unique(coarse, return_inverse=True)
+        if len(coarse_cells) <= max_points:
+            break
+    coarse_counts = np.bincount(coarse_inverse, weights=counts, minlength=len(coarse_cells))
+    aggregated = pd.DataFrame({
+        column: (np.bincount(coarse_inverse, weights=sums[:, j], minlength=len(coarse_cells)) / coarse_counts).astype(np.float32)
+        for j, column in enumerate(features)})
+    aggregated['segment'] = pd.Categorical.from_codes(coarse_cells // resolution ** 3, segments.categories)
+    aggregated['musteri_sayisi'] = coarse_counts.astype(np.int32)
+    aggregated.attrs['resolution'] = resolution
+    return aggregated
+
+
+def stratified_sample(data, max_points, seed=0):
+    """
+    Segment başına tabakalı örneklem: bütçenin yarısı segmentlere eşit, yarısı
+    segment büyüklüğüyle orantılı dağıtılır; küçük segmentler görünür kalır.
+    """
+    codes = pd.Categorical(data['segment']).codes
+    sizes = np.bincount(codes)
+    quota = np.minimum(sizes, max_points // (2 * len(sizes)) + (max_points // 2) * sizes // max(len(codes), 1))
+    rng = np.random.default_rng(seed)
+    picked = [rng.choice(np.flatnonzero(codes == code), size=quota[code], replace=False)
+              for code in range(len(sizes))]
+    return data.iloc[np.sort(np.concatenate(picked))]
+
+
+def create_segmentation_plot(data, region=None, lod='auto', byte_budget=SCATTER_BYTE_BUDGET):
+    """
+    Müşteri segmentasyonunu 3D görselleştirme ile sunar.
+
+    Nokta sayısı bayt bütçesini aşarsa ayrıntı düzeyi (level of detail) uygulanır:
+    'voxel' müşterileri segment başına voksellerde toplayıp müşteri sayısıyla
+    boyutlandırır, 'sample' tabakalı örneklem çizer. 'auto' bütçeye sığan veriyi
+    nokta nokta, sığmayanı voksel olarak çizer. region verilirse yalnızca
+    yakınlaştırılan bölgedeki müşteriler kullanılır; bölge daraldıkça ayrıntı artar.
+
+    Args:
+        data (DataFrame): SEGMENT_FEATURES, 'segment' ve 'musteri_id' sütunları
+        region (dict): {sütun: (alt, üst)} yakınlaştırma bölgesi
+        lod (str): 'auto', 'points', 'voxel' ya da 'sample'
+        byte_budget (int): Grafik JSON yükü için yaklaşık üst sınır (bayt)
+    """
+    if lod not in LOD_MODES:
+        raise ValueError(f"Desteklenmeyen ayrıntı düzeyi: {lod} (seçenekler: {', '.join(LOD_MODES)})")
+    view = segment_view(data, region)
+    ids = view['musteri_id']
+    hover_bytes = int(np.ceil(ids.sample(min(len(ids), 1000), random_state=0).str.len().mean())) + 4 if len(ids) else 0
+    point_bytes = _array_bytes(3, 4) + hover_bytes
+    if lod == 'auto' or view.empty:
+        lod = 'points' if len(view) <= _point_budget(byte_budget, point_bytes) else 'voxel'
+
+    if lod == 'voxel':
+        # x, y, z, boyut (float32) + müşteri sayısı (int32)
+        plot_data = voxel_aggregate(view, _point_budget(byte_budget, _array_bytes(5, 4)))
+        title = (f'Müşteri Segmentasyonu 3D Görünümü ({len(view):,} müşteri, '
+                 f'{len(plot_data):,} voksel, {plot_data.attrs["resolution"]}³ ızgara)')
+        extra = dict(size='musteri_sayisi', size_max=18, hover_data={'musteri_sayisi': True})
+    else:
+        plot_data = view
+        if lod == 'sample' or len(view) > _point_budget(byte_budget, point_bytes):
+            plot_data = stratified_sample(view, _point_budget(byte_budget, point_bytes))
+        plot_data = plot_data.astype({column: np.float32 for column in SEGMENT_FEATURES})
+        title = 'Müşteri Segmentasyonu 3D Görünümü' + (
+            f' ({len(plot_data):,} / {len(view):,} müşteri örneklendi)' if len(plot_data) < len(view) else '')
+        extra = dict(hover_name='musteri_id')
+
     fig = px.scatter_3d(
-        data,
+        plot_data,
         x='yillik_harcama',
         y='alisveris_sikligi',
         z='musteri_suresi',
         color='segment',
-        hover_name='musteri_id',
-        labels={
-            'yillik_harcama': 'Yıllık Harcama (TL)',
-            'alisveris_sikligi': 'Alışveriş Sıklığı (yıllık)',
-            'musteri_suresi': 'Müşteri Süresi (yıl)',
-            'segment': 'Müşteri Segmenti'
-        },
-        color_discrete_map={
-            'Yüksek Değer': '#1F77B4',  # Mavi
-            'Orta Değer': '#FF7F0E',    # Turuncu
-            'Düşük Değer': '#2CA02C',   # Yeşil
-            'Yeni Müşteri': '#D62728'   # Kırmızı
-        }
+        labels=SEGMENT_LABELS,
+        color_discrete_map=SEGMENT_COLORS,
+        **extra
     )
     
     fig.update_layout(
@@ -223,31 +569,63 @@ def create_segmentation_plot(data):
         ),
         height=700,
         margin=dict(l=0, r=0, b=0, t=30),
-        title='Müşteri Segmentasyonu 3D Görünümü'
+        title=title
     )
     
     return fig
 
+
+def benchmark_segmentation_plot(sizes=(10_000, 100_000, 1_000_000), byte_budget=SCATTER_BYTE_BUDGET):
+    """Ayrıntı düzeylerinin çizim süresini ve JSON yük boyutunu ölçer."""
+    print(f"Bayt bütçesi: {byte_budget / 1e6:.1f} MB")
+    for n in sizes:
+        data = generate_customer_segmentation_data(n)
+        data['segment'] = data['profil']
+        draws = {lod: (lambda lod=lod: create_segmentation_plot(data, lod=lod, byte_budget=byte_budget))
+                 for lod in ('auto', 'voxel', 'sample')}
+        if n <= 1_000_000:
+            # Önceki davranış: her müşteri tek nokta olarak gönderilir
+            draws['tümü'] = lambda: px.scatter_3d(data, x='yillik_harcama', y='alisveris_sikligi', z='musteri_suresi',
+                                                  color='segment', hover_name='musteri_id')
+        for lod, draw in draws.items():
+            start = time.perf_counter()
+            payload = len(draw().to_json())
+            elapsed = time.perf_counter() - start
+            print(f"  {n:>10,} müşteri  {lod:>7}: {elapsed * 1000:8.1f} ms, {payload / 1e6:7.2f} MB")
+
 def generate_regression_data():
     """Regresyon için örnek veri seti oluşturur."""
-    X, y = make_regression(
-        n_samples=200,
-        n_features=5,
-        n_informative=4,
-        noise=20,
-        random_state=42
-    )
-    
-    # Özelliklere anlamlı isimler verme
-    feature_names = ['reklam_harcaması', 'müşteri_memnuniyeti', 'ürün_kalitesi', 'pazar_rekabeti', 'fiyat_optimizasyonu']
-    X = pd.DataFrame(X, columns=feature_names)
+    np.random.seed(42)
+    n_samples = 200
+    
+    # Özellikler için rastgele veriler oluştur
+    features = {
+        'reklam_harcaması': np.random.normal(1000, 300, n_samples),
+        'müşteri_memnuniyeti': np.random.normal(8, 1, n_samples),
+        'ürün_kalitesi': np.random.normal(7, 1.5, n_samples),
+        'pazar_rekabeti': np.random.normal(6, 2, n_samples),
+        'fiyat_optimizasyonu': np.random.normal(5, 1, n_samples)
+    }
+
+    X = pd.DataFrame(features)
+
+    # Hedef değişkeni oluştur
+    y = (
+        0.5 * X['reklam_harcaması'] +
+        0.3 * X['müşteri_memnuniyeti'] * 100 +
+        0.2 * X['ürün_kalitesi'] * 80 -
+        0.1 * X['pazar_rekabeti'] * 50 +
+        0.05 * X['fiyat_optimizasyonu'] * 120
+    ) + np.random.normal(0, 500, n_samples)
     
     return X, y
 
-def create_regression_plot(X, y):
-    """Random Forest regresyon modeli oluşturur ve sonuçları görselleştirir."""
-    # Random Forest regresyon modeli oluştur ve eğit
-    model = RandomForestRegressor(n_estimators=100, random_state=42)
+def create_regression_plot(X, y, backend=None):
+    """Seçili arka uçla regresyon modeli oluşturur ve sonuçları görselleştirir."""
+    backend = get_backend(backend)
+
+    # Regresyon modeli oluştur ve eğit
+    model = backend.regressor()
     model.fit(X, y)
     
     # Tahminler
@@ -258,7 +636,7 @@ def create_regression_plot(X, y):
         x=y,
         y=y_pred,
         labels={'x': 'Gerçek Değerler', 'y': 'Tahmin Edilen Değerler'},
-        title='Random Forest Regresyon Modeli: Gerçek vs Tahmin'
+        title=f'{backend.regressor_label} Modeli: Gerçek vs Tahmin'
     )
     
     # Mükemmel tahmin çizgisi (y=x)
@@ -285,4 +663,90 @@ def create_regression_plot(X, y):
         height=500
     )
     
-    return model, fig
\ No newline at end of file
+    return model, fig
+
+def accuracy_score(y_true, y_pred):
+    """Doğruluk oranını hesaplar (sklearn gerektirmez)."""
+    return np.mean(np.asarray(y_true) == np.asarray(y_pred))
+
+
+def _import_seconds(backend_name):
+    """Arka ucun import maliyetini temiz bir Python sürecinde ölçer."""
+    code = ("import time, app.datascience as ds; t = time.perf_counter(); "
+            f"ds.get_backend('{backend_name}'); print(time.perf_counter() - t)")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True, check=True)
+    return float(output.stdout.strip())
+
+
+def benchmark_backends(backends=None, repeats=20):
+    """Arka uçların import, eğitim ve tahmin sürelerini karşılaştırır."""
+    X_clf, y_clf = generate_classification_data()
+    X_reg, y_reg = generate_regression_data()
+
+    rows = []
+    for name in backends or available_backends():
+        backend = get_backend(name)
+
+        start = time.perf_counter()
+        classifier = backend.classifier().fit(X_clf, y_clf)
+        fit_clf = time.perf_counter() - start
+
+        start = time.perf_counter()
+        regressor = backend.regressor().fit(X_reg, y_reg)
+        fit_reg = time.perf_counter() - start
+
+        single = X_clf.iloc[:1]
+        start = time.perf_counter()
+        for _ in range(repeats):
+            classifier.predict(single)
+        predict_one = (time.perf_counter() - start) / repeats
+
+        rows.append({
+            'arka_uç': name,
+            'import_ms': _import_seconds(name) * 1000,
+            'sınıflandırma_eğitim_ms': fit_clf * 1000,
+            'regresyon_eğitim_ms': fit_reg * 1000,
+            'tekil_tahmin_ms': predict_one * 1000,
+            'doğruluk': accuracy_score(y_clf, classifier.predict(X_clf)),
+            'r2': 1 - np.sum((y_reg - regressor.predict(X_reg)) ** 2) / np.sum((y_reg - y_reg.mean()) ** 2),
+        })
+
+    results = pd.DataFrame(rows)
+    print(results.round(3).to_string(index=False))
+    return results
+
+
+def compile_demo_models():
+    """Örnek veriyle eğitilen ormanları derleyip COMPILED_MODEL_PATHS'e yazar (sklearn gerekir)."""
+    if not _has_sklearn():
+        raise RuntimeError("Derlenmiş modelleri üretmek için sklearn gerekli")
+    backend = get_backend('compiled')
+    backend.classifier().fit(*generate_classification_data())
+    backend.regressor().fit(*generate_regression_data())
+    for path in COMPILED_MODEL_PATHS.values():
+        print(f"Yazıldı: {path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Veri bilimi arka uç araçları")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    bench_parser = subparsers.add_parser('benchmark', help="Arka uçları karşılaştır")
+    bench_parser.add_argument('--backends', nargs='+', choices=BACKENDS)
+    bench_parser.add_argument('--repeats', type=int, default=20)
+    subparsers.add_parser('compile', help="Örnek modelleri sklearn'süz 'compiled' arka ucu için derle")
+    plot_parser = subparsers.add_parser('plot-benchmark', help="3D segmentasyon grafiğinin ayrıntı düzeylerini ölç")
+    plot_parser.add_argument('--customers', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    plot_parser.add_argument('--byte-budget', type=int, default=SCATTER_BYTE_BUDGET)
+
+    args = parser.parse_args(argv)
+    if args.command == 'benchmark':
+        benchmark_backends(args.backends, args.repeats)
+    elif args.command == 'compile':
+        compile_demo_models()
+    elif args.command == 'plot-benchmark':
+        benchmark_segmentation_plot(args.customers, args.byte_budget)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,425 @@
+"""
+Sipariş olaylarından türetilen, sürümlü müşteri özellik deposu (feature store).
+Churn, RFM ve Cohort sekmeleri aynı sipariş olay tablosunu ve bu tablodan
+vektörel groupby ile hesaplanan müşteri özelliklerini kullanır.
+
+Depo, müşteri başına toplam istatistikleri (sipariş sayısı, toplam tutar, ilk/son
+sipariş, şikayet vb.) materyalize edilmiş bir tabloda sürüm numarasıyla saklar.
+Yenilemede yalnızca son işlenen OrderID'den (watermark) sonraki olaylar
+toplanıp mevcut istatistiklere eklenir; watermark'a kadarki olaylar daha önce
+işlenenlerle eşleşmezse (ör. başka bir veri seti) depo sıfırdan kurulur. Tarih
+bağımlı özellikler (ör. DaysSinceLastOrder) analiz tarihine göre yeniden türetilir.
+
+Kullanım:
+    python -m app.feature_store benchmark --customers 200000
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from app.churn import (_customer_ids, CATEGORY_LEVELS, CHURN_RATE, CITIES, CITY_PROBS, NUMERIC_FEATURES,
+                       PAYMENT_METHODS, PAYMENT_PROBS, PRODUCT_CATEGORIES)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+FEATURE_STORE_DIR = os.path.join(DATA_DIR, 'feature_store')
+ANALYSIS_DATE = datetime(2024, 10, 1)
+HISTORY_DAYS = 365
+KEEP_VERSIONS = 3
+
+# Olaylardan toplanan toplamsal istatistikler
+SUM_COLUMNS = {'TotalOrders': 'OrderID', 'TotalSpent': 'OrderValue', 'Complaints': 'Complaint',
+               'SupportTickets': 'SupportTicket', 'DiscountUsage': 'DiscountUsed'}
+COUNT_COLUMNS = {
+    'Category': [f'CategoryCount_{i}' for i in range(len(PRODUCT_CATEGORIES))],
+    'PaymentMethod': [f'PaymentCount_{i}' for i in range(len(PAYMENT_METHODS))],
+}
+CUSTOMER_ATTRIBUTES = ['City', 'EmailOpenRate', 'LastNPSScore', 'IsChurned']
+
+# Churn / aktif müşteri davranış aralıkları: (churn, aktif)
+_ORDER_COUNTS = ((1, 8), (3, 30))
+_ORDER_VALUES = ((50, 300), (100, 1000))
+_EVENT_RATES = {'Complaint': (0.25, 0.05), 'SupportTicket': (0.3, 0.08), 'DiscountUsed': (0.15, 0.35)}
+
+
+def _by_churn(churned, ranges):
+    """(churn, aktif) aralık çiftinden müşteri başına alt ve üst sınır dizilerini döndürür."""
+    (churn_low, churn_high), (active_low, active_high) = ranges
+    return np.where(churned, churn_low, active_low), np.where(churned, churn_high, active_high)
+
+
+def generate_order_events(n_customers=2000, seed=42, as_of=ANALYSIS_DATE):
+    """
+    Sentetik sipariş olay tablosu ve müşteri nitelikleri tablosu üretir.
+
+    Churn olmuş müşteriler analiz tarihinden en az 90 gün önce sipariş vermeyi
+    bırakır; aktif müşterilerin son siparişi son 60 gün içindedir. Tüm olaylar
+    müşteri başına sipariş sayısı kadar tekrar eden dizilerle tek seferde üretilir.
+
+    Args:
+        n_customers (int): Müşteri sayısı
+        seed (int): Rastgele sayı üreteci tohumu
+        as_of (datetime): Analiz tarihi
+
+    Returns:
+        tuple: (events, customers) DataFrame'leri; olaylar tarih sırasına göre OrderID alır
+    """
+    rng = np.random.default_rng(seed)
+    churned = rng.random(n_customers) < CHURN_RATE
+
+    # Müşteri ömrü (ilk sipariş) ve son siparişten bu yana geçen gün
+    lifetime = rng.integers(np.where(churned, 120, 30), HISTORY_DAYS)
+    gap_low = np.where(churned, 90, 1)
+    gap_high = np.where(churned, lifetime, np.minimum(60, lifetime))
+    last_gap = gap_low + (rng.random(n_customers) * (gap_high - gap_low)).astype(np.int64)
+    n_orders = rng.integers(*_by_churn(churned, _ORDER_COUNTS))
+    avg_value = rng.uniform(*_by_churn(churned, _ORDER_VALUES))
+    preferred_category = rng.integers(0, len(PRODUCT_CATEGORIES), n_customers)
+    preferred_payment = rng.choice(len(PAYMENT_METHODS), size=n_customers, p=PAYMENT_PROBS)
+
+    # Sipariş başına satırlar: müşteri indeksi ve müşteri içindeki sıra
+    customer = np.repeat(np.arange(n_customers), n_orders)
+    position = np.arange(len(customer)) - np.repeat(np.cumsum(n_orders) - n_orders, n_orders)
+    n_events = len(customer)
+
+    # İlk sipariş ömür başında, son sipariş last_gap gün önce; aradakiler rastgele
+    first, last = lifetime[customer], np.where(n_orders[customer] == 1, lifetime[customer], last_gap[customer])
+    days_ago = np.where(position == 0, first,
+                        np.where(position == n_orders[customer] - 1, last,
+                                 rng.integers(last, first + 1)))
+
+    category = np.where(rng.random(n_events) < 0.6, preferred_category[customer],
+                        rng.integers(0, len(PRODUCT_CATEGORIES), n_events))
+    payment = np.where(rng.random(n_events) < 0.7, preferred_payment[customer],
+                       rng.choice(len(PAYMENT_METHODS), size=n_events, p=PAYMENT_PROBS))
+    flags = {name: rng.random(n_events) < np.where(churned, rates[0], rates[1])[customer]
+             for name, rates in _EVENT_RATES.items()}
+
+    order_dates = np.datetime64(as_of, 'D') - days_ago.astype('timedelta64[D]')
+    order = np.argsort(order_dates, kind='stable')
+    customer_ids = _customer_ids(n_customers)
+
+    events = pd.DataFrame({
+        'OrderID': np.arange(1, n_events + 1),
+        'CustomerID': customer_ids[customer[order]],
+        'OrderDate': order_dates[order].astype('datetime64[ns]'),
+        'OrderValue': (avg_value[customer] * rng.uniform(0.7, 1.3, n_events))[order].round(2),
+        'Category': pd.Categorical.from_codes(category[order], PRODUCT_CATEGORIES),
+        'PaymentMethod': pd.Categorical.from_codes(payment[order], PAYMENT_METHODS),
+        **{name: flag[order].astype(np.int64) for name, flag in flags.items()},
+    })
+    customers = pd.DataFrame({
+        'CustomerID': customer_ids,
+        'City': pd.Categorical.from_codes(rng.choice(len(CITIES), size=n_customers, p=CITY_PROBS), CITIES),
+        'EmailOpenRate': np.where(churned, rng.uniform(0, 0.4, n_customers), rng.uniform(0.3, 0.9, n_customers)).round(2),
+        'LastNPSScore': np.where(churned, rng.integers(1, 6, n_customers), rng.integers(6, 11, n_customers)),
+        'IsChurned': churned.astype(np.int64),
+    })
+    return events, customers
+
+
+def aggregate_orders(events):
+    """Olayları müşteri başına toplamsal istatistiklere indirger (vektörel groupby)."""
+    grouped = events.groupby('CustomerID', sort=False)
+    aggregates = grouped.agg(
+        FirstOrderDate=('OrderDate', 'min'),
+        LastOrderDate=('OrderDate', 'max'),
+        **{name: (column, 'count' if name == 'TotalOrders' else 'sum') for name, column in SUM_COLUMNS.items()},
+    )
+    for column, names in COUNT_COLUMNS.items():
+        counts = events.groupby(['CustomerID', column], sort=False, observed=False).size().unstack(fill_value=0)
+        counts.columns = names
+        aggregates = aggregates.join(counts)
+    return aggregates
+
+
+def merge_aggregates(state, delta):
+    """Yeni olayların istatistiklerini mevcut istatistiklerle birleştirir."""
+    if state is None or state.empty:
+        return delta.copy()
+    index = state.index.union(delta.index)
+    state, delta = state.reindex(index), delta.reindex(index)
+
+    merged = pd.DataFrame(index=index)
+    merged['FirstOrderDate'] = pd.concat([state['FirstOrderDate'], delta['FirstOrderDate']], axis=1).min(axis=1)
+    merged['LastOrderDate'] = pd.concat([state['LastOrderDate'], delta['LastOrderDate']], axis=1).max(axis=1)
+    additive = list(SUM_COLUMNS) + [name for names in COUNT_COLUMNS.values() for name in names]
+    merged[additive] = state[additive].fillna(0) + delta[additive].fillna(0)
+    return merged
+
+
+def derive_features(aggregates, customers, as_of):
+    """
+    Toplam istatistiklerden churn özelliklerini türetir.
+
+    Returns:
+        DataFrame: CustomerID, NUMERIC_FEATURES, kategorik tercih sütunları, ilk/son sipariş tarihleri ve IsChurned
+    """
+    as_of = pd.Timestamp(as_of)
+    total_orders = aggregates['TotalOrders'].to_numpy(dtype=np.int64)
+    total_spent = aggregates['TotalSpent'].to_numpy(dtype=np.float64)
+    lifetime = (as_of - aggregates['FirstOrderDate']).dt.days.to_numpy()
+
+    features = pd.DataFrame({
+        'CustomerID': aggregates.index.to_numpy(),
+        'DaysSinceLastOrder': (as_of - aggregates['LastOrderDate']).dt.days.to_numpy(),
+        'TotalOrders': total_orders,
+        'AvgOrderValue': (total_spent / total_orders).round(2),
+        'TotalSpent': total_spent.round(2),
+        'CustomerLifetimeDays': lifetime,
+        'OrderFrequency': (total_orders / (np.maximum(lifetime, 1) / 30)).round(2),
+        'Complaints': aggregates['Complaints'].to_numpy(dtype=np.int64),
+        'SupportTickets': aggregates['SupportTickets'].to_numpy(dtype=np.int64),
+        'DiscountUsage': aggregates['DiscountUsage'].to_numpy(dtype=np.int64),
+        'PreferredCategory': pd.Categorical.from_codes(
+            aggregates[COUNT_COLUMNS['Category']].to_numpy().argmax(axis=1), PRODUCT_CATEGORIES),
+        'PreferredPayment': pd.Categorical.from_codes(
+            aggregates[COUNT_COLUMNS['PaymentMethod']].to_numpy().argmax(axis=1), PAYMENT_METHODS),
+        'FirstOrderDate': aggregates['FirstOrderDate'].to_numpy(),
+        'LastOrderDate': aggregates['LastOrderDate'].to_numpy(),
+    })
+    features = features.merge(customers[['CustomerID'] + CUSTOMER_ATTRIBUTES], on='CustomerID', how='left')
+    columns = (['CustomerID'] + NUMERIC_FEATURES + list(CATEGORY_LEVELS) + ['FirstOrderDate', 'LastOrderDate', 'IsChurned'])
+    return features[columns].sort_values('CustomerID', ignore_index=True)
+
+
+def _frame_digest(df):
+    return str(int(pd.util.hash_pandas_object(df, index=False).sum()))
+
+
+_DIGEST_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _column_words(series):
+    """
+    Sütunun satır başına 64 bitlik değeri: sayısal / tarih sütunlarında ham bitler,
+    kategorik ve metin sütunlarında farklı değerlerin hash'i kodlarla satırlara dağıtılır
+    (metin hash'i satır başına değil, farklı değer başına bir kez hesaplanır).
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+    elif series.dtype.kind in 'biufmM':
+        values = np.ascontiguousarray(series.to_numpy())
+        return (values if values.dtype.itemsize == 8 else values.astype(np.int64)).view(np.uint64)
+    else:
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    words = np.append(pd.util.hash_pandas_object(pd.Index(uniques), index=False).to_numpy(), np.uint64(0))
+    return words[codes]
+
+
+def _row_digests(events):
+    """Olay satırı başına 64 bitlik hash; tüm sütunlar (CustomerID dahil) sütun sırasına bağlı karıştırılır."""
+    row = np.zeros(len(events), dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for column in events.columns:
+            row = (row ^ _column_words(events[column])) * _DIGEST_MULTIPLIER
+            row ^= row >> np.uint64(29)
+    return row
+
+
+class FeatureStore:
+    """
+    Sürümlü, artımlı yenilenen müşteri özellik deposu.
+
+    Her yenileme yeni bir sürüm dosyası (`features_v{N}`) ve manifest yazar;
+    path=None verilirse depo yalnızca bellekte tutulur.
+    """
+
+    def __init__(self, path=FEATURE_STORE_DIR):
+        self.path = path
+        self.manifest = {'version': 0, 'watermark': 0}
+        self._aggregates = None
+        self._features = None
+        if path and os.path.exists(self._manifest_path):
+            with open(self._manifest_path, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+
+    @property
+    def _manifest_path(self):
+        return os.path.join(self.path, 'manifest.json')
+
+    @property
+    def version(self):
+        return self.manifest['version']
+
+    def _file(self, kind, version):
+        extension = 'parquet' if self.manifest.get('format', self._format()) == 'parquet' else 'pkl'
+        return os.path.join(self.path, f'{kind}_v{version}.{extension}')
+
+    @staticmethod
+    def _format():
+        try:
+            import pyarrow  # noqa: F401
+            return 'parquet'
+        except ImportError:
+            return 'pickle'
+
+    def _write(self, df, path):
+        if path.endswith('.parquet'):
+            df.to_parquet(path)
+        else:
+            df.to_pickle(path)
+
+    def _read(self, path):
+        return pd.read_parquet(path) if path.endswith('.parquet') else pd.read_pickle(path)
+
+    def _load(self):
+        """Son sürümün istatistik ve özellik tablolarını (gerekirse diskten) yükler."""
+        if self._features is None and self.path and self.version:
+            self._aggregates = self._read(self._file('aggregates', self.version))
+            self._features = self._read(self._file('features', self.version))
+
+    def read(self):
+        """Materyalize edilmiş son özellik tablosunu döndürür."""
+        self._load()
+        if self._features is None:
+            raise LookupError("Özellik deposu henüz oluşturulmadı; önce refresh() çağrılmalı")
+        return self._features
+
+    def refresh(self, events, customers, as_of=ANALYSIS_DATE):
+        """
+        Yeni olayları depoya işler ve gerekiyorsa yeni bir sürüm yazar.
+
+        Args:
+            events (DataFrame): Sipariş olayları (artan OrderID)
+            customers (DataFrame): Müşteri nitelikleri
+            as_of (datetime): Özelliklerin hesaplandığı analiz tarihi
+
+        Returns:
+            dict: Güncel manifest (version, watermark, rows, new_events, mode, seconds)
+        """
+        start = time.perf_counter()
+        self._load()
+        is_new = (events['OrderID'] > self.manifest['watermark']).to_numpy()
+        new_events = events[is_new]
+        customers_digest = _frame_digest(customers)
+        as_of_text = pd.Timestamp(as_of).isoformat()
+
+        # Olay özeti: satır hash'lerinin 2^64 modunda toplamı. Toplamsal olduğundan yeni olayların özeti
+        # eskisine eklenir; satır hash'leri tek geçişte hesaplanır ve işlenmiş / yeni olaylar ayrı toplanır
+        rows = _row_digests(events)
+        processed_digest = int(rows[~is_new].sum(dtype=np.uint64))
+        new_digest = int(rows[is_new].sum(dtype=np.uint64))
+
+        # Watermark'a kadar işlenmiş olaylar değiştiyse (başka veri seti, düzeltilmiş geçmiş) depo sıfırdan kurulur
+        if self._aggregates is not None and self.manifest.get('events_digest') != str(processed_digest):
+            self._aggregates = None
+            self._features = None
+            new_events, processed_digest, new_digest = events, 0, processed_digest + new_digest
+
+        unchanged = (self._features is not None and new_events.empty
+                     and self.manifest.get('as_of') == as_of_text
+                     and self.manifest.get('customers_digest') == customers_digest)
+        if unchanged:
+            self.manifest.update(mode='güncel', new_events=0)
+            return self.manifest
+
+        mode = 'artımlı' if self._aggregates is not None else 'tam'
+        if not new_events.empty:
+            self._aggregates = merge_aggregates(self._aggregates, aggregate_orders(new_events))
+        self._features = derive_features(self._aggregates, customers, as_of)
+
+        self.manifest = {
+            'version': self.version + 1,
+            'watermark': int(events['OrderID'].max()) if len(events) else self.manifest['watermark'],
+            'as_of': as_of_text,
+            'customers_digest': customers_digest,
+            'events_digest': str((processed_digest + new_digest) % 2 ** 64),
+            'rows': len(self._features),
+            'new_events': len(new_events),
+            'mode': mode,
+            'format': self._format(),
+            'refreshed_at': datetime.now().isoformat(timespec='seconds'),
+            'seconds': round(time.perf_counter() - start, 4),
+        }
+        if self.path:
+            self._persist()
+        return self.manifest
+
+    def _persist(self):
+        os.makedirs(self.path, exist_ok=True)
+        self._write(self._aggregates, self._file('aggregates', self.version))
+        self._write(self._features, self._file('features', self.version))
+        tmp_path = f"{self._manifest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self._manifest_path)
+
+        # Yalnızca son KEEP_VERSIONS sürüm saklanır
+        for old in range(1, self.version - KEEP_VERSIONS + 1):
+            for kind in ('aggregates', 'features'):
+                old_path = self._file(kind, old)
+                if os.path.exists(old_path):
+                    os.remove(old_path)
+
+
+_demo_cache = {}
+
+
+def load_demo_features(n_customers=2000, seed=42, as_of=ANALYSIS_DATE, path=FEATURE_STORE_DIR):
+    """
+    Sekmelerin ortak kullandığı demo sipariş olaylarını ve özellik tablosunu döndürür.
+
+    Olaylar ve depo süreç içinde önbelleğe alınır; disk yazılamıyorsa depo bellekte tutulur.
+
+    Returns:
+        tuple: (events, features, manifest)
+    """
+    key = (n_customers, seed, pd.Timestamp(as_of), path)
+    if key not in _demo_cache:
+        events, customers = generate_order_events(n_customers, seed, as_of)
+        try:
+            store = FeatureStore(path)
+            store.refresh(events, customers, as_of)
+        except (OSError, ValueError, KeyError):
+            # Okunamayan / yazılamayan depo: bellek içi depoya geç
+            store = FeatureStore(None)
+            store.refresh(events, customers, as_of)
+        _demo_cache[key] = (events, customers, store)
+
+    events, customers, store = _demo_cache[key]
+    return events, store.read(), store.manifest
+
+
+def benchmark_refresh(n_customers=200_000, new_fraction=0.05, seed=42):
+    """Tam materyalizasyon ile artımlı yenilemenin süresini karşılaştırır ve sonuçların eşitliğini doğrular."""
+    events, customers = generate_order_events(n_customers, seed)
+    split = int(len(events) * (1 - new_fraction))
+
+    start = time.perf_counter()
+    full = FeatureStore(None)
+    full.refresh(events, customers)
+    full_seconds = time.perf_counter() - start
+
+    incremental = FeatureStore(None)
+    incremental.refresh(events.iloc[:split], customers)
+    start = time.perf_counter()
+    incremental.refresh(events, customers)
+    incremental_seconds = time.perf_counter() - start
+
+    # Toplama sırası farkından kaynaklanan kuruş yuvarlamalarına izin verilir
+    pd.testing.assert_frame_equal(full.read(), incremental.read(), check_dtype=False, atol=0.011)
+    print(f"{len(events):,} olay, {n_customers:,} müşteri")
+    print(f"Tam materyalizasyon: {full_seconds:.2f} sn")
+    print(f"Artımlı yenileme ({len(events) - split:,} yeni olay): {incremental_seconds:.2f} sn")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Müşteri özellik deposu araçları")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    bench_parser = subparsers.add_parser('benchmark', help="Tam ve artımlı yenileme süresini karşılaştır")
+    bench_parser.add_argument('--customers', type=int, default=200_000)
+    bench_parser.add_argument('--new-fraction', type=float, default=0.05)
+
+    args = parser.parse_args(argv)
+    if args.command == 'benchmark':
+        benchmark_refresh(args.customers, args.new_fraction)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,271 @@
+"""
+Karar ağacı topluluğu (Random Forest) derleyicisi.
+Eğitilmiş bir sklearn ormanını bitişik NumPy düğüm dizilerine (feature, threshold,
+left, right, value) aktarır ve tüm ağaçları bir grup müşteri için aynı anda
+dolaşan vektörel bir değerlendirici sağlar. Derlenmiş dosya yalnızca NumPy ile
+yüklenebilir; sklearn kurulu olmayan ortamlarda da kullanılabilir.
+
+Kullanım:
+    python -m app.forest_compiler benchmark
+"""
+
+import argparse
+import hashlib
+import os
+import time
+
+import numpy as np
+
+ARTIFACT_VERSION = 1
+
+
+class CompiledForest:
+    """
+    Düz dizilere derlenmiş karar ağacı topluluğu.
+
+    Tüm ağaçların düğümleri tek dizide tutulur; `roots` her ağacın kök düğüm
+    indeksidir. Yaprak düğümlerde left == right == kendi indeksi olduğundan
+    dolaşım en derin ağaç kadar adımda sabitlenir.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, max_depth, n_features,
+                 scaler_mean=None, scaler_scale=None, feature_names=None, feature_importances=None,
+                 task='classification', model_version=None):
+        self.feature = np.ascontiguousarray(feature, dtype=np.int32)
+        self.threshold = np.ascontiguousarray(threshold, dtype=np.float64)
+        self.left = np.ascontiguousarray(left, dtype=np.int32)
+        self.right = np.ascontiguousarray(right, dtype=np.int32)
+        self.value = np.ascontiguousarray(value, dtype=np.float64)
+        self.roots = np.ascontiguousarray(roots, dtype=np.int32)
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+        self.scaler_mean = None if scaler_mean is None else np.asarray(scaler_mean, dtype=np.float64)
+        self.scaler_scale = None if scaler_scale is None else np.asarray(scaler_scale, dtype=np.float64)
+        self.feature_names = None if feature_names is None else [str(name) for name in feature_names]
+        self.feature_importances_ = None if feature_importances is None else np.asarray(feature_importances)
+        self.task = str(task)
+        self.model_version = None if model_version is None else str(model_version)
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    @property
+    def version(self):
+        """Ağaç yapısı ve ölçekleme parametrelerinden türetilen içerik hash'i (önbellek anahtarı)."""
+        if getattr(self, '_version', None) is None:
+            digest = hashlib.sha1()
+            for array in (self.feature, self.threshold, self.left, self.right, self.value, self.roots,
+                          self.scaler_mean, self.scaler_scale):
+                if array is not None:
+                    digest.update(np.ascontiguousarray(array).tobytes())
+            self._version = digest.hexdigest()
+        return self._version
+
+    def _prepare(self, X):
+        """Girdiyi (varsa gömülü scaler ile) ölçekleyip sklearn gibi float32'ye çevirir."""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[None, :]
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"{self.n_features} özellik bekleniyordu, {X.shape[1]} verildi")
+        if self.scaler_mean is not None:
+            X = (X - self.scaler_mean) / self.scaler_scale
+        return X.astype(np.float32)
+
+    def apply(self, X, batch_size=4096):
+        """Her satırın her ağaçta düştüğü yaprak indekslerini (n_samples, n_trees) döndürür."""
+        X = self._prepare(X)
+        leaves = np.empty((len(X), self.n_trees), dtype=np.int32)
+        for start in range(0, len(X), batch_size):
+            batch = X[start:start + batch_size]
+            flat = batch.ravel()
+            row_offsets = (np.arange(len(batch), dtype=np.int64) * self.n_features)[:, None]
+            nodes = np.broadcast_to(self.roots, (len(batch), self.n_trees)).copy()
+            for _ in range(self.max_depth):
+                go_left = flat.take(row_offsets + self.feature.take(nodes)) <= self.threshold.take(nodes)
+                nodes = np.where(go_left, self.left.take(nodes), self.right.take(nodes))
+            leaves[start:start + batch_size] = nodes
+        return leaves
+
+    def contributions(self, X, output=1, batch_size=4096):
+        """
+        Ağaç yolu (Saabas) katkılarını hesaplar.
+
+        Her ağaçta kökten yaprağa inerken düğüm değerindeki değişim, o düğümde
+        bölünen özelliğe yazılır; tüm müşteriler ve ağaçlar aynı anda dolaşılır.
+        bias + katkıların toplamı predict_proba(X)[:, output] değerine eşittir.
+
+        Args:
+            X: Özellik matrisi (n_samples, n_features)
+            output (int): Açıklanacak sınıf (regresyonda 0)
+            batch_size (int): Bellek kullanımını sınırlamak için satır grubu boyutu
+
+        Returns:
+            tuple: (bias (float), katkılar (n_samples, n_features))
+        """
+        X = self._prepare(X)
+        node_values = self.value[:, output]
+        bias = node_values[self.roots].mean()
+        contributions = np.zeros((len(X), self.n_features))
+        for start in range(0, len(X), batch_size):
+            batch = X[start:start + batch_size]
+            flat = batch.ravel()
+            row_offsets = (np.arange(len(batch), dtype=np.int64) * self.n_features)[:, None]
+            nodes = np.broadcast_to(self.roots, (len(batch), self.n_trees)).copy()
+            totals = np.zeros(len(batch) * self.n_features)
+            for _ in range(self.max_depth):
+                split_feature = self.feature.take(nodes)
+                go_left = flat.take(row_offsets + split_feature) <= self.threshold.take(nodes)
+                children = np.where(go_left, self.left.take(nodes), self.right.take(nodes))
+                # Yapraklarda çocuk == düğüm olduğundan katkı sıfırdır
+                totals += np.bincount((row_offsets + split_feature).ravel(),
+                                      weights=(node_values.take(children) - node_values.take(nodes)).ravel(),
+                                      minlength=len(totals))
+                nodes = children
+            contributions[start:start + batch_size] = totals.reshape(len(batch), self.n_features) / self.n_trees
+        return bias, contributions
+
+    def predict_proba(self, X):
+        """Ağaç başına yaprak olasılıklarının ortalamasını döndürür (sklearn ile aynı)."""
+        return self.value[self.apply(X)].mean(axis=1)
+
+    def predict(self, X):
+        """Sınıflandırmada en olası sınıfı, regresyonda ağaç ortalamasını döndürür."""
+        averaged = self.predict_proba(X)
+        if self.task == 'regression':
+            return averaged[:, 0]
+        return averaged.argmax(axis=1)
+
+    def save(self, path):
+        """Derlenmiş ormanı sıkıştırılmış .npz dosyasına yazar."""
+        arrays = {
+            'version': np.array(ARTIFACT_VERSION),
+            'feature': self.feature, 'threshold': self.threshold,
+            'left': self.left, 'right': self.right, 'value': self.value,
+            'roots': self.roots, 'max_depth': np.array(self.max_depth), 'n_features': np.array(self.n_features),
+            'task': np.array(self.task),
+        }
+        if self.scaler_mean is not None:
+            arrays['scaler_mean'] = self.scaler_mean
+            arrays['scaler_scale'] = self.scaler_scale
+        if self.feature_names is not None:
+            arrays['feature_names'] = np.array(self.feature_names)
+        if self.feature_importances_ is not None:
+            arrays['feature_importances'] = self.feature_importances_
+        if self.model_version is not None:
+            arrays['model_version'] = np.array(self.model_version)
+        # Geçici dosyaya yazılıp yerine taşınır; skorlama servisi yarım yazılmış dosya okumaz
+        tmp_path = path + '.tmp.npz'
+        np.savez_compressed(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """Derlenmiş ormanı .npz dosyasından yükler (sklearn gerektirmez)."""
+        with np.load(path, allow_pickle=False) as data:
+            if int(data['version']) != ARTIFACT_VERSION:
+                raise ValueError(f"Desteklenmeyen derlenmiş model sürümü: {int(data['version'])}")
+            optional = {name: data[name] if name in data else None
+                        for name in ('scaler_mean', 'scaler_scale', 'feature_names', 'feature_importances')}
+            optional['task'] = str(data['task']) if 'task' in data else 'classification'
+            optional['model_version'] = str(data['model_version']) if 'model_version' in data else None
+            return cls(data['feature'], data['threshold'], data['left'], data['right'], data['value'],
+                       data['roots'], int(data['max_depth']), int(data['n_features']), **optional)
+
+
+def compile_forest(model, scaler=None, feature_names=None):
+    """
+    Eğitilmiş bir sklearn ormanını (ya da tek ağacı) CompiledForest'a derler.
+
+    Args:
+        model: RandomForest / ExtraTrees / DecisionTree sınıflandırıcı ya da regresörü
+        scaler: Modelden önce uygulanan StandardScaler (derlenmiş dosyaya gömülür)
+        feature_names (list): Özellik isimleri
+
+    Returns:
+        CompiledForest
+    """
+    estimators = getattr(model, 'estimators_', [model])
+    is_classifier = hasattr(model, 'classes_')
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+
+    for estimator in estimators:
+        tree = estimator.tree_
+        n_nodes = tree.node_count
+        node_ids = np.arange(n_nodes)
+        is_leaf = tree.children_left == -1
+
+        roots.append(offset)
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+        lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+        rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+
+        # Sınıflandırmada yaprak değerleri ağaç bazında olasılığa normalize edilir (sklearn predict_proba gibi)
+        node_values = tree.value[:, 0, :]
+        if is_classifier:
+            node_values = node_values / node_values.sum(axis=1, keepdims=True)
+        values.append(node_values)
+
+        max_depth = max(max_depth, tree.max_depth)
+        offset += n_nodes
+
+    return CompiledForest(
+        np.concatenate(features), np.concatenate(thresholds), np.concatenate(lefts),
+        np.concatenate(rights), np.concatenate(values), np.array(roots), max_depth, model.n_features_in_,
+        scaler_mean=None if scaler is None else scaler.mean_,
+        scaler_scale=None if scaler is None else scaler.scale_,
+        feature_names=feature_names,
+        feature_importances=getattr(model, 'feature_importances_', None),
+        task='classification' if is_classifier else 'regression',
+    )
+
+
+def benchmark_inference(batch_sizes=(1, 10, 100, 1000), repeats=50):
+    """sklearn predict_proba ile derlenmiş değerlendiricinin gecikmesini karşılaştırır."""
+    from app.churn import generate_churn_data, encode_churn_features, fit_churn_model, CHURN_FEATURES
+
+    df = generate_churn_data(n_customers=2000, seed=42)
+    X = encode_churn_features(df)
+    scaler, model = fit_churn_model(X, df['IsChurned'])
+    compiled = compile_forest(model, scaler, CHURN_FEATURES)
+    X_values = X.to_numpy()
+
+    for batch_size in batch_sizes:
+        batch = X_values[:batch_size]
+        expected = model.predict_proba(scaler.transform(X.iloc[:batch_size]))
+        assert np.allclose(compiled.predict_proba(batch), expected)
+
+        timings = {}
+        for name, fn in (('sklearn', lambda: model.predict_proba(scaler.transform(X.iloc[:batch_size]))),
+                         ('derlenmiş', lambda: compiled.predict_proba(batch))):
+            start = time.perf_counter()
+            for _ in range(repeats):
+                fn()
+            timings[name] = (time.perf_counter() - start) / repeats * 1000
+        print(f"batch={batch_size:>5}: sklearn {timings['sklearn']:7.2f} ms, "
+              f"derlenmiş {timings['derlenmiş']:7.2f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Derlenmiş orman araçları")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    bench_parser = subparsers.add_parser('benchmark', help="sklearn ile gecikme karşılaştırması")
+    bench_parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 10, 100, 1000])
+    bench_parser.add_argument('--repeats', type=int, default=50)
+
+    args = parser.parse_args(argv)
+    if args.command == 'benchmark':
+        benchmark_inference(args.batch_sizes, args.repeats)
+
+
+if __name__ == '__main__':
+    main()
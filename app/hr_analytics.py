@@ -1,105 +1,126 @@
+"""
+İK analitiği: çalışan verisi simülasyonu ve grafik fonksiyonları.
+
+Kullanım:
+    python -m app.hr_analytics benchmark --employees 1000000
+"""
+
+import argparse
+import time
+from datetime import datetime
+
 import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
 
-def generate_employee_data(n_employees=200):
-    """Çalışan verilerini simüle eder ve bir DataFrame döndürür."""
-    np.random.seed(42)
-    
-    # Departmanlar ve pozisyonlar
-    departments = ['İnsan Kaynakları', 'Pazarlama', 'Satış', 'Finans', 'Bilgi Teknolojileri', 'Operasyon']
-    positions = {
-        'İnsan Kaynakları': ['İK Uzmanı', 'İK Yöneticisi', 'İK Direktörü', 'İK Asistanı'],
-        'Pazarlama': ['Pazarlama Uzmanı', 'Marka Yöneticisi', 'Pazarlama Direktörü', 'Pazarlama Asistanı', 'Dijital Pazarlama Uzmanı'],
-        'Satış': ['Satış Temsilcisi', 'Satış Yöneticisi', 'Satış Direktörü', 'Müşteri Temsilcisi'],
-        'Finans': ['Muhasebe Uzmanı', 'Finans Yöneticisi', 'Finans Direktörü', 'Mali Analist'],
-        'Bilgi Teknolojileri': ['Yazılım Geliştirici', 'IT Yöneticisi', 'Sistem Uzmanı', 'Veri Analisti', 'IT Destek Uzmanı'],
-        'Operasyon': ['Operasyon Uzmanı', 'Operasyon Yöneticisi', 'Lojistik Uzmanı', 'Saha Yöneticisi']
-    }
+# Departmanlar, seçilme olasılıkları ve pozisyonlar
+DEPARTMENTS = ['İnsan Kaynakları', 'Pazarlama', 'Satış', 'Finans', 'Bilgi Teknolojileri', 'Operasyon']
+DEPARTMENT_WEIGHTS = [0.1, 0.2, 0.25, 0.15, 0.2, 0.1]
+POSITIONS = {
+    'İnsan Kaynakları': ['İK Uzmanı', 'İK Yöneticisi', 'İK Direktörü', 'İK Asistanı'],
+    'Pazarlama': ['Pazarlama Uzmanı', 'Marka Yöneticisi', 'Pazarlama Direktörü', 'Pazarlama Asistanı', 'Dijital Pazarlama Uzmanı'],
+    'Satış': ['Satış Temsilcisi', 'Satış Yöneticisi', 'Satış Direktörü', 'Müşteri Temsilcisi'],
+    'Finans': ['Muhasebe Uzmanı', 'Finans Yöneticisi', 'Finans Direktörü', 'Mali Analist'],
+    'Bilgi Teknolojileri': ['Yazılım Geliştirici', 'IT Yöneticisi', 'Sistem Uzmanı', 'Veri Analisti', 'IT Destek Uzmanı'],
+    'Operasyon': ['Operasyon Uzmanı', 'Operasyon Yöneticisi', 'Lojistik Uzmanı', 'Saha Yöneticisi']
+}
+BASE_SALARIES = {
+    'İK Uzmanı': 12000, 'İK Yöneticisi': 18000, 'İK Direktörü': 35000, 'İK Asistanı': 9000,
+    'Pazarlama Uzmanı': 13000, 'Marka Yöneticisi': 19000, 'Pazarlama Direktörü': 32000, 'Pazarlama Asistanı': 8500, 'Dijital Pazarlama Uzmanı': 15000,
+    'Satış Temsilcisi': 10000, 'Satış Yöneticisi': 20000, 'Satış Direktörü': 35000, 'Müşteri Temsilcisi': 9000,
+    'Muhasebe Uzmanı': 14000, 'Finans Yöneticisi': 22000, 'Finans Direktörü': 38000, 'Mali Analist': 16000,
+    'Yazılım Geliştirici': 18000, 'IT Yöneticisi': 25000, 'Sistem Uzmanı': 16000, 'Veri Analisti': 17000, 'IT Destek Uzmanı': 12000,
+    'Operasyon Uzmanı': 11000, 'Operasyon Yöneticisi': 18000, 'Lojistik Uzmanı': 12000, 'Saha Yöneticisi': 14000
+}
+GENDERS = ['Erkek', 'Kadın']
+EDUCATION_LEVELS = ['Lise', 'Önlisans', 'Lisans', 'Yüksek Lisans', 'Doktora']
+ATTRITION_REASONS = ['Daha İyi Teklif', 'İş/Yaşam Dengesi', 'Kariyer İlerlemesi', 'Yönetici ile Uyuşmazlık', 'Taşınma', 'Emeklilik', 'Diğer']
+ACTIVE_LABEL = 'Aktif Çalışan'
+
+# Bu satır sayısının üzerinde maaş kutu grafiği her noktayı göndermek yerine özet istatistiklerle çizilir
+BOX_POINTS_MAX_ROWS = 5000
+BOX_OUTLIER_SAMPLE = 100  # Özet modunda departman başına gösterilen en fazla aykırı değer
+
+
+def _employee_ids(n_employees):
+    """EMP0001 biçiminde (en az 4 haneli, sabit genişlikte) çalışan kimlikleri."""
+    width = max(4, len(str(n_employees)))
+    numbers = np.arange(1, n_employees + 1)
+    digits = (numbers[:, None] // 10 ** np.arange(width - 1, -1, -1)) % 10 + ord('0')
+    chars = np.empty((n_employees, width + 3), dtype=np.uint8)
+    chars[:, :3] = np.frombuffer(b'EMP', dtype=np.uint8)
+    chars[:, 3:] = digits
+    return chars.view(f'S{width + 3}').ravel().astype(f'U{width + 3}')
+
+
+def generate_employee_data(n_employees=200, seed=42):
+    """
+    Çalışan verilerini sütun bazında vektörel olarak simüle eder.
+
+    Args:
+        n_employees (int): Çalışan sayısı (1M satır yaklaşık bir saniyede üretilir)
+        seed (int): Rastgelelik tohumu
+
+    Returns:
+        DataFrame: Çalışan başına bir satır
+    """
+    rng = np.random.default_rng(seed)
     
-    # Temel bilgiler için veri oluşturma
-    employee_ids = [f"EMP{i:04d}" for i in range(1, n_employees + 1)]
-    departments_list = np.random.choice(departments, size=n_employees, p=[0.1, 0.2, 0.25, 0.15, 0.2, 0.1])
+    # Temel bilgiler
+    employee_ids = _employee_ids(n_employees)
+    dept_codes = rng.choice(len(DEPARTMENTS), size=n_employees, p=DEPARTMENT_WEIGHTS)
     
-    # Pozisyonları departmanlara göre atama
-    positions_list = [np.random.choice(positions[dept]) for dept in departments_list]
+    # Pozisyonlar: departmanın pozisyon listesinden indeks örnekleme
+    position_names = [pos for dept in DEPARTMENTS for pos in POSITIONS[dept]]
+    position_counts = np.array([len(POSITIONS[dept]) for dept in DEPARTMENTS])
+    position_offsets = np.concatenate([[0], np.cumsum(position_counts)[:-1]])
+    position_codes = position_offsets[dept_codes] + (rng.random(n_employees) * position_counts[dept_codes]).astype(int)
     
     # Demografik veriler
-    genders = np.random.choice(['Erkek', 'Kadın'], size=n_employees, p=[0.55, 0.45])
-    ages = np.random.normal(35, 8, n_employees).astype(int)
-    ages = np.clip(ages, 22, 65)  # Yaş sınırlaması
+    gender_codes = rng.choice(len(GENDERS), size=n_employees, p=[0.55, 0.45])
+    ages = np.clip(rng.normal(35, 8, n_employees).astype(int), 22, 65)  # Yaş sınırlaması
     
     # Deneyim ve şirketteki süre (yıl)
-    tenure_years = np.random.gamma(shape=2.0, scale=2.5, size=n_employees)
-    tenure_years = np.clip(tenure_years, 0.1, 20).round(1)  # 0.1 ile 20 yıl arası
-    
-    experience_years = tenure_years + np.random.gamma(shape=3.0, scale=2.0, size=n_employees)
+    tenure_years = np.clip(rng.gamma(shape=2.0, scale=2.5, size=n_employees), 0.1, 20).round(1)  # 0.1 ile 20 yıl arası
+    experience_years = tenure_years + rng.gamma(shape=3.0, scale=2.0, size=n_employees)
     experience_years = np.clip(experience_years, tenure_years, 40).round(1)  # En az şirketteki süre kadar, en fazla 40 yıl
     
-    # İşe giriş tarihleri
-    today = datetime.now()
-    hire_dates = [(today - timedelta(days=int(365 * years))) for years in tenure_years]
-    hire_dates = [date.strftime('%Y-%m-%d') for date in hire_dates]
+    # İşe giriş tarihleri (gün hassasiyetinde datetime64)
+    today = np.datetime64(datetime.now().date(), 'D')
+    hire_dates = today - (365 * tenure_years).astype('timedelta64[D]')
     
     # Eğitim durumu
-    education_levels = np.random.choice(
-        ['Lise', 'Önlisans', 'Lisans', 'Yüksek Lisans', 'Doktora'], 
-        size=n_employees, 
-        p=[0.1, 0.15, 0.5, 0.2, 0.05]
-    )
-    
-    # Maaş ve performans bilgileri
-    base_salaries = {
-        'İK Uzmanı': 12000, 'İK Yöneticisi': 18000, 'İK Direktörü': 35000, 'İK Asistanı': 9000,
-        'Pazarlama Uzmanı': 13000, 'Marka Yöneticisi': 19000, 'Pazarlama Direktörü': 32000, 'Pazarlama Asistanı': 8500, 'Dijital Pazarlama Uzmanı': 15000,
-        'Satış Temsilcisi': 10000, 'Satış Yöneticisi': 20000, 'Satış Direktörü': 35000, 'Müşteri Temsilcisi': 9000,
-        'Muhasebe Uzmanı': 14000, 'Finans Yöneticisi': 22000, 'Finans Direktörü': 38000, 'Mali Analist': 16000,
-        'Yazılım Geliştirici': 18000, 'IT Yöneticisi': 25000, 'Sistem Uzmanı': 16000, 'Veri Analisti': 17000, 'IT Destek Uzmanı': 12000,
-        'Operasyon Uzmanı': 11000, 'Operasyon Yöneticisi': 18000, 'Lojistik Uzmanı': 12000, 'Saha Yöneticisi': 14000
-    }
+    education_codes = rng.choice(len(EDUCATION_LEVELS), size=n_employees, p=[0.1, 0.15, 0.5, 0.2, 0.05])
     
-    # Pozisyon baz maaşı + deneyim faktörü + rastgele varyasyon
-    salaries = [
-        base_salaries[pos] * (1 + exp * 0.03) * np.random.uniform(0.9, 1.1)
-        for pos, exp in zip(positions_list, experience_years)
-    ]
-    salaries = [round(s, -2) for s in salaries]  # En yakın yüzlüğe yuvarlama
+    # Pozisyon baz maaşı + deneyim faktörü + rastgele varyasyon, en yakın yüzlüğe yuvarlanır
+    base_salaries = np.array([BASE_SALARIES[pos] for pos in position_names], dtype=float)
+    salaries = base_salaries[position_codes] * (1 + experience_years * 0.03) * rng.uniform(0.9, 1.1, n_employees)
+    salaries = salaries.round(-2)
     
     # Performans puanları (1-5 arası)
-    performance_scores = np.clip(np.random.normal(3.5, 0.8, n_employees), 1, 5).round(1)
+    performance_scores = np.clip(rng.normal(3.5, 0.8, n_employees), 1, 5).round(1)
     
-    # Terfi sayısı
-    promotion_counts = np.random.poisson(lam=tenure_years/3)
-    promotion_counts = np.clip(promotion_counts, 0, 5)  # En fazla 5 terfi
+    # Terfi sayısı (en fazla 5)
+    promotion_counts = np.clip(rng.poisson(lam=tenure_years / 3), 0, 5)
     
-    # İşten ayrılma durumu ve nedeni
-    attrition_rate = 0.15  # %15 işten ayrılma oranı
-    attrition = np.random.choice([True, False], size=n_employees, p=[attrition_rate, 1-attrition_rate])
+    # İşten ayrılma durumu (%15) ve nedeni
+    attrition = rng.random(n_employees) < 0.15
+    reason_codes = rng.choice(len(ATTRITION_REASONS), size=n_employees, p=[0.3, 0.15, 0.25, 0.1, 0.1, 0.05, 0.05])
+    attrition_reasons = np.asarray(ATTRITION_REASONS + [ACTIVE_LABEL], dtype=object)[
+        np.where(attrition, reason_codes, len(ATTRITION_REASONS))]
     
-    attrition_reasons = [
-        np.random.choice(
-            ['Daha İyi Teklif', 'İş/Yaşam Dengesi', 'Kariyer İlerlemesi', 'Yönetici ile Uyuşmazlık', 'Taşınma', 'Emeklilik', 'Diğer'],
-            p=[0.3, 0.15, 0.25, 0.1, 0.1, 0.05, 0.05]
-        ) if attr else 'Aktif Çalışan'
-        for attr in attrition
-    ]
+    # Tatmin skorları (1-10 arası) ve fazla mesai
+    satisfaction_scores = np.clip(rng.normal(7, 1.5, n_employees), 1, 10).round(1)
+    overtime = rng.random(n_employees) < 0.3
     
-    # Tatmin ve bağlılık skorları (1-10 arası)
-    satisfaction_scores = np.clip(np.random.normal(7, 1.5, n_employees), 1, 10).round(1)
-    
-    # Fazla mesai
-    overtime = np.random.choice([True, False], size=n_employees, p=[0.3, 0.7])
-    
-    # DataFrame oluşturma
-    employee_data = pd.DataFrame({
+    return pd.DataFrame({
         'çalışan_id': employee_ids,
-        'departman': departments_list,
-        'pozisyon': positions_list,
-        'cinsiyet': genders,
+        'departman': pd.Categorical.from_codes(dept_codes, DEPARTMENTS),
+        'pozisyon': pd.Categorical.from_codes(position_codes, position_names),
+        'cinsiyet': pd.Categorical.from_codes(gender_codes, GENDERS),
         'yaş': ages,
-        'eğitim': education_levels,
+        'eğitim': pd.Categorical.from_codes(education_codes, EDUCATION_LEVELS),
         'şirket_deneyimi_yıl': tenure_years,
         'toplam_deneyim_yıl': experience_years,
         'işe_giriş_tarihi': hire_dates,
@@ -111,13 +132,17 @@ def generate_employee_data(n_employees=200):
         'tatmin_skoru': satisfaction_scores,
         'fazla_mesai': overtime
     })
-    
-    return employee_data
 
-def create_attrition_department_chart(df):
+def _as_cube(data):
+    """Grafik fonksiyonları İK küpünü ya da çalışan tablosunu kabul eder."""
+    from app.hr_cube import HRCube
+
+    return data if isinstance(data, HRCube) else HRCube.from_frame(data)
+
+def create_attrition_department_chart(data):
     """Departmanlara göre işten ayrılma oranlarını gösteren grafik."""
-    dept_attrition = df.groupby('departman')['işten_ayrılma'].mean().reset_index()
-    dept_attrition['işten_ayrılma'] = dept_attrition['işten_ayrılma'] * 100  # Yüzde olarak
+    dept_attrition = _as_cube(data).rollup(['departman'], ['işten_ayrılma'])
+    dept_attrition['işten_ayrılma'] = dept_attrition['işten_ayrılma_ort'] * 100  # Yüzde olarak
     
     fig = px.bar(
         dept_attrition.sort_values('işten_ayrılma', ascending=False),
@@ -138,17 +163,56 @@ def create_attrition_department_chart(df):
     
     return fig
 
-def create_salary_distribution_chart(df):
-    """Departmanlara göre maaş dağılımını gösteren grafik."""
-    fig = px.box(
-        df,
-        x='departman',
-        y='aylık_maaş',
-        title='Departmanlara Göre Maaş Dağılımı',
-        labels={'departman': 'Departman', 'aylık_maaş': 'Aylık Maaş (TL)'},
-        color='departman',
-        points='all'
-    )
+def _salary_outlier_sample(df, stats, per_department, seed=42):
+    """Çit dışında kalan maaşlardan departman başına en fazla `per_department` örnek."""
+    fences = stats.set_index('departman')[['lowerfence', 'upperfence']]
+    departments = df['departman'].astype(str)
+    salaries = df['aylık_maaş'].to_numpy()
+    outside = ((salaries < departments.map(fences['lowerfence']).to_numpy()) |
+               (salaries > departments.map(fences['upperfence']).to_numpy()))
+    outliers = pd.DataFrame({'departman': departments[outside], 'aylık_maaş': salaries[outside]})
+    return outliers.sample(frac=1, random_state=seed).groupby('departman').head(per_department)
+
+def create_salary_distribution_chart(df, cube=None, max_points=BOX_POINTS_MAX_ROWS, outlier_sample=BOX_OUTLIER_SAMPLE):
+    """
+    Departmanlara göre maaş dağılımını gösteren grafik.
+
+    `max_points` satıra kadar tüm noktalar gösterilir; üzerinde kutular küpteki maaş
+    histogramından hesaplanan çeyrek / çit değerleriyle çizilir ve yalnızca sınırlı
+    sayıda aykırı değer örneği gönderilir.
+    """
+    if len(df) <= max_points:
+        fig = px.box(
+            df,
+            x='departman',
+            y='aylık_maaş',
+            title='Departmanlara Göre Maaş Dağılımı',
+            labels={'departman': 'Departman', 'aylık_maaş': 'Aylık Maaş (TL)'},
+            color='departman',
+            points='all'
+        )
+    else:
+        stats = (cube if cube is not None else _as_cube(df)).salary_box_stats(df)
+        outliers = _salary_outlier_sample(df, stats, outlier_sample)
+        colors = px.colors.qualitative.Plotly
+        fig = go.Figure()
+        for i, row in enumerate(stats.itertuples()):
+            color = colors[i % len(colors)]
+            fig.add_trace(go.Box(
+                x=[row.departman], q1=[row.q1], median=[row.median], q3=[row.q3],
+                lowerfence=[row.lowerfence], upperfence=[row.upperfence], mean=[row.mean],
+                name=row.departman, marker_color=color, boxpoints=False
+            ))
+            department_outliers = outliers[outliers['departman'] == row.departman]
+            fig.add_trace(go.Scatter(
+                x=department_outliers['departman'], y=department_outliers['aylık_maaş'], mode='markers',
+                marker=dict(color=color, size=4, opacity=0.6), name=f'{row.departman} aykırı', showlegend=False
+            ))
+        fig.update_layout(
+            title=f'Departmanlara Göre Maaş Dağılımı ({int(stats["çalışan_sayısı"].sum()):,} çalışan, özet)',
+            xaxis_title='Departman',
+            yaxis_title='Aylık Maaş (TL)'
+        )
     
     fig.update_layout(
         plot_bgcolor='rgba(0,0,0,0)',
@@ -159,10 +223,9 @@ def create_salary_distribution_chart(df):
     
     return fig
 
-def create_performance_distribution_chart(df):
+def create_performance_distribution_chart(data):
     """Performans puanlarının dağılımını gösteren grafik."""
-    performance_dist = df['performans_puanı'].value_counts().reset_index()
-    performance_dist.columns = ['performans_puanı', 'çalışan_sayısı']
+    performance_dist = _as_cube(data).rollup(['performans_grubu']).rename(columns={'performans_grubu': 'performans_puanı'})
     
     fig = px.bar(
         performance_dist.sort_values('performans_puanı'),
@@ -183,11 +246,9 @@ def create_performance_distribution_chart(df):
     
     return fig
 
-def create_hiring_trends_chart(df):
-    """Yıllara göre işe alım trendlerini gösteren grafik."""
-    df['işe_alım_yılı'] = pd.to_datetime(df['işe_giriş_tarihi']).dt.year
-    hiring_trends = df['işe_alım_yılı'].value_counts().reset_index()
-    hiring_trends.columns = ['yıl', 'işe_alım_sayısı']
+def create_hiring_trends_chart(data):
+    """Yıllara göre işe alım trendlerini gösteren grafik (küpteki işe giriş histogramından)."""
+    hiring_trends = _as_cube(data).hiring_counts('year')
     
     fig = px.line(
         hiring_trends.sort_values('yıl'),
@@ -211,9 +272,9 @@ def create_hiring_trends_chart(df):
     
     return fig
 
-def create_department_demographics_chart(df):
+def create_department_demographics_chart(data):
     """Departman ve cinsiyete göre çalışan dağılımını gösteren grafik."""
-    dept_gender = df.groupby(['departman', 'cinsiyet']).size().reset_index(name='çalışan_sayısı')
+    dept_gender = _as_cube(data).rollup(['departman', 'cinsiyet'])
     
     fig = px.bar(
         dept_gender,
@@ -242,10 +303,11 @@ def create_department_demographics_chart(df):
     
     return fig
 
-def create_satisfaction_vs_attrition_chart(df):
-    """Tatmin skoru ve işten ayrılma arasındaki ilişkiyi gösteren grafik."""
-    satisfaction_attrition = df.groupby('tatmin_skoru')['işten_ayrılma'].mean().reset_index()
-    satisfaction_attrition['işten_ayrılma'] = satisfaction_attrition['işten_ayrılma'] * 100  # Yüzde olarak
+def create_satisfaction_vs_attrition_chart(data):
+    """Tatmin skoru (1 puanlık gruplar) ve işten ayrılma arasındaki ilişkiyi gösteren grafik."""
+    satisfaction_attrition = _as_cube(data).rollup(['tatmin_grubu'], ['işten_ayrılma'])
+    satisfaction_attrition['tatmin_skoru'] = satisfaction_attrition['tatmin_grubu']
+    satisfaction_attrition['işten_ayrılma'] = satisfaction_attrition['işten_ayrılma_ort'] * 100  # Yüzde olarak
     
     fig = px.line(
         satisfaction_attrition.sort_values('tatmin_skoru'),
@@ -273,4 +335,98 @@ def create_satisfaction_vs_attrition_chart(df):
         height=500
     )
     
-    return fig
\ No newline at end of file
+    return fig
+
+def create_tenure_survival_chart(curves, show_ci=True):
+    """Kaplan–Meier tutma eğrileri (bkz. app/hr_survival.py); tek tabakada %95 güven bandı gösterilir."""
+    survival = curves.to_frame()
+    survival[['Sağkalım', 'Alt Sınır', 'Üst Sınır']] *= 100
+
+    fig = px.line(
+        survival,
+        x='Süre (yıl)',
+        y='Sağkalım',
+        color='Grup',
+        line_shape='hv',
+        title='Kıdeme Göre Çalışan Tutma Eğrileri (Kaplan–Meier)',
+        labels={'Sağkalım': 'Şirkette Kalma Olasılığı (%)'},
+        hover_data={'Risk Altında': True}
+    )
+
+    if show_ci and survival['Grup'].nunique() == 1:
+        for bound in ('Üst Sınır', 'Alt Sınır'):
+            fig.add_trace(go.Scatter(x=survival['Süre (yıl)'], y=survival[bound], mode='lines', line_shape='hv',
+                                     line=dict(width=0), fill='tonexty' if bound == 'Alt Sınır' else None,
+                                     fillcolor='rgba(139, 92, 246, 0.2)', name=bound, showlegend=False))
+
+    fig.add_hline(y=50, line_dash='dot', line_color='gray')
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        yaxis_range=[0, 100],
+        height=500
+    )
+
+    return fig
+
+def create_pay_equity_chart(gaps):
+    """Grup başına ham ve düzeltilmiş kadın-erkek ücret farkı (bkz. app/hr_pay_equity.py), %95 güven aralığıyla."""
+    gaps = gaps.sort_values('Düzeltilmiş Fark (%)')
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=gaps['Düzeltilmiş Fark (%)'],
+        y=gaps['Grup'],
+        mode='markers',
+        marker=dict(size=10, color=np.where(gaps['Anlamlı'], '#EF4444', '#8B5CF6')),
+        error_x=dict(type='data', symmetric=False,
+                     array=gaps['Üst Sınır (%)'] - gaps['Düzeltilmiş Fark (%)'],
+                     arrayminus=gaps['Düzeltilmiş Fark (%)'] - gaps['Alt Sınır (%)']),
+        name='Düzeltilmiş Fark',
+        customdata=gaps[['Çalışan', 'Kadın', 't']],
+        hovertemplate='<b>%{y}</b><br>Düzeltilmiş fark: %{x:.1f}%<br>Çalışan: %{customdata[0]}'
+                      ' (Kadın: %{customdata[1]})<br>t: %{customdata[2]:.2f}<extra></extra>'
+    ))
+    fig.add_trace(go.Scatter(
+        x=gaps['Ham Fark (%)'],
+        y=gaps['Grup'],
+        mode='markers',
+        marker=dict(size=8, symbol='x', color='gray'),
+        name='Ham Fark'
+    ))
+
+    fig.add_vline(x=0, line_dash='dash', line_color='gray')
+    fig.update_layout(
+        title='Kadın - Erkek Ücret Farkı (Deneyim, Kıdem, Performans ve Eğitim Sabitken)',
+        xaxis_title='Ücret Farkı (%)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        height=max(400, 30 * len(gaps) + 150)
+    )
+
+    return fig
+
+
+def benchmark_generation(n_employees=1_000_000, repeats=3):
+    """Çalışan verisi üretim süresini ölçer."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        df = generate_employee_data(n_employees=n_employees)
+        timings.append(time.perf_counter() - start)
+    print(f"{n_employees:,} çalışan: {min(timings):.2f} sn, {df.memory_usage(deep=True).sum() / 1e6:,.0f} MB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="İK analitiği araçları")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    bench_parser = subparsers.add_parser('benchmark', help="Çalışan verisi üretim süresini ölç")
+    bench_parser.add_argument('--employees', type=int, default=1_000_000)
+
+    args = parser.parse_args(argv)
+    if args.command == 'benchmark':
+        benchmark_generation(args.employees)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,353 @@
+"""
+İK toplam küpü.
+Çalışan tablosu tek geçişte (departman, cinsiyet, eğitim, kıdem grubu, performans
+grubu, tatmin grubu) hücrelerine bincount ile toplanır; her hücrede çalışan sayısı,
+ölçülerin toplamı ve kareler toplamı tutulur. İK sekmesindeki grafik ve metrikler
+sabit boyutlu küp üzerinden hesaplandığından maliyet çalışan sayısından bağımsızdır.
+Medyan / kantiller için departman bazında maaş histogramı (100 TL aralık; histogramda
+tam temsil edilemeyen maaşlar varsa kesin değerler çalışan tablosundan alınır), neden
+dağılımı için departman × ayrılma nedeni sayımları ve işe alım trendleri için ay
+bazında işe giriş histogramı da küpte tutulur.
+
+Kullanım:
+    python -m app.hr_cube benchmark --employees 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.hr_analytics import (generate_employee_data, ATTRITION_REASONS, DEPARTMENTS, EDUCATION_LEVELS,
+                              GENDERS)
+
+TENURE_EDGES = [1, 3, 5, 10]
+TENURE_LABELS = ['0-1 yıl', '1-3 yıl', '3-5 yıl', '5-10 yıl', '10+ yıl']
+PERFORMANCE_LEVELS = [round(level / 10, 1) for level in range(10, 51)]  # 1.0 - 5.0, 0.1 adım
+SATISFACTION_LEVELS = list(range(1, 11))
+
+DIMENSIONS = {
+    'departman': DEPARTMENTS,
+    'cinsiyet': GENDERS,
+    'eğitim': EDUCATION_LEVELS,
+    'kıdem_grubu': TENURE_LABELS,
+    'performans_grubu': PERFORMANCE_LEVELS,
+    'tatmin_grubu': SATISFACTION_LEVELS,
+}
+MEASURES = ['işten_ayrılma', 'aylık_maaş', 'tatmin_skoru', 'yaş', 'şirket_deneyimi_yıl', 'performans_puanı',
+            'fazla_mesai']
+SALARY_BIN_WIDTH = 100
+SALARY_HIST_BINS = 2001  # 0 - 200.000 TL; üstü son kutuya yazılır
+HIRE_MONTH_ORIGIN = 1970  # İşe giriş histogramı 1970-01 ile 2099-12 arasını kapsar
+HIRE_MONTH_BINS = (2100 - HIRE_MONTH_ORIGIN) * 12
+
+
+def _label_codes(series, labels):
+    """Kategorik sütunu sabit etiket listesine göre kodlar; tanımsız değerlerde hata verir."""
+    if isinstance(series.dtype, pd.CategoricalDtype) and list(series.cat.categories) == list(labels):
+        codes = series.cat.codes.to_numpy()
+    else:
+        codes = pd.Categorical(series, categories=labels).codes
+    if (codes < 0).any():
+        unknown = sorted(set(series[codes < 0].astype(str)))[:5]
+        raise ValueError(f"'{series.name}' sütununda tanımsız değerler: {', '.join(unknown)}")
+    return codes.astype(np.int64)
+
+
+def cell_codes(df):
+    """Her çalışanın küp hücresi indeksini (düzleştirilmiş) döndürür."""
+    codes = (
+        _label_codes(df['departman'], DEPARTMENTS),
+        _label_codes(df['cinsiyet'], GENDERS),
+        _label_codes(df['eğitim'], EDUCATION_LEVELS),
+        np.searchsorted(TENURE_EDGES, df['şirket_deneyimi_yıl'].to_numpy(), side='right'),
+        np.clip(np.rint(df['performans_puanı'].to_numpy() * 10).astype(np.int64) - 10, 0, len(PERFORMANCE_LEVELS) - 1),
+        np.clip(np.rint(df['tatmin_skoru'].to_numpy()).astype(np.int64) - 1, 0, len(SATISFACTION_LEVELS) - 1),
+    )
+    return np.ravel_multi_index(codes, HRCube.shape)
+
+
+class HRCube:
+    """Çalışan tablosunun (departman, cinsiyet, eğitim, kıdem, performans, tatmin) toplam küpü."""
+
+    dimensions = list(DIMENSIONS)
+    shape = tuple(len(labels) for labels in DIMENSIONS.values())
+
+    def __init__(self, counts, sums, sumsqs, salary_hist, reason_counts, hire_months, salary_off_grid=None):
+        self.counts = counts
+        self.sums = sums
+        self.sumsqs = sumsqs
+        self.salary_hist = salary_hist
+        # Departman başına histogramda tam temsil edilemeyen (100 TL katı olmayan ya da aralık dışı) maaş sayısı;
+        # bilinmiyorsa (eski küp dosyası) tüm departmanlar kesin olmayan sayılır
+        self.salary_off_grid = (salary_off_grid if salary_off_grid is not None
+                                else np.ones(len(DEPARTMENTS), dtype=np.int64))
+        self.reason_counts = reason_counts
+        self.hire_months = hire_months
+
+    @classmethod
+    def empty(cls):
+        size = len(MEASURES)
+        return cls(np.zeros(cls.shape, dtype=np.int64), np.zeros((size,) + cls.shape), np.zeros((size,) + cls.shape),
+                   np.zeros((len(DEPARTMENTS), SALARY_HIST_BINS), dtype=np.int64),
+                   np.zeros((len(DEPARTMENTS), len(ATTRITION_REASONS)), dtype=np.int64),
+                   np.zeros(HIRE_MONTH_BINS, dtype=np.int64), np.zeros(len(DEPARTMENTS), dtype=np.int64))
+
+    @classmethod
+    def from_frame(cls, df):
+        """Çalışan tablosundan küpü tek geçişte oluşturur."""
+        cube = cls.empty()
+        cube.add(df)
+        return cube
+
+    def add(self, df, sign=1):
+        """Çalışan satırlarını küpe ekler (sign=-1: çıkarır)."""
+        if len(df) == 0:
+            return self
+        cells = cell_codes(df)
+        size = self.counts.size
+        self.counts += sign * np.bincount(cells, minlength=size).reshape(self.shape)
+        for i, measure in enumerate(MEASURES):
+            values = df[measure].to_numpy(dtype=np.float64)
+            self.sums[i] += sign * np.bincount(cells, weights=values, minlength=size).reshape(self.shape)
+            self.sumsqs[i] += sign * np.bincount(cells, weights=values * values, minlength=size).reshape(self.shape)
+
+        departments = cells // (self.counts.size // len(DEPARTMENTS))
+        salaries = df['aylık_maaş'].to_numpy(dtype=np.float64)
+        salary_bins = np.clip(np.rint(salaries / SALARY_BIN_WIDTH).astype(np.int64), 0, SALARY_HIST_BINS - 1)
+        self.salary_hist += sign * np.bincount(departments * SALARY_HIST_BINS + salary_bins,
+                                               minlength=self.salary_hist.size).reshape(self.salary_hist.shape)
+        off_grid = salary_bins * SALARY_BIN_WIDTH != salaries
+        self.salary_off_grid += sign * np.bincount(departments[off_grid], minlength=len(DEPARTMENTS))
+
+        left = df['işten_ayrılma'].to_numpy(dtype=bool)
+        reasons = pd.Categorical(df['ayrılma_nedeni'].to_numpy()[left], categories=ATTRITION_REASONS).codes
+        valid = reasons >= 0
+        self.reason_counts += sign * np.bincount(departments[left][valid] * len(ATTRITION_REASONS) + reasons[valid],
+                                                 minlength=self.reason_counts.size).reshape(self.reason_counts.shape)
+
+        # 1970-01'den itibaren ay indeksi (datetime64[M] tamsayı değeri)
+        months = df['işe_giriş_tarihi'].to_numpy(dtype='datetime64[M]').astype(np.int64) - (HIRE_MONTH_ORIGIN - 1970) * 12
+        valid = (months >= 0) & (months < HIRE_MONTH_BINS)
+        self.hire_months += sign * np.bincount(months[valid], minlength=HIRE_MONTH_BINS)
+        return self
+
+    def save(self, path):
+        np.savez_compressed(path, counts=self.counts, sums=self.sums, sumsqs=self.sumsqs, salary_hist=self.salary_hist,
+                            reason_counts=self.reason_counts, hire_months=self.hire_months,
+                            salary_off_grid=self.salary_off_grid)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['counts'], data['sums'], data['sumsqs'], data['salary_hist'], data['reason_counts'],
+                       data['hire_months'], data['salary_off_grid'] if 'salary_off_grid' in data.files else None)
+
+    def equals(self, other):
+        """İki küpün sayım ve toplamları (kayan nokta toleransıyla) eşit mi."""
+        return (np.array_equal(self.counts, other.counts) and np.allclose(self.sums, other.sums)
+                and np.allclose(self.sumsqs, other.sumsqs, rtol=1e-6)
+                and np.array_equal(self.salary_hist, other.salary_hist)
+                and np.array_equal(self.reason_counts, other.reason_counts)
+                and np.array_equal(self.hire_months, other.hire_months)
+                and np.array_equal(self.salary_off_grid, other.salary_off_grid))
+
+    @property
+    def n_employees(self):
+        return int(self.counts.sum())
+
+    def mean(self, measure):
+        """Tüm çalışanlar üzerinde ölçü ortalaması."""
+        return float(self.sums[MEASURES.index(measure)].sum() / max(self.n_employees, 1))
+
+    def rollup(self, by, measures=()):
+        """
+        Küpü seçilen boyutlara indirger.
+
+        Args:
+            by (list): Korunacak boyutlar (ör. ['departman', 'cinsiyet'])
+            measures (list): Ortalama / standart sapması hesaplanacak ölçüler
+
+        Returns:
+            DataFrame: boyut etiketleri, çalışan_sayısı ve ölçü başına <ölçü>_ort, <ölçü>_std;
+            çalışanı olmayan hücreler atlanır
+        """
+        keep = [self.dimensions.index(name) for name in by]
+        axes = tuple(axis for axis in range(len(self.shape)) if axis not in keep)
+        perm = list(np.argsort(np.argsort(keep))) if keep else []
+        counts = self.counts.sum(axis=axes).transpose(perm).ravel()
+        present = counts > 0
+
+        grid = np.indices(tuple(self.shape[axis] for axis in keep)).reshape(len(keep), -1)
+        result = {name: np.asarray(DIMENSIONS[name], dtype=object)[codes[present]] for name, codes in zip(by, grid)}
+        result['çalışan_sayısı'] = counts[present]
+        n = counts[present].astype(np.float64)
+        for measure in measures:
+            i = MEASURES.index(measure)
+            total = self.sums[i].sum(axis=axes).transpose(perm).ravel()[present]
+            total_sq = self.sumsqs[i].sum(axis=axes).transpose(perm).ravel()[present]
+            mean = total / n
+            variance = np.maximum(total_sq - n * mean * mean, 0) / np.maximum(n - 1, 1)
+            result[f'{measure}_ort'] = mean
+            result[f'{measure}_std'] = np.where(n > 1, np.sqrt(variance), np.nan)
+        return pd.DataFrame(result)
+
+    @property
+    def salary_exact(self):
+        """Tüm maaşlar histogramda tam temsil ediliyor mu (100 TL katı ve 0 - 200.000 TL aralığında)."""
+        return not self.salary_off_grid.any()
+
+    def _exact_salaries(self, df):
+        if df is None:
+            raise ValueError("Maaşlar 100 TL katı değil ya da histogram aralığı dışında; kesin istatistikler "
+                             "için çalışan tablosu (df) verilmeli")
+        return df[['departman', 'aylık_maaş']].astype({'departman': str})
+
+    def salary_quantiles(self, quantiles):
+        """Departman başına maaş kantilleri (histogramdan, doğrusal enterpolasyon), (n_dept, n_q)."""
+        cumulative = np.cumsum(self.salary_hist, axis=1)
+        totals = cumulative[:, -1]
+        result = np.full((len(DEPARTMENTS), len(quantiles)), np.nan)
+        for d in np.flatnonzero(totals):
+            position = np.asarray(quantiles) * (totals[d] - 1)
+            lower = np.searchsorted(cumulative[d], np.floor(position), side='right')
+            upper = np.searchsorted(cumulative[d], np.ceil(position), side='right')
+            result[d] = (lower + (upper - lower) * (position - np.floor(position))) * SALARY_BIN_WIDTH
+        return result
+
+    def salary_box_stats(self, df=None):
+        """
+        Departman başına kutu grafiği istatistikleri (Tukey: çeyrekler ± 1.5 IQR içindeki en uç değerler).
+
+        Maaşlar histogramda tam temsil edilemiyorsa (ör. içe aktarılan kuruşlu ya da
+        200.000 TL üstü maaşlar) istatistikler `df` çalışan tablosundan kesin hesaplanır.
+
+        Returns:
+            DataFrame: departman, çalışan_sayısı, q1, median, q3, lowerfence, upperfence, mean
+        """
+        stats = self.rollup(['departman'], ['aylık_maaş'])
+        if not self.salary_exact:
+            salaries = self._exact_salaries(df)
+            quartiles = (salaries.groupby('departman')['aylık_maaş'].quantile([0.25, 0.5, 0.75]).unstack()
+                         .reindex(stats['departman']).to_numpy())
+            iqr = quartiles[:, 2] - quartiles[:, 0]
+            fences = pd.DataFrame({'low': quartiles[:, 0] - 1.5 * iqr, 'high': quartiles[:, 2] + 1.5 * iqr},
+                                  index=stats['departman'])
+            row_fences = fences.reindex(salaries['departman']).to_numpy()
+            values = salaries['aylık_maaş'].to_numpy()
+            inside = salaries[(values >= row_fences[:, 0]) & (values <= row_fences[:, 1])]
+            bounds = inside.groupby('departman')['aylık_maaş'].agg(['min', 'max']).reindex(stats['departman'])
+            lower, upper = bounds['min'].to_numpy(), bounds['max'].to_numpy()
+        else:
+            rows = [DEPARTMENTS.index(d) for d in stats['departman']]
+            quartiles = self.salary_quantiles([0.25, 0.5, 0.75])[rows]
+            iqr = quartiles[:, 2] - quartiles[:, 0]
+            values = np.arange(SALARY_HIST_BINS) * SALARY_BIN_WIDTH
+            lower, upper = [], []
+            for d, low_fence, high_fence in zip(rows, quartiles[:, 0] - 1.5 * iqr, quartiles[:, 2] + 1.5 * iqr):
+                inside = values[(self.salary_hist[d] > 0) & (values >= low_fence) & (values <= high_fence)]
+                lower.append(inside.min())
+                upper.append(inside.max())
+        return pd.DataFrame({'departman': stats['departman'], 'çalışan_sayısı': stats['çalışan_sayısı'],
+                             'q1': quartiles[:, 0], 'median': quartiles[:, 1], 'q3': quartiles[:, 2],
+                             'lowerfence': lower, 'upperfence': upper, 'mean': stats['aylık_maaş_ort']})
+
+    def salary_summary(self, df=None):
+        """
+        Departman bazında maaş ortalaması, medyanı, minimumu ve maksimumu.
+
+        Medyan / minimum / maksimum maaşlar histogramda tam temsil ediliyorsa küpten,
+        değilse `df` çalışan tablosundan kesin olarak hesaplanır.
+        """
+        summary = self.rollup(['departman'], ['aylık_maaş'])
+        if self.salary_exact:
+            quantiles = self.salary_quantiles([0.0, 0.5, 1.0])[[DEPARTMENTS.index(d) for d in summary['departman']]]
+        else:
+            quantiles = (self._exact_salaries(df).groupby('departman')['aylık_maaş'].agg(['min', 'median', 'max'])
+                         .reindex(summary['departman']).to_numpy())
+        return pd.DataFrame({'Departman': summary['departman'], 'Ortalama': summary['aylık_maaş_ort'],
+                             'Medyan': quantiles[:, 1], 'Minimum': quantiles[:, 0], 'Maksimum': quantiles[:, 2]})
+
+    def hiring_counts(self, freq='year'):
+        """
+        İşe giriş histogramından yıllık ya da aylık işe alım sayıları.
+
+        Args:
+            freq (str): 'year' ya da 'month'
+
+        Returns:
+            DataFrame: yıl (ya da ay) ve işe_alım_sayısı; işe alım olmayan dönemler atlanır
+        """
+        if freq == 'year':
+            counts = self.hire_months.reshape(-1, 12).sum(axis=1)
+            periods = np.arange(len(counts)) + HIRE_MONTH_ORIGIN
+            column = 'yıl'
+        else:
+            counts = self.hire_months
+            periods = (np.datetime64(f'{HIRE_MONTH_ORIGIN}-01', 'M') + np.arange(len(counts))).astype('datetime64[ns]')
+            column = 'ay'
+        present = counts > 0
+        return pd.DataFrame({column: periods[present], 'işe_alım_sayısı': counts[present]})
+
+    def attrition_reasons(self):
+        """Ayrılma nedenlerine göre çalışan sayıları (çoktan aza)."""
+        counts = self.reason_counts.sum(axis=0)
+        reasons = pd.DataFrame({'Ayrılma Nedeni': ATTRITION_REASONS, 'Çalışan Sayısı': counts})
+        return reasons[reasons['Çalışan Sayısı'] > 0].sort_values('Çalışan Sayısı', ascending=False).reset_index(drop=True)
+
+
+_demo_cache = {}
+
+
+def load_demo_cube(n_employees=200, seed=42):
+    """İK sekmesinin demo çalışan tablosunu ve küpünü döndürür (parametre başına bir kez üretilir)."""
+    key = (n_employees, seed)
+    if key not in _demo_cache:
+        employees = generate_employee_data(n_employees=n_employees, seed=seed)
+        _demo_cache[key] = (employees, HRCube.from_frame(employees))
+    return _demo_cache[key]
+
+
+def benchmark_cube(n_employees=1_000_000, repeats=3):
+    """Küp oluşturma ve küp üzerinden grafik sorgularının süresini groupby ile karşılaştırır."""
+    df = generate_employee_data(n_employees=n_employees)
+
+    start = time.perf_counter()
+    cube = HRCube.from_frame(df)
+    build = time.perf_counter() - start
+
+    queries = {
+        'küp': lambda: (cube.rollup(['departman'], ['işten_ayrılma']), cube.rollup(['departman', 'cinsiyet']),
+                        cube.rollup(['tatmin_grubu'], ['işten_ayrılma']), cube.rollup(['performans_grubu']),
+                        cube.salary_summary()),
+        'groupby': lambda: (df.groupby('departman', observed=True)['işten_ayrılma'].mean(),
+                            df.groupby(['departman', 'cinsiyet'], observed=True).size(),
+                            df.groupby('tatmin_skoru')['işten_ayrılma'].mean(),
+                            df['performans_puanı'].value_counts(),
+                            df.groupby('departman', observed=True)['aylık_maaş'].agg(['mean', 'median', 'min', 'max'])),
+    }
+    print(f"{n_employees:,} çalışan: küp oluşturma {build:.3f} sn ({cube.counts.size:,} hücre)")
+    for name, run in queries.items():
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+        print(f"  {name:>8}: grafik sorguları {min(timings) * 1000:.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="İK toplam küpü")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    bench_parser = subparsers.add_parser('benchmark', help="Küp ve groupby sorgu sürelerini karşılaştır")
+    bench_parser.add_argument('--employees', type=int, default=1_000_000)
+
+    args = parser.parse_args(argv)
+    if args.command == 'benchmark':
+        benchmark_cube(args.employees)
+
+
+if __name__ == '__main__':
+    main()
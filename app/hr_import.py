@@ -0,0 +1,429 @@
+"""
+İK sistemi (HRIS) dışa aktarımlarının içe aktarımı.
+CSV / Parquet dosyaları parça parça okunur; kaynak sütunlar mevcut Türkçe şemaya
+eşlenir, değerler doğrulanıp tiplere dönüştürülür ve geçersiz satırlar hata
+raporuyla reddedilir. Yenilemeler çalışan_id anahtarlıdır: ham satır hash'leri
+dönüştürmeden önce önceki içe aktarımla karşılaştırılır, yalnızca yeni / değişen / silinen
+çalışanlar doğrulanıp işlenir ve İK küpü eski satır çıkarılıp yeni satır eklenerek yerinde güncellenir.
+
+Kullanım:
+    python -m app.hr_import import calisanlar.csv
+    python -m app.hr_import import degisiklikler.csv --delta
+    python -m app.hr_import benchmark --employees 1000000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from app.feature_store import DATA_DIR, _row_digests
+from app.hr_analytics import (generate_employee_data, ACTIVE_LABEL, ATTRITION_REASONS, DEPARTMENTS,
+                              EDUCATION_LEVELS, GENDERS)
+from app.hr_cube import HRCube
+
+HR_STORE_DIR = os.path.join(DATA_DIR, 'hr_store')
+DEFAULT_CHUNKSIZE = 250_000
+MAX_ERROR_ROWS = 1000
+
+# Şema sütunları ve sırası (generate_employee_data ile aynı)
+EMPLOYEE_COLUMNS = ['çalışan_id', 'departman', 'pozisyon', 'cinsiyet', 'yaş', 'eğitim', 'şirket_deneyimi_yıl',
+                    'toplam_deneyim_yıl', 'işe_giriş_tarihi', 'aylık_maaş', 'performans_puanı', 'terfi_sayısı',
+                    'işten_ayrılma', 'ayrılma_nedeni', 'tatmin_skoru', 'fazla_mesai']
+REQUIRED_COLUMNS = ['çalışan_id', 'departman', 'cinsiyet', 'yaş', 'eğitim', 'şirket_deneyimi_yıl', 'aylık_maaş',
+                    'performans_puanı', 'tatmin_skoru', 'işten_ayrılma']
+
+CATEGORY_COLUMNS = {'departman': DEPARTMENTS, 'cinsiyet': GENDERS, 'eğitim': EDUCATION_LEVELS}
+CATEGORY_ALIASES = {
+    'departman': {'hr': 'İnsan Kaynakları', 'ik': 'İnsan Kaynakları', 'human resources': 'İnsan Kaynakları',
+                  'marketing': 'Pazarlama', 'sales': 'Satış', 'finance': 'Finans', 'it': 'Bilgi Teknolojileri',
+                  'bt': 'Bilgi Teknolojileri', 'operations': 'Operasyon'},
+    'cinsiyet': {'male': 'Erkek', 'm': 'Erkek', 'e': 'Erkek', 'female': 'Kadın', 'f': 'Kadın', 'k': 'Kadın',
+                 'kadin': 'Kadın'},
+    'eğitim': {'high school': 'Lise', 'associate': 'Önlisans', 'onlisans': 'Önlisans', 'bachelor': 'Lisans',
+               'master': 'Yüksek Lisans', 'yuksek lisans': 'Yüksek Lisans', 'phd': 'Doktora'},
+}
+# Sütun -> (alt sınır, üst sınır, tamsayı mı)
+NUMERIC_COLUMNS = {
+    'yaş': (16, 80, True),
+    'şirket_deneyimi_yıl': (0, 60, False),
+    'toplam_deneyim_yıl': (0, 60, False),
+    'aylık_maaş': (1, 10_000_000, False),
+    'performans_puanı': (1, 5, False),
+    'terfi_sayısı': (0, 100, True),
+    'tatmin_skoru': (1, 10, False),
+}
+BOOLEAN_COLUMNS = ['işten_ayrılma', 'fazla_mesai']
+TRUE_VALUES = {'true', '1', '1.0', 'evet', 'yes', 'y', 't', 'e'}
+FALSE_VALUES = {'false', '0', '0.0', 'hayır', 'hayir', 'no', 'n', 'f', 'h'}
+
+# Yaygın HRIS dışa aktarım sütun adları -> şema
+DEFAULT_COLUMN_MAP = {
+    'employee_id': 'çalışan_id', 'employeeid': 'çalışan_id', 'id': 'çalışan_id',
+    'department': 'departman', 'position': 'pozisyon', 'job_title': 'pozisyon', 'title': 'pozisyon',
+    'gender': 'cinsiyet', 'age': 'yaş', 'education': 'eğitim',
+    'tenure_years': 'şirket_deneyimi_yıl', 'years_at_company': 'şirket_deneyimi_yıl',
+    'total_experience_years': 'toplam_deneyim_yıl', 'hire_date': 'işe_giriş_tarihi',
+    'monthly_salary': 'aylık_maaş', 'salary': 'aylık_maaş', 'performance_score': 'performans_puanı',
+    'promotions': 'terfi_sayısı', 'attrition': 'işten_ayrılma', 'terminated': 'işten_ayrılma',
+    'termination_reason': 'ayrılma_nedeni', 'satisfaction_score': 'tatmin_skoru', 'overtime': 'fazla_mesai',
+}
+
+
+def _is_parquet(name):
+    return str(name).lower().endswith(('.parquet', '.pq'))
+
+
+def iter_hris_chunks(source, chunksize=DEFAULT_CHUNKSIZE, file_format=None):
+    """
+    HRIS dosyasını parça parça okur.
+
+    Args:
+        source: Dosya yolu ya da dosya benzeri nesne (ör. Streamlit yüklemesi)
+        chunksize (int): Parça başına satır sayısı
+        file_format (str): 'csv' ya da 'parquet' (verilmezse dosya adından çıkarılır)
+    """
+    file_format = file_format or ('parquet' if _is_parquet(getattr(source, 'name', source)) else 'csv')
+    if file_format == 'parquet':
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(source, chunksize=chunksize, dtype=str, keep_default_na=False, na_values=[''])
+
+
+def _column_lookup(columns, column_map=None):
+    """Kaynak sütun adlarını (büyük/küçük harf ve boşluklardan bağımsız) şema adlarına eşler."""
+    mapping = {name.casefold(): target for name, target in DEFAULT_COLUMN_MAP.items()}
+    mapping.update({name.casefold(): name for name in EMPLOYEE_COLUMNS})
+    mapping.update({name.casefold(): target for name, target in (column_map or {}).items()})
+    return {column: mapping[str(column).strip().casefold()] for column in columns
+            if str(column).strip().casefold() in mapping}
+
+
+def _normalize_labels(series, labels, aliases=None):
+    """Etiketleri büyük/küçük harften bağımsız eşler; tanımsız değerler NaN olur."""
+    lookup = {label.casefold(): label for label in labels}
+    lookup.update(aliases or {})
+    codes, uniques = pd.factorize(series)
+    mapped = np.array([lookup.get(str(value).strip().casefold()) for value in uniques] + [None], dtype=object)
+    return pd.Categorical(mapped[codes], categories=labels)
+
+
+def _to_bool(series):
+    """Doğru/yanlış değerlerini (true/false, 1/0, evet/hayır) bool'a çevirir; tanımsızlar NaN."""
+    if series.dtype == bool:
+        return series.astype(float)
+    codes, uniques = pd.factorize(series)
+    text = [str(value).strip().casefold() for value in uniques]
+    mapped = np.array([1.0 if t in TRUE_VALUES else 0.0 if t in FALSE_VALUES else np.nan for t in text] + [np.nan])
+    return pd.Series(mapped[codes], index=series.index)
+
+
+def _map_columns(raw, column_map=None):
+    """Kaynak sütunları şema adlarına çevirir; zorunlu sütunlar eksikse ValueError."""
+    df = raw.rename(columns=_column_lookup(raw.columns, column_map))
+    missing = [column for column in REQUIRED_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"Zorunlu sütunlar eksik: {', '.join(missing)}")
+    return df
+
+
+def coerce_chunk(raw, column_map=None):
+    """
+    Bir HRIS parçasını şemaya dönüştürür ve doğrular.
+
+    Args:
+        raw (DataFrame): Kaynak parça
+        column_map (dict): Ek kaynak sütun adı -> şema sütunu eşlemesi
+
+    Returns:
+        tuple: (geçerli satırlar DataFrame, hata kayıtları DataFrame: çalışan_id, sütun, değer, hata)
+
+    Raises:
+        ValueError: Zorunlu sütunlar eksikse
+    """
+    df = _map_columns(raw, column_map)
+    out = pd.DataFrame(index=df.index)
+    problems = []  # (geçersiz maske, sütun, hata)
+
+    ids = df['çalışan_id'].astype(str).str.strip()
+    problems.append((df['çalışan_id'].isna().to_numpy() | (ids == '').to_numpy(), 'çalışan_id', 'boş kimlik'))
+    out['çalışan_id'] = ids
+
+    for column, labels in CATEGORY_COLUMNS.items():
+        out[column] = _normalize_labels(df[column], labels, CATEGORY_ALIASES.get(column))
+        problems.append((out[column].isna().to_numpy(), column, 'tanımsız kategori'))
+    out['pozisyon'] = (df['pozisyon'].astype(str).str.strip() if 'pozisyon' in df.columns
+                       else pd.Series('Belirtilmemiş', index=df.index))
+
+    for column, (low, high, integer) in NUMERIC_COLUMNS.items():
+        if column not in df.columns:
+            continue
+        values = pd.to_numeric(df[column], errors='coerce')
+        problems.append((~values.between(low, high).to_numpy(), column, f'{low}-{high} aralığı dışında ya da sayı değil'))
+        out[column] = values.round().astype('Int64').astype(float) if integer else values.astype(float)
+    out['toplam_deneyim_yıl'] = out.get('toplam_deneyim_yıl', out['şirket_deneyimi_yıl'])
+    out['terfi_sayısı'] = out.get('terfi_sayısı', pd.Series(0.0, index=df.index))
+
+    for column in BOOLEAN_COLUMNS:
+        values = _to_bool(df[column]) if column in df.columns else pd.Series(0.0, index=df.index)
+        problems.append((values.isna().to_numpy(), column, 'doğru/yanlış değeri değil'))
+        out[column] = values.fillna(0).astype(bool)
+
+    if 'işe_giriş_tarihi' in df.columns:
+        hire_dates = pd.to_datetime(df['işe_giriş_tarihi'], errors='coerce')
+        problems.append((hire_dates.isna().to_numpy(), 'işe_giriş_tarihi', 'geçersiz tarih'))
+    else:
+        # Tarih yoksa şirketteki süreden türetilir
+        today = pd.Timestamp(datetime.now().date())
+        hire_dates = today - pd.to_timedelta((out['şirket_deneyimi_yıl'].fillna(0) * 365).round(), unit='D')
+    out['işe_giriş_tarihi'] = hire_dates.astype('datetime64[s]')
+
+    reasons = (df['ayrılma_nedeni'].astype(str).str.strip() if 'ayrılma_nedeni' in df.columns
+               else pd.Series(ACTIVE_LABEL, index=df.index))
+    # Ayrılan çalışanların tanımsız nedenleri 'Diğer' olarak sayılır
+    reasons = np.where(~out['işten_ayrılma'], ACTIVE_LABEL, np.where(reasons.isin(ATTRITION_REASONS), reasons, 'Diğer'))
+    out['ayrılma_nedeni'] = reasons
+
+    invalid = np.zeros(len(df), dtype=bool)
+    errors = []
+    for mask, column, message in problems:
+        invalid |= mask
+        if mask.any():
+            errors.append(pd.DataFrame({'çalışan_id': ids[mask].to_numpy(), 'sütun': column,
+                                        'değer': df[column][mask].astype(str).to_numpy(), 'hata': message}))
+    errors = pd.concat(errors, ignore_index=True) if errors else pd.DataFrame(columns=['çalışan_id', 'sütun', 'değer', 'hata'])
+
+    valid = out.loc[~invalid, EMPLOYEE_COLUMNS]
+    for column in ('yaş', 'terfi_sayısı'):
+        valid[column] = valid[column].astype(np.int64)
+    return valid, errors
+
+
+def raw_row_hashes(df):
+    """
+    Şemaya eşlenmiş kaynak satırlarının içerik hash'i (uint64), dönüştürme ve doğrulamadan önce.
+
+    Kaynakta bulunan şema sütunları (çalışan_id hariç) şema sırasıyla hash'lenir; kaynakta
+    olmayıp türetilen değerler (ör. bugünün tarihinden işe giriş tarihi) hash'e girmez.
+    """
+    columns = [column for column in EMPLOYEE_COLUMNS[1:] if column in df.columns]
+    return _row_digests(df[columns])
+
+
+class EmployeeStore:
+    """
+    çalışan_id anahtarlı, artımlı yenilenen çalışan tablosu ve İK küpü.
+
+    path=None verilirse yalnızca bellekte tutulur (ör. Streamlit oturumu).
+    """
+
+    def __init__(self, path=HR_STORE_DIR):
+        self.path = path
+        self.manifest = {'version': 0, 'rows': 0}
+        self.employees = None  # çalışan_id indeksli
+        self.hashes = None
+        self.cube = HRCube.empty()
+        self.errors = None
+        if path and os.path.exists(self._file('manifest.json')):
+            self._load()
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    @property
+    def version(self):
+        return self.manifest['version']
+
+    def _load(self):
+        with open(self._file('manifest.json'), 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        employees = pd.read_pickle(self._file('employees.pkl'))
+        self.hashes = pd.Series(employees.pop('_hash').to_numpy(), index=employees.index)
+        self.employees = employees
+        self.cube = HRCube.load(self._file('cube.npz'))
+
+    def _persist(self):
+        os.makedirs(self.path, exist_ok=True)
+        self.employees.assign(_hash=self.hashes.to_numpy()).to_pickle(self._file('employees.pkl'))
+        self.cube.save(self._file('cube.npz'))
+        tmp_path = self._file('manifest.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self._file('manifest.json'))
+
+    def refresh(self, source, column_map=None, snapshot=True, chunksize=DEFAULT_CHUNKSIZE, file_format=None):
+        """
+        HRIS dosyasını içe aktarır; yalnızca değişen çalışanları işler.
+
+        Args:
+            source: Dosya yolu ya da dosya benzeri nesne
+            column_map (dict): Ek sütun eşlemesi
+            snapshot (bool): True ise dosya tüm çalışanları içerir ve dosyada olmayanlar silinir;
+                False ise yalnızca değişiklikleri (ekleme / güncelleme) içerir
+            chunksize (int): Parça başına satır sayısı
+            file_format (str): 'csv' ya da 'parquet'
+
+        Returns:
+            dict: Güncel manifest (inserted, updated, deleted, unchanged, rejected, kept_previous, mode, seconds)
+
+        Ham satırlar her parçada hash'lenir; yalnızca yeni ya da hash'i değişen çalışanlar
+        dönüştürülüp doğrulanır. Satırı geçersiz olan mevcut çalışanlar silinmez: önceki
+        kayıtları korunur ve hata raporlanır (kept_previous).
+        """
+        start = time.perf_counter()
+        previous = self.hashes if self.hashes is not None else pd.Series([], dtype=np.uint64)
+        frames, valid_hashes, errors = [], [], []
+        seen = set()
+        matched = np.zeros(len(previous), dtype=bool)
+        rejected = unchanged = kept = 0
+        for chunk in iter_hris_chunks(source, chunksize, file_format):
+            chunk = _map_columns(chunk, column_map)
+            # Arrow dizgileri üzerinde isin yavaş olduğundan kimlikler nesne dizisi olarak karşılaştırılır
+            ids = chunk['çalışan_id'].astype(str).str.strip().to_numpy(dtype=object)
+            duplicated = pd.Index(ids).duplicated() | np.fromiter((i in seen for i in ids), dtype=bool, count=len(ids))
+            if duplicated.any():
+                errors.append(pd.DataFrame({'çalışan_id': ids[duplicated], 'sütun': 'çalışan_id',
+                                            'değer': ids[duplicated],
+                                            'hata': 'yinelenen kimlik (ilk kayıt kullanıldı)'}))
+                rejected += int(duplicated.sum())
+                chunk, ids = chunk[~duplicated], ids[~duplicated]
+            seen.update(ids)
+
+            # Ham satır hash'i önceki içe aktarımla aynı olan çalışanlar dönüştürülmez ve doğrulanmaz
+            hashes = raw_row_hashes(chunk)
+            changed = np.ones(len(chunk), dtype=bool)
+            positions = previous.index.get_indexer(ids)
+            known = positions >= 0
+            matched[positions[known]] = True
+            changed[known] = previous.to_numpy()[positions[known]] != hashes[known]
+            unchanged += int((~changed).sum())
+            if not changed.any():
+                continue
+
+            valid, chunk_errors = coerce_chunk(chunk[changed])
+            frames.append(valid)
+            valid_hashes.append(hashes[changed][chunk.index[changed].get_indexer(valid.index)])
+            if len(valid) < changed.sum():
+                # Geçersiz satırı olan mevcut çalışanların önceki kaydı korunur; yalnızca hata raporlanır
+                invalid = ~chunk.index[changed].isin(valid.index)
+                kept += int(known[changed][invalid].sum())
+                rejected += int(invalid.sum())
+                if sum(map(len, errors)) < MAX_ERROR_ROWS:
+                    errors.append(chunk_errors)
+
+        if frames:
+            incoming = pd.concat(frames, ignore_index=True).set_index('çalışan_id')
+        elif self.employees is not None:
+            incoming = self.employees.iloc[:0]  # Değişiklik yoksa tipler korunur
+        else:
+            incoming = pd.DataFrame(columns=EMPLOYEE_COLUMNS).set_index('çalışan_id')
+        hashes = pd.Series(np.concatenate(valid_hashes) if valid_hashes else np.array([], dtype=np.uint64),
+                           index=incoming.index)
+        is_update = previous.index.get_indexer(incoming.index) >= 0
+        updated_ids = incoming.index[is_update]
+        deleted = previous.index[~matched] if snapshot else pd.Index([])
+
+        # Küp yerinde güncellenir: eski satırlar çıkarılır, yeni / güncel satırlar eklenir
+        outgoing = updated_ids.append(deleted)
+        if self.employees is not None:
+            self.cube.add(self.employees.loc[outgoing], sign=-1)
+        self.cube.add(incoming)
+
+        if self.employees is None:
+            self.employees, self.hashes = incoming, hashes
+        else:
+            self.employees = pd.concat([self.employees.drop(outgoing), incoming])
+            self.hashes = pd.concat([self.hashes.drop(outgoing), hashes])
+        inserted = int((~is_update).sum())
+
+        self.errors = (pd.concat(errors, ignore_index=True).head(MAX_ERROR_ROWS) if errors
+                       else pd.DataFrame(columns=['çalışan_id', 'sütun', 'değer', 'hata']))
+        self.manifest = {
+            'version': self.version + 1,
+            'source': str(getattr(source, 'name', source if isinstance(source, str) else 'yükleme')),
+            'rows': len(self.employees),
+            'inserted': inserted,
+            'updated': len(updated_ids),
+            'deleted': len(deleted),
+            'unchanged': unchanged,
+            'rejected': rejected,
+            'kept_previous': kept,
+            'mode': 'tam' if self.version == 0 else ('artımlı' if snapshot else 'değişiklik'),
+            'refreshed_at': datetime.now().isoformat(timespec='seconds'),
+            'seconds': round(time.perf_counter() - start, 4),
+        }
+        if self.path:
+            self._persist()
+        return self.manifest
+
+
+def _write_extract(df, path):
+    """Çalışan tablosunu HRIS dışa aktarımı gibi (İngilizce sütun adlarıyla) yazar."""
+    reverse = {}
+    for source, target in DEFAULT_COLUMN_MAP.items():
+        reverse.setdefault(target, source)
+    extract = df.rename(columns=reverse)
+    if _is_parquet(path):
+        extract.to_parquet(path, index=False)
+    else:
+        extract.to_csv(path, index=False)
+
+
+def benchmark_refresh(n_employees=1_000_000, change_rate=0.01, file_format='parquet'):
+    """Tam içe aktarım ile %1 değişiklik içeren artımlı yenilemenin süresini karşılaştırır."""
+    rng = np.random.default_rng(0)
+    employees = generate_employee_data(n_employees=n_employees)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, f'hris.{file_format}')
+        _write_extract(employees, path)
+        store = EmployeeStore(path=None)
+        manifest = store.refresh(path)
+        print(f"Tam içe aktarım ({n_employees:,} çalışan): {manifest['seconds']:.2f} sn")
+
+        # %1 maaş güncellemesi, %0.1 ayrılan çalışan kaydı silinir
+        changed = rng.random(n_employees) < change_rate
+        employees.loc[changed, 'aylık_maaş'] = employees.loc[changed, 'aylık_maaş'] + 500
+        employees = employees[rng.random(n_employees) >= change_rate / 10]
+        _write_extract(employees, path)
+        manifest = store.refresh(path)
+        print(f"Artımlı yenileme: {manifest['seconds']:.2f} sn ({manifest['updated']:,} güncellenen, "
+              f"{manifest['deleted']:,} silinen, {manifest['unchanged']:,} değişmeyen)")
+
+        rebuilt = HRCube.from_frame(store.employees)
+        print(f"Yerinde güncellenen küp baştan oluşturulanla {'aynı' if store.cube.equals(rebuilt) else 'FARKLI'}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HRIS dışa aktarımı içe aktarma")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    import_parser = subparsers.add_parser('import', help="HRIS dosyasını depoya aktar")
+    import_parser.add_argument('path')
+    import_parser.add_argument('--store', default=HR_STORE_DIR)
+    import_parser.add_argument('--delta', action='store_true', help="Dosya yalnızca değişiklikleri içerir")
+    import_parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    bench_parser = subparsers.add_parser('benchmark', help="Tam ve artımlı içe aktarma süresini ölç")
+    bench_parser.add_argument('--employees', type=int, default=1_000_000)
+    bench_parser.add_argument('--format', choices=['csv', 'parquet'], default='parquet')
+
+    args = parser.parse_args(argv)
+    if args.command == 'import':
+        store = EmployeeStore(args.store)
+        manifest = store.refresh(args.path, snapshot=not args.delta, chunksize=args.chunksize)
+        print(json.dumps(manifest, ensure_ascii=False, indent=2))
+        if len(store.errors):
+            print(store.errors.head(20).to_string(index=False))
+    else:
+        benchmark_refresh(args.employees, file_format=args.format)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,268 @@
+"""
+Departman (ya da departman × pozisyon) içinde ücret eşitliği regresyonu.
+Her grupta log(aylık_maaş) deneyim, kıdem, performans, eğitim ve cinsiyet
+üzerine regresyonla açıklanır; cinsiyet katsayısı, diğer etkenler sabitken
+kadın ve erkek çalışanlar arasındaki düzeltilmiş ücret farkını verir. Tüm
+grupların normal denklemleri (X'X, X'y) (grup, eğitim, cinsiyet) hücrelerindeki
+yeterli istatistiklerden bincount ile yığın halinde kurulur ve tek bir toplu (batched) çözümle çözülür; binlerce
+grup tek NumPy çağrısında modellenir. Katsayılar veri sürümü başına bellekte
+önbelleğe alınır.
+
+Kullanım:
+    python -m app.hr_pay_equity benchmark --employees 1000000 --groups 5000
+"""
+
+import argparse
+import hashlib
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.hr_analytics import generate_employee_data, EDUCATION_LEVELS
+from app.hr_cube import _label_codes
+
+CONTINUOUS = ['toplam_deneyim_yıl', 'şirket_deneyimi_yıl', 'performans_puanı']
+FEATURES = ['Sabit'] + CONTINUOUS + [f'eğitim_{level}' for level in EDUCATION_LEVELS[1:]] + ['Kadın']  # Referans: Lise, Erkek
+GENDER_FEATURE = FEATURES.index('Kadın')
+GROUPINGS = {'Departman': ['departman'], 'Departman × Pozisyon': ['departman', 'pozisyon']}
+MIN_GROUP_SIZE = 20  # Bu sayının altındaki ya da tek cinsiyetli gruplarda fark raporlanmaz
+SIGNIFICANCE_Z = 1.96
+MEMORY_CACHE_SIZE = 8
+
+# Kukla değişkenler yalnızca (eğitim, cinsiyet) hücresine bağlıdır: hücre -> [Sabit, eğitim kuklaları, Kadın]
+_EDUCATION_CELLS, _GENDER_CELLS = np.divmod(np.arange(len(EDUCATION_LEVELS) * 2), 2)
+CELL_DESIGN = np.column_stack([np.ones(len(_EDUCATION_CELLS)),
+                               _EDUCATION_CELLS[:, None] == np.arange(1, len(EDUCATION_LEVELS)),
+                               _GENDER_CELLS]).astype(np.float64)
+_DUMMY_INDEX = [0] + list(range(1 + len(CONTINUOUS), len(FEATURES)))
+_CONTINUOUS_INDEX = list(range(1, 1 + len(CONTINUOUS)))
+
+_equity_cache = {}
+
+
+def design_inputs(df):
+    """Sürekli öznitelikler (n, 3), (eğitim, cinsiyet) hücre kodları ve hedef log(aylık_maaş)."""
+    education = _label_codes(df['eğitim'], EDUCATION_LEVELS)
+    cells = education * 2 + (df['cinsiyet'] == 'Kadın').to_numpy()
+    Z = np.column_stack([df[column].to_numpy(dtype=np.float64) for column in CONTINUOUS])
+    return Z, cells, np.log(df['aylık_maaş'].to_numpy(dtype=np.float64))
+
+
+def design_matrix(Z, cells):
+    """Tam tasarım matrisi (FEATURES sırasıyla); karşılaştırma ve tekil grup çözümleri için."""
+    X = np.empty((len(cells), len(FEATURES)))
+    X[:, _DUMMY_INDEX] = CELL_DESIGN[cells]
+    X[:, _CONTINUOUS_INDEX] = Z
+    return X
+
+
+def group_codes(df, by):
+    """Grup sütunlarının birleşiminden yoğun grup kodları ve grup adları."""
+    codes = np.zeros(len(df), dtype=np.int64)
+    levels = []
+    for column in by:
+        column_codes, uniques = pd.factorize(df[column], sort=True)
+        codes = codes * len(uniques) + column_codes
+        levels.append([str(value) for value in uniques])
+    present, codes = np.unique(codes, return_inverse=True)
+    names = [' / '.join(levels[i][index] for i, index in enumerate(np.unravel_index(code, [len(l) for l in levels])))
+             for code in present]
+    return codes, names
+
+
+def grouped_normal_equations(Z, cells, y, groups, n_groups):
+    """
+    Tüm grupların X'X (n_groups, p, p), X'y (n_groups, p) ve y'y toplamları.
+
+    Satır başına p² çarpım oluşturmak yerine (grup, eğitim, cinsiyet) hücrelerinde
+    yeterli istatistikler (sayı, sürekli özniteliklerin ve hedefin toplamları) bincount
+    ile toplanır; kukla bloklar hücre tasarım matrisiyle einsum üzerinden, sürekli
+    blok grup başına çarpım toplamlarından kurulur. Grup döngüsü yoktur.
+    """
+    n_cells = len(CELL_DESIGN)
+    flat = groups * n_cells + cells
+    size = n_groups * n_cells
+
+    def cell_sum(weights=None):
+        return np.bincount(flat, weights=weights, minlength=size).reshape(n_groups, n_cells)
+
+    def group_sum(weights):
+        return np.bincount(groups, weights=weights, minlength=n_groups)
+
+    counts = cell_sum().astype(np.float64)
+    z_sums = np.stack([cell_sum(Z[:, k]) for k in range(Z.shape[1])], axis=2)
+    y_sums = cell_sum(y)
+
+    p, k = len(FEATURES), Z.shape[1]
+    xtx = np.empty((n_groups, p, p))
+    dummy, continuous = np.ix_(_DUMMY_INDEX, _DUMMY_INDEX), np.ix_(_CONTINUOUS_INDEX, _CONTINUOUS_INDEX)
+    xtx[:, dummy[0], dummy[1]] = np.einsum('gc,ci,cj->gij', counts, CELL_DESIGN, CELL_DESIGN)
+    cross = np.einsum('gck,ci->gik', z_sums, CELL_DESIGN)
+    xtx[:, dummy[0], continuous[1]] = cross
+    xtx[:, continuous[0], dummy[1]] = cross.transpose(0, 2, 1)
+    z_cross = np.empty((n_groups, k, k))
+    for i in range(k):
+        for j in range(i, k):
+            z_cross[:, i, j] = z_cross[:, j, i] = group_sum(Z[:, i] * Z[:, j])
+    xtx[:, continuous[0], continuous[1]] = z_cross
+
+    xty = np.empty((n_groups, p))
+    xty[:, _DUMMY_INDEX] = y_sums @ CELL_DESIGN
+    xty[:, _CONTINUOUS_INDEX] = np.stack([group_sum(Z[:, i] * y) for i in range(k)], axis=1)
+    return xtx, xty, group_sum(y * y)
+
+
+class GroupedRegression:
+    """
+    Grup başına en küçük kareler çözümü; tüm gruplar tek toplu çözümle hesaplanır.
+
+    Args:
+        Z: Sürekli öznitelikler (n, 3)
+        cells: (eğitim, cinsiyet) hücre kodları
+        y: Hedef (n,)
+        groups: Grup kodları (0 .. n_groups - 1)
+        names (list): Grup adları
+    """
+
+    def __init__(self, Z, cells, y, groups, names):
+        self.names = list(names)
+        xtx, xty, yty = grouped_normal_equations(Z, cells, y, np.asarray(groups), len(self.names))
+        self.xtx, self.xty = xtx, xty
+        self.n = xtx[:, 0, 0]
+
+        # Tüm gruplar için tek toplu özdeğer ayrışımı; tekil gruplarda (ör. bir eğitim seviyesi
+        # hiç olmayan pozisyon) sıfır özdeğerler atlanarak sözde ters alınır
+        eigenvalues, eigenvectors = np.linalg.eigh(xtx)
+        tolerance = eigenvalues[:, -1:] * xtx.shape[1] * np.finfo(np.float64).eps
+        kept = eigenvalues > np.maximum(tolerance, 0)
+        inverse_values = np.divide(1, eigenvalues, out=np.zeros_like(eigenvalues), where=kept)
+        inverse = np.einsum('gik,gk,gjk->gij', eigenvectors, inverse_values, eigenvectors)
+        self.coef = np.einsum('gij,gj->gi', inverse, xty)
+        self.rank = kept.sum(axis=1)
+
+        rss = np.maximum(yty - np.einsum('gi,gi->g', self.coef, xty), 0)
+        tss = yty - xty[:, 0] ** 2 / np.maximum(self.n, 1)
+        dof = self.n - self.rank
+        self.sigma2 = np.divide(rss, dof, out=np.full(len(self.n), np.nan), where=dof > 0)
+        self.se = np.sqrt(np.clip(self.sigma2[:, None] * np.diagonal(inverse, axis1=1, axis2=2), 0, None))
+        self.r2 = np.divide(tss - rss, tss, out=np.full(len(self.n), np.nan), where=tss > 0)
+
+    def gap_table(self):
+        """Grup başına ham ve düzeltilmiş kadın-erkek ücret farkı (%)."""
+        women = self.xtx[:, 0, GENDER_FEATURE]
+        men = self.n - women
+        sum_women = self.xty[:, GENDER_FEATURE]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            raw_gap = sum_women / women - (self.xty[:, 0] - sum_women) / men
+        reportable = (self.n >= MIN_GROUP_SIZE) & (women > 0) & (men > 0)
+
+        coef, se = self.coef[:, GENDER_FEATURE], self.se[:, GENDER_FEATURE]
+        t_stat = np.divide(coef, se, out=np.full(len(coef), np.nan), where=se > 0)
+        table = pd.DataFrame({
+            'Grup': self.names,
+            'Çalışan': self.n.astype(int),
+            'Kadın': women.astype(int),
+            'Ham Fark (%)': np.expm1(raw_gap) * 100,
+            'Düzeltilmiş Fark (%)': np.expm1(coef) * 100,
+            'Alt Sınır (%)': np.expm1(coef - SIGNIFICANCE_Z * se) * 100,
+            'Üst Sınır (%)': np.expm1(coef + SIGNIFICANCE_Z * se) * 100,
+            't': t_stat,
+            'R²': self.r2,
+        })
+        table['Anlamlı'] = np.abs(table['t']) > SIGNIFICANCE_Z
+        return table[reportable].reset_index(drop=True)
+
+    def coefficients(self):
+        """Grup × öznitelik katsayı tablosu."""
+        return pd.DataFrame(self.coef, index=pd.Index(self.names, name='Grup'), columns=FEATURES)
+
+
+def fit_pay_equity(df, by=('departman',)):
+    """
+    Çalışan tablosunda grup başına ücret eşitliği regresyonu.
+
+    Args:
+        df (DataFrame): Çalışan tablosu
+        by (list): Grup sütunları (ör. ['departman'] ya da ['departman', 'pozisyon'])
+
+    Returns:
+        GroupedRegression
+    """
+    Z, cells, y = design_inputs(df)
+    groups, names = group_codes(df, list(by))
+    return GroupedRegression(Z, cells, y, groups, names)
+
+
+def _data_digest(df, by):
+    digest = hashlib.sha1(pd.util.hash_pandas_object(
+        df[list(by) + ['aylık_maaş', 'cinsiyet', 'eğitim', 'performans_puanı', 'toplam_deneyim_yıl',
+                       'şirket_deneyimi_yıl']], index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def cached_pay_equity(df, by=('departman',), data_key=None):
+    """
+    Ücret eşitliği katsayılarını veri sürümü ve gruplama başına bir kez hesaplar.
+
+    Args:
+        df (DataFrame): Çalışan tablosu
+        by (list): Grup sütunları
+        data_key: Verinin sürüm anahtarı; verilmezse veriden hash hesaplanır
+
+    Returns:
+        GroupedRegression
+    """
+    by = tuple(by)
+    key = (data_key if data_key is not None else _data_digest(df, by), by)
+    model = _equity_cache.pop(key, None)
+    if model is None:
+        model = fit_pay_equity(df, by)
+    _equity_cache[key] = model
+    while len(_equity_cache) > MEMORY_CACHE_SIZE:
+        _equity_cache.pop(next(iter(_equity_cache)))
+    return model
+
+
+def benchmark_pay_equity(n_employees=1_000_000, n_groups=5000):
+    """Toplu çözümü grup başına lstsq döngüsüyle karşılaştırır."""
+    df = generate_employee_data(n_employees=n_employees)
+    Z, cells, y = design_inputs(df)
+    X = design_matrix(Z, cells)
+    rng = np.random.default_rng(0)
+    settings = {'departman × pozisyon': group_codes(df, ['departman', 'pozisyon']),
+                f'{n_groups:,} rastgele ekip': (rng.integers(0, n_groups, n_employees),
+                                                [str(i) for i in range(n_groups)])}
+
+    print(f"{n_employees:,} çalışan, {len(FEATURES)} öznitelik")
+    for label, (groups, names) in settings.items():
+        start = time.perf_counter()
+        model = GroupedRegression(Z, cells, y, groups, names)
+        batched = time.perf_counter() - start
+
+        start = time.perf_counter()
+        order = np.argsort(groups, kind='stable')
+        bounds = np.searchsorted(groups[order], np.arange(len(names) + 1))
+        loop_coef = np.array([np.linalg.lstsq(X[order[lo:hi]], y[order[lo:hi]], rcond=None)[0]
+                              for lo, hi in zip(bounds[:-1], bounds[1:])])
+        loop = time.perf_counter() - start
+
+        gap = np.abs(model.coef[:, GENDER_FEATURE] - loop_coef[:, GENDER_FEATURE]).max()
+        print(f"  {label:>22}: toplu {batched * 1000:8.1f} ms, grup döngüsü {loop * 1000:8.1f} ms "
+              f"(cinsiyet katsayısı en büyük fark {gap:.1e})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ücret eşitliği regresyonu")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    bench_parser = subparsers.add_parser('benchmark', help="Toplu çözümü grup döngüsüyle karşılaştır")
+    bench_parser.add_argument('--employees', type=int, default=1_000_000)
+    bench_parser.add_argument('--groups', type=int, default=5000)
+
+    args = parser.parse_args(argv)
+    if args.command == 'benchmark':
+        benchmark_pay_equity(args.employees, args.groups)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+"""
+Çalışan kıdemi için Kaplan–Meier sağkalım (tutma) analizi.
+Şirketteki süre (`şirket_deneyimi_yıl`) zaman, işten ayrılma olay olarak alınır;
+ayrılmayan çalışanlar sağdan sansürlüdür. Tüm tabakalar (departman, fazla mesai,
+eğitim, cinsiyet kombinasyonları) tek bincount ile (tabaka × süre) ızgarasına
+sayılır; risk altındaki çalışanlar süre ekseninde ters kümülatif toplamla,
+sağkalım eğrileri kümülatif çarpımla hesaplanır. Tabaka başına döngü yoktur ve
+sonuçlar veri ile tabaka seçimi başına bellekte önbelleğe alınır.
+
+Kullanım:
+    python -m app.hr_survival benchmark --employees 1000000
+"""
+
+import argparse
+import hashlib
+import itertools
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.hr_analytics import generate_employee_data, DEPARTMENTS, EDUCATION_LEVELS, GENDERS
+from app.hr_cube import _label_codes
+
+STRATA = {
+    'departman': DEPARTMENTS,
+    'fazla_mesai': ['Fazla Mesai Yok', 'Fazla Mesai'],
+    'eğitim': EDUCATION_LEVELS,
+    'cinsiyet': GENDERS,
+}
+TIME_RESOLUTION = 0.1  # yıl; süreler bu hassasiyete yuvarlanır
+CONFIDENCE_Z = 1.96  # %95 güven aralığı
+MILESTONE_YEARS = (1, 3, 5)
+MEMORY_CACHE_SIZE = 8
+
+_survival_cache = {}
+
+
+def strata_codes(df, strata=()):
+    """Her çalışanın tabaka kodunu ve tabaka etiketlerini döndürür."""
+    codes = np.zeros(len(df), dtype=np.int64)
+    for column in strata:
+        if column not in STRATA:
+            raise ValueError(f"Desteklenmeyen tabaka: {column} (seçenekler: {', '.join(STRATA)})")
+        labels = STRATA[column]
+        column_codes = (df[column].to_numpy().astype(np.int64) if column == 'fazla_mesai'
+                        else _label_codes(df[column], labels))
+        codes = codes * len(labels) + column_codes
+    names = [' / '.join(combo) for combo in itertools.product(*(STRATA[column] for column in strata))]
+    return codes, names or ['Tüm Çalışanlar']
+
+
+class SurvivalCurves:
+    """
+    Tabaka başına Kaplan–Meier eğrileri.
+
+    Dizilerin biçimi (tabaka sayısı, süre ızgarası); ızgara `resolution` yıl adımlıdır.
+
+    Args:
+        durations: Şirketteki süre (yıl)
+        events: İşten ayrıldı mı (True: olay, False: sansürlü)
+        groups: Tabaka kodları (0 .. len(names) - 1)
+        names (list): Tabaka etiketleri
+        resolution (float): Süre hassasiyeti (yıl)
+    """
+
+    def __init__(self, durations, events, groups=None, names=None, resolution=TIME_RESOLUTION):
+        durations = np.asarray(durations, dtype=np.float64)
+        events = np.asarray(events, dtype=bool)
+        groups = np.zeros(len(durations), dtype=np.int64) if groups is None else np.asarray(groups, dtype=np.int64)
+        self.names = list(names) if names is not None else ['Tüm Çalışanlar']
+        self.resolution = resolution
+
+        ticks = np.rint(np.clip(durations, 0, None) / resolution).astype(np.int64)
+        n_groups, n_times = len(self.names), int(ticks.max(initial=0)) + 1
+        self.times = np.arange(n_times) * resolution
+
+        # (tabaka, süre) hücrelerine çalışan ve ayrılma sayıları
+        flat = groups * n_times + ticks
+        self.removed = np.bincount(flat, minlength=n_groups * n_times).reshape(n_groups, n_times)
+        self.events = np.bincount(flat[events], minlength=n_groups * n_times).reshape(n_groups, n_times)
+
+        # Risk altındakiler: süresi en az t olan çalışanlar (süre ekseninde ters kümülatif toplam)
+        self.at_risk = self.removed[:, ::-1].cumsum(axis=1)[:, ::-1]
+        hazard = np.divide(self.events, self.at_risk, out=np.zeros(self.events.shape), where=self.at_risk > 0)
+        self.survival = np.cumprod(1 - hazard, axis=1)
+
+        # Greenwood varyansı; güven aralığı log(-log S) ölçeğinde
+        surviving = self.at_risk - self.events
+        greenwood = np.cumsum(np.divide(self.events, self.at_risk * surviving, out=np.zeros(self.events.shape),
+                                        where=surviving > 0), axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_survival = np.log(self.survival)
+            spread = CONFIDENCE_Z * np.sqrt(greenwood) / np.abs(log_survival)
+            defined = (self.survival > 0) & (self.survival < 1)
+            self.lower = np.where(defined, self.survival ** np.exp(spread), self.survival)
+            self.upper = np.where(defined, self.survival ** np.exp(-spread), self.survival)
+
+    @property
+    def sizes(self):
+        return self.at_risk[:, 0]
+
+    def median_survival(self):
+        """Tabaka başına medyan süre (yıl); sağkalım %50'nin altına inmezse NaN."""
+        below = self.survival <= 0.5
+        return np.where(below.any(axis=1), self.times[below.argmax(axis=1)], np.nan)
+
+    def survival_at(self, years):
+        """Tabaka başına `years` yıl sonundaki sağkalım olasılıkları."""
+        index = min(int(np.floor(years / self.resolution + 1e-9)), len(self.times) - 1)
+        return self.survival[:, index]
+
+    def summary(self):
+        """Tabaka başına çalışan / ayrılma sayısı, medyan süre ve kilometre taşlarındaki tutma oranları."""
+        table = pd.DataFrame({'Grup': self.names, 'Çalışan': self.sizes, 'Ayrılan': self.events.sum(axis=1),
+                              'Medyan Süre (yıl)': self.median_survival()})
+        for years in MILESTONE_YEARS:
+            table[f'{years}. Yıl Tutma (%)'] = self.survival_at(years) * 100
+        return table[table['Çalışan'] > 0].reset_index(drop=True)
+
+    def to_frame(self):
+        """Grafik için uzun tablo: her tabakada başlangıç ve ayrılma / sansür olan süreler."""
+        observed = self.removed > 0
+        observed[:, 0] = True
+        group_index, time_index = np.nonzero(observed & (self.sizes > 0)[:, None])
+        return pd.DataFrame({
+            'Grup': np.asarray(self.names, dtype=object)[group_index],
+            'Süre (yıl)': self.times[time_index],
+            'Sağkalım': self.survival[group_index, time_index],
+            'Alt Sınır': self.lower[group_index, time_index],
+            'Üst Sınır': self.upper[group_index, time_index],
+            'Risk Altında': self.at_risk[group_index, time_index],
+        })
+
+
+def kaplan_meier(df, strata=(), resolution=TIME_RESOLUTION):
+    """
+    Çalışan tablosundan tabakalı Kaplan–Meier eğrileri.
+
+    Args:
+        df (DataFrame): Çalışan tablosu (şirket_deneyimi_yıl, işten_ayrılma ve tabaka sütunları)
+        strata (list): STRATA anahtarlarından tabaka sütunları (boşsa tek eğri)
+        resolution (float): Süre hassasiyeti (yıl)
+
+    Returns:
+        SurvivalCurves
+    """
+    groups, names = strata_codes(df, strata)
+    return SurvivalCurves(df['şirket_deneyimi_yıl'].to_numpy(), df['işten_ayrılma'].to_numpy(), groups, names,
+                          resolution)
+
+
+def _data_digest(df, strata):
+    digest = hashlib.sha1(np.ascontiguousarray(df['şirket_deneyimi_yıl'], dtype=np.float64).tobytes())
+    digest.update(np.ascontiguousarray(df['işten_ayrılma'], dtype=np.int8).tobytes())
+    digest.update(strata_codes(df, strata)[0].tobytes())
+    return digest.hexdigest()
+
+
+def cached_kaplan_meier(df, strata=(), data_key=None, resolution=TIME_RESOLUTION):
+    """
+    Kaplan–Meier eğrilerini veri ve tabaka seçimi başına bir kez hesaplar.
+
+    Args:
+        df (DataFrame): Çalışan tablosu
+        strata (list): Tabaka sütunları
+        data_key: Verinin sürüm anahtarı (ör. demo parametreleri); verilmezse veriden hash hesaplanır
+        resolution (float): Süre hassasiyeti (yıl)
+
+    Returns:
+        SurvivalCurves
+    """
+    strata = tuple(strata)
+    key = (data_key if data_key is not None else _data_digest(df, strata), strata, resolution)
+    curves = _survival_cache.pop(key, None)
+    if curves is None:
+        curves = kaplan_meier(df, strata, resolution)
+    _survival_cache[key] = curves
+    while len(_survival_cache) > MEMORY_CACHE_SIZE:
+        _survival_cache.pop(next(iter(_survival_cache)))
+    return curves
+
+
+def _loop_kaplan_meier(df, strata):
+    """Karşılaştırma için tabaka başına döngüyle (sıralama + np.unique) hesaplanan medyan süreler."""
+    medians = {}
+    for name, group in df.groupby(list(strata), observed=True):
+        durations = np.rint(group['şirket_deneyimi_yıl'].to_numpy() / TIME_RESOLUTION) * TIME_RESOLUTION
+        events = group['işten_ayrılma'].to_numpy()
+        times, inverse = np.unique(durations, return_inverse=True)
+        removed = np.bincount(inverse)
+        deaths = np.bincount(inverse, weights=events)
+        at_risk = len(durations) - np.concatenate([[0], np.cumsum(removed)[:-1]])
+        survival = np.cumprod(1 - deaths / at_risk)
+        medians[name] = times[np.argmax(survival <= 0.5)] if (survival <= 0.5).any() else np.nan
+    return medians
+
+
+def benchmark_survival(n_employees=1_000_000, repeats=3):
+    """Tabaka seçimleri için vektörel Kaplan–Meier süresini tabaka döngüsüyle karşılaştırır."""
+    df = generate_employee_data(n_employees=n_employees)
+    print(f"{n_employees:,} çalışan")
+    for strata in ([], ['departman'], ['departman', 'fazla_mesai'], ['departman', 'eğitim', 'cinsiyet']):
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            curves = kaplan_meier(df, strata)
+            timings.append(time.perf_counter() - start)
+        line = f"  {' × '.join(strata) or 'tabakasız':>30}: {len(curves.names):>3} eğri, {min(timings) * 1000:7.1f} ms"
+        if strata:
+            start = time.perf_counter()
+            medians = _loop_kaplan_meier(df, strata)
+            loop = time.perf_counter() - start
+            levels = [[False, True] if column == 'fazla_mesai' else STRATA[column] for column in strata]
+            expected = np.array([medians.get(combo, np.nan) for combo in itertools.product(*levels)])
+            matches = np.allclose(expected, curves.median_survival(), equal_nan=True)
+            line += f" (döngü {loop * 1000:7.1f} ms{'' if matches else ', FARKLI'})"
+        print(line)
+
+    start = time.perf_counter()
+    cached_kaplan_meier(df, ['departman'], data_key='benchmark')
+    cached_kaplan_meier(df, ['departman'], data_key='benchmark')
+    print(f"  Önbellekten iki çağrı: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Çalışan kıdemi Kaplan–Meier analizi")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    bench_parser = subparsers.add_parser('benchmark', help="Vektörel ve tabaka döngülü hesaplamayı karşılaştır")
+    bench_parser.add_argument('--employees', type=int, default=1_000_000)
+
+    args = parser.parse_args(argv)
+    if args.command == 'benchmark':
+        benchmark_survival(args.employees)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,239 @@
+"""
+Yalnızca NumPy ile yazılmış hafif makine öğrenmesi modelleri.
+sklearn kurulu olmayan dağıtımlar için gerçek (simülasyon olmayan) modeller sağlar:
+histogram tabanlı gradyan artırmalı karar kütükleri, kapalı formda ridge regresyon
+ve mini-batch k-means. API sklearn'e benzer (fit /
+partial_fit / predict / predict_proba / feature_importances_).
+"""
+
+import abc
+
+import numpy as np
+
+
+def _as_array(X):
+    return np.asarray(X, dtype=np.float64)
+
+
+def _sigmoid(z):
+    return 0.5 * (1.0 + np.tanh(0.5 * z))
+
+
+def _normalize_importances(values):
+    values = np.abs(np.asarray(values, dtype=np.float64))
+    total = values.sum()
+    return values / total if total > 0 else np.full(len(values), 1.0 / len(values))
+
+
+class _Standardizer:
+    """Özellikleri sıfır ortalama ve birim varyansa ölçekler."""
+
+    def fit(self, X):
+        self.mean_ = X.mean(axis=0)
+        self.scale_ = X.std(axis=0)
+        self.scale_[self.scale_ == 0] = 1.0
+        return self
+
+    def transform(self, X):
+        return (X - self.mean_) / self.scale_
+
+
+class _HistogramStumpBooster(abc.ABC):
+    """Histogram tabanlı karar kütüğü (derinlik 1) gradyan artırma çekirdeği."""
+
+    def __init__(self, n_estimators=100, learning_rate=0.1, max_bins=32, l2_regularization=1.0):
+        self.n_estimators = n_estimators
+        self.learning_rate = learning_rate
+        self.max_bins = max_bins
+        self.l2_regularization = l2_regularization
+
+    def _bin(self, X):
+        """Her özelliği kantil sınırlarına göre en fazla max_bins kutuya ayırır."""
+        quantiles = np.linspace(0, 1, self.max_bins + 1)[1:-1]
+        self.bin_edges_ = [np.unique(np.quantile(X[:, j], quantiles)) for j in range(X.shape[1])]
+        codes = np.column_stack([np.searchsorted(edges, X[:, j], side='left')
+                                 for j, edges in enumerate(self.bin_edges_)])
+        return codes
+
+    @abc.abstractmethod
+    def _gradients(self, y, raw):
+        """Kaybın ham tahmine göre birinci ve ikinci türevleri (g, h)."""
+
+    def _fit_raw(self, X, y, baseline):
+        X = _as_array(X)
+        n_samples, n_features = X.shape
+        codes = self._bin(X)
+        n_bins = self.max_bins
+
+        # Tüm özelliklerin histogramları tek bincount ile çıkarılır
+        flat_codes = (codes + np.arange(n_features) * n_bins).ravel()
+        lam = self.l2_regularization
+
+        self.baseline_ = baseline
+        raw = np.full(n_samples, baseline)
+        self.stumps_ = []
+        gains = np.zeros(n_features)
+
+        for _ in range(self.n_estimators):
+            g, h = self._gradients(y, raw)
+            g_hist = np.bincount(flat_codes, weights=np.repeat(g, n_features),
+                                 minlength=n_features * n_bins).reshape(n_features, n_bins)
+            h_hist = np.bincount(flat_codes, weights=np.repeat(h, n_features),
+                                 minlength=n_features * n_bins).reshape(n_features, n_bins)
+
+            G, H = g.sum(), h.sum()
+            g_left = np.cumsum(g_hist, axis=1)[:, :-1]
+            h_left = np.cumsum(h_hist, axis=1)[:, :-1]
+            gain = (g_left ** 2 / (h_left + lam) + (G - g_left) ** 2 / (H - h_left + lam) - G ** 2 / (H + lam))
+
+            # Yalnızca gerçek kutu sınırlarına denk gelen bölünmeler geçerlidir
+            valid = np.arange(n_bins - 1)[None, :] < np.array([len(e) for e in self.bin_edges_])[:, None]
+            gain = np.where(valid, gain, -np.inf)
+            feature, split = np.unravel_index(np.argmax(gain), gain.shape)
+            if not np.isfinite(gain[feature, split]) or gain[feature, split] <= 0:
+                break
+
+            gl, hl = g_left[feature, split], h_left[feature, split]
+            left_value = -self.learning_rate * gl / (hl + lam)
+            right_value = -self.learning_rate * (G - gl) / (H - hl + lam)
+            threshold = self.bin_edges_[feature][split]
+
+            raw += np.where(codes[:, feature] <= split, left_value, right_value)
+            self.stumps_.append((feature, threshold, left_value, right_value))
+            gains[feature] += gain[feature, split]
+
+        self.feature_importances_ = _normalize_importances(gains)
+        return self
+
+    def _raw_predict(self, X):
+        X = _as_array(X)
+        raw = np.full(len(X), self.baseline_)
+        for feature, threshold, left_value, right_value in self.stumps_:
+            raw += np.where(X[:, feature] <= threshold, left_value, right_value)
+        return raw
+
+
+class GradientBoostedStumpsClassifier(_HistogramStumpBooster):
+    """Lojistik kayıplı, histogram tabanlı gradyan artırmalı karar kütükleri (ikili sınıflandırma)."""
+
+    def _gradients(self, y, raw):
+        p = _sigmoid(raw)
+        return p - y, np.clip(p * (1 - p), 1e-10, None)
+
+    def fit(self, X, y):
+        y = np.asarray(y, dtype=np.float64)
+        prior = np.clip(y.mean(), 1e-6, 1 - 1e-6)
+        return self._fit_raw(X, y, np.log(prior / (1 - prior)))
+
+    def predict_proba(self, X):
+        p = _sigmoid(self._raw_predict(X))
+        return np.column_stack([1 - p, p])
+
+    def predict(self, X):
+        return (self._raw_predict(X) >= 0).astype(int)
+
+
+class RidgeRegression:
+    """Kapalı formda (normal denklemler) çözülen ridge regresyon."""
+
+    def __init__(self, alpha=1.0):
+        self.alpha = alpha
+
+    def fit(self, X, y):
+        X = _as_array(X)
+        y = np.asarray(y, dtype=np.float64)
+        self._scaler = _Standardizer().fit(X)
+        Z = self._scaler.transform(X)
+        y_mean = y.mean()
+
+        beta = np.linalg.solve(Z.T @ Z + self.alpha * np.eye(Z.shape[1]), Z.T @ (y - y_mean))
+        self.coef_ = beta / self._scaler.scale_
+        self.intercept_ = y_mean - self.coef_ @ self._scaler.mean_
+        self.feature_importances_ = _normalize_importances(beta)
+        return self
+
+    def predict(self, X):
+        return _as_array(X) @ self.coef_ + self.intercept_
+
+    def score(self, X, y):
+        """Belirlilik katsayısı (R²)."""
+        y = np.asarray(y, dtype=np.float64)
+        residual = ((y - self.predict(X)) ** 2).sum()
+        return 1 - residual / ((y - y.mean()) ** 2).sum()
+
+
+def nearest_centroid(X, centers):
+    """Her satır için en yakın merkezin indeksi ve kare uzaklığı (tek matris çarpımı)."""
+    X = _as_array(X)
+    # ||x - c||² = ||x||² - 2 x·c + ||c||²; en yakın merkez için ||x||² gerekmez
+    scores = (centers ** 2).sum(axis=1) - 2 * X @ centers.T
+    labels = scores.argmin(axis=1)
+    distances = np.maximum(scores[np.arange(len(X)), labels] + (X ** 2).sum(axis=1), 0)
+    return labels, distances
+
+
+class MiniBatchKMeans:
+    """
+    Mini-batch k-means (Sculley, 2010): her adımda küçük bir rastgele grup en yakın
+    merkezlere atanır ve merkezler, o ana kadar atanan nokta sayısıyla azalan öğrenme
+    oranıyla güncellenir. Başlangıç merkezleri k-means++ ile seçilir.
+    """
+
+    def __init__(self, n_clusters=8, batch_size=1024, max_iter=100, n_init=3, tol=1e-4, random_state=0):
+        self.n_clusters = n_clusters
+        self.batch_size = batch_size
+        self.max_iter = max_iter
+        self.n_init = n_init
+        self.tol = tol
+        self.random_state = random_state
+        self._rng = np.random.default_rng(random_state)
+        self.cluster_centers_ = None
+
+    def _init_centers(self, X):
+        """k-means++: her yeni merkez, mevcut merkezlere kare uzaklıkla orantılı olasılıkla seçilir."""
+        centers = [X[self._rng.integers(len(X))]]
+        distances = ((X - centers[0]) ** 2).sum(axis=1)
+        for _ in range(1, self.n_clusters):
+            total = distances.sum()
+            index = self._rng.choice(len(X), p=distances / total) if total > 0 else self._rng.integers(len(X))
+            centers.append(X[index])
+            distances = np.minimum(distances, ((X - X[index]) ** 2).sum(axis=1))
+        self.cluster_centers_ = np.array(centers, dtype=np.float64)
+        self.counts_ = np.zeros(self.n_clusters)
+
+    def partial_fit(self, X):
+        """Bir mini-batch ile merkezleri günceller."""
+        X = _as_array(X)
+        if self.cluster_centers_ is None:
+            self._init_centers(X)
+        labels, _ = nearest_centroid(X, self.cluster_centers_)
+        batch_counts = np.bincount(labels, minlength=self.n_clusters)
+        sums = np.stack([np.bincount(labels, weights=X[:, j], minlength=self.n_clusters)
+                         for j in range(X.shape[1])], axis=1)
+        self.counts_ += batch_counts
+        # Merkez, kendisine atanan tüm noktaların (akan) ortalamasına doğru 1 / sayım oranıyla kayar
+        step = np.divide(1, self.counts_, out=np.zeros(self.n_clusters), where=self.counts_ > 0)
+        shift = (sums - batch_counts[:, None] * self.cluster_centers_) * step[:, None]
+        self.cluster_centers_ += shift
+        self.last_shift_ = float((shift ** 2).sum())
+        return self
+
+    def fit(self, X):
+        """n_init farklı başlangıçtan eğitir; toplam kare uzaklığı (inertia) en düşük sonucu tutar."""
+        X = _as_array(X)
+        scale = X.var(axis=0).mean() or 1.0  # merkez kayması sütun varyansına göre ölçeklenir
+        best = None
+        for _ in range(self.n_init):
+            self._init_centers(X[self._rng.choice(len(X), size=min(len(X), 10_000), replace=False)])
+            for self.n_iter_ in range(1, self.max_iter + 1):
+                self.partial_fit(X[self._rng.integers(0, len(X), size=min(self.batch_size, len(X)))])
+                if self.n_iter_ >= 10 and self.last_shift_ / scale < self.tol:
+                    break
+            labels, distances = nearest_centroid(X, self.cluster_centers_)
+            if best is None or distances.sum() < best[0]:
+                best = (float(distances.sum()), self.cluster_centers_, self.counts_, labels)
+        self.inertia_, self.cluster_centers_, self.counts_, self.labels_ = best
+        return self
+
+    def predict(self, X):
+        return nearest_centroid(X, self.cluster_centers_)[0]
@@ -15,7 +15,6 @@ import seaborn as sns
 try:
     from sklearn.model_selection import train_test_split
     from sklearn.ensemble import RandomForestClassifier
-    from sklearn.metrics import classification_report, confusion_matrix, roc_auc_score, roc_curve
     from sklearn.preprocessing import StandardScaler
     SKLEARN_AVAILABLE = True
 except ImportError:
@@ -59,20 +58,47 @@ except ImportError as e:
 
 # HR Analytics modülünü import et
 try:
-    from app.hr_analytics import (generate_employee_data, create_attrition_department_chart,
+    from app.hr_analytics import (create_attrition_department_chart,
                                create_salary_distribution_chart, create_performance_distribution_chart,
                                create_hiring_trends_chart, create_department_demographics_chart,
-                               create_satisfaction_vs_attrition_chart)
+                               create_satisfaction_vs_attrition_chart, create_tenure_survival_chart,
+                               create_pay_equity_chart)
+    from app.hr_cube import load_demo_cube
+    from app.hr_survival import cached_kaplan_meier, STRATA
+    from app.hr_pay_equity import cached_pay_equity, GROUPINGS, MIN_GROUP_SIZE
+    from app.hr_import import EmployeeStore
 except ImportError as e:
     st.error(f"HR Analytics modül import hatası: {e}")
 
-# datascience fonksiyonlarını import etme - sklearn olmayan sürümü kullan
+# Churn veri üretimi ve model modülleri
+from app.churn import (encode_churn_features, fit_churn_model, risk_segments,
+                       save_churn_model, churn_model_version, saved_model_version, CHURN_FEATURES,
+                       CHURN_MODEL_PATH, COMPILED_CHURN_MODEL_PATH, RISK_LABELS)
+from app.churn_tuning import tune_churn_model, DEFAULT_PARAM_GRID
+from app.forest_compiler import CompiledForest, compile_forest
+from app.churn_whatif import WhatIfSimulator
+from app.churn_explain import explain_customers
+from app.churn_drift import DriftMonitor, DriftReference, DRIFT_REFERENCE_PATH
+from app.churn_threshold import cached_threshold_sweep
+
+# Sipariş olaylarından türetilen ortak müşteri özellik deposu
+from app.feature_store import load_demo_features, ANALYSIS_DATE
+
+# A/B test anlamlılık motoru
+from app.ab_testing import analyze_ab_test
+from app.ab_sequential import StreamingABTest
+
+# Yaklaşık tekil sayım (HyperLogLog) modülü
+from app.cardinality import CellSketches, distinct_count
+
+# datascience fonksiyonlarını import etme - model arka ucu çalışma zamanında seçilir
 try:
-    from app.datascience_no_sklearn import (generate_classification_data, generate_regression_data,
-                                    generate_ab_test_data, generate_customer_segmentation_data,
-                                    create_random_forest_plot, create_ab_test_plot, 
-                                    create_segmentation_plot, create_regression_plot,
-                                    accuracy_score)
+    from app.datascience import (generate_classification_data, generate_regression_data,
+                                 generate_ab_test_data, generate_customer_segmentation_data,
+                                 create_random_forest_plot, create_ab_test_plot,
+                                 create_segmentation_plot, create_regression_plot,
+                                 accuracy_score, available_backends, get_backend)
+    from app.segmentation import cached_segmenter, K_CANDIDATES
 except ImportError as e:
     st.error(f"Modül import hatası: {e}")
     
@@ -84,7 +110,7 @@ except ImportError as e:
         })
         return df, np.random.randint(0, 2, 100)
         
-    def create_random_forest_plot(X, y):
+    def create_random_forest_plot(X, y, backend=None):
         fig = px.bar(x=['yaş', 'gelir'], y=[0.6, 0.4], title="Özellik Önemleri")
         return None, fig
         
@@ -96,7 +122,7 @@ except ImportError as e:
         fig2 = px.bar(data, x='grup', y='harcama', title="Harcama Miktarları") 
         return fig1, fig2
         
-    def generate_customer_segmentation_data():
+    def generate_customer_segmentation_data(n_samples=100):
         return pd.DataFrame({
             'musteri_id': [f"ID{i}" for i in range(100)],
             'yillik_harcama': np.random.normal(1000, 500, 100),
@@ -105,7 +131,7 @@ except ImportError as e:
             'segment': np.random.choice(['Yüksek Değer', 'Orta Değer', 'Düşük Değer', 'Yeni Müşteri'], 100)
         })
         
-    def create_segmentation_plot(data):
+    def create_segmentation_plot(data, region=None, lod='auto'):
         return px.scatter_3d(data, x='yillik_harcama', y='alisveris_sikligi', z='musteri_suresi', color='segment')
         
     def generate_regression_data():
@@ -115,7 +141,7 @@ except ImportError as e:
         })
         return df, np.random.normal(5000, 1000, 100)
         
-    def create_regression_plot(X, y):
+    def create_regression_plot(X, y, backend=None):
         y_pred = y + np.random.normal(0, 500, len(y))
         fig = px.scatter(x=y, y=y_pred, title="Gerçek vs Tahmin")
         return None, fig
@@ -123,6 +149,15 @@ except ImportError as e:
     def accuracy_score(y_true, y_pred):
         return sum(np.array(y_true) == np.array(y_pred)) / len(y_true)
 
+    def available_backends():
+        return []
+
+    def get_backend(name=None):
+        return None
+
+    K_CANDIDATES = range(2, 9)
+    cached_segmenter = None
+
 import plotly.express as px
 
 st.set_page_config(
@@ -1465,6 +1500,19 @@ with menu[3]:
     Her bir örnek, farklı veri bilimi tekniklerini ve algoritmaları göstermektedir.</p>
     """, unsafe_allow_html=True)
     st.markdown("""</div>""", unsafe_allow_html=True)
+
+    # Model arka ucu seçimi (yalnızca seçilen arka uç import edilir)
+    backend_options = available_backends()
+    ds_backend = None
+    if backend_options:
+        ds_backend = st.selectbox(
+            "Model arka ucu",
+            backend_options,
+            format_func=lambda name: {'sklearn': 'scikit-learn', 'numpy': 'NumPy',
+                                      'compiled': 'Derlenmiş orman'}.get(name, name),
+            key="ds_backend"
+        )
+    ds_backend_info = get_backend(ds_backend) if ds_backend else None
     
     # Random Forest Sınıflandırma
     st.markdown("""<div class="card">""", unsafe_allow_html=True)
@@ -1477,18 +1525,14 @@ with menu[3]:
     # Random Forest modeli ve görselleştirme
     with st.spinner("Random Forest modeli hazırlanıyor..."):
         X, y = generate_classification_data()
-        rf_model, rf_fig = create_random_forest_plot(X, y)
+        rf_model, rf_fig = create_random_forest_plot(X, y, backend=ds_backend)
         st.plotly_chart(rf_fig, use_container_width=True, key="chart_14")
     
     # Model açıklaması ve ek bilgi
     with st.expander("Model Detayları"):
-        st.write("**Random Forest Modeli Parametreleri:**")
-        st.code("""
-        RandomForestClassifier(
-            n_estimators=100,  # Ağaç sayısı
-            random_state=42,   # Sonuçların tekrarlanabilirliği için
-        )
-        """)
+        if ds_backend_info is not None:
+            st.write(f"**{ds_backend_info.classifier_label} Modeli Parametreleri:**")
+            st.code(ds_backend_info.classifier_code)
         
         col1, col2 = st.columns(2)
         with col1:
@@ -1516,30 +1560,67 @@ with menu[3]:
         with col2:
             st.plotly_chart(spending_fig, use_container_width=True, key="chart_16")
     
-    # Test sonuçları ve anlamı
+    # Test sonuçları ve anlamı: z-testi, Welch t-testi ve bootstrap güven aralıkları (app/ab_testing.py)
     with st.expander("Test Sonuçları"):
-        st.write("""
+        ab_result = analyze_ab_test(ab_data, control='A')
+        variant = ab_result.loc['B']
+        conversion_verdict = "anlamlıdır" if variant['Dönüşüm Anlamlı'] else "anlamlı değildir"
+        spend_verdict = "anlamlıdır" if variant['Harcama Anlamlı'] else "anlamlı değildir"
+        st.write(f"""
         **Test Sonuçlarının Yorumu:**
         
-        B grubu hem dönüşüm oranında hem de ortalama harcamada daha iyi performans göstermiştir. 
-        Bu sonuçlara göre, B varyasyonunun kullanılması önerilir.
+        B grubunun dönüşüm oranı A grubuna göre {variant['Oran Farkı (puan)']:+.2f} puan, dönüşen kullanıcı
+        başına ortalama harcaması {variant['Harcama Farkı (TL)']:+.2f} TL farklıdır.
         
-        **İstatistiksel Anlamlılık:**
+        **İstatistiksel Anlamlılık (%95 güven düzeyi):**
         
-        * Dönüşüm oranı farkı: % 25 anlamlılık
-        * Ortalama harcama farkı: % 6.7 anlamlılık
+        * Dönüşüm oranı farkı (iki oranlı z-testi): z = {variant['z']:.2f}, p = {variant['p (dönüşüm)']:.3f} → {conversion_verdict}
+          (bootstrap güven aralığı: {variant['Oran Farkı Alt (puan)']:+.2f} / {variant['Oran Farkı Üst (puan)']:+.2f} puan)
+        * Ortalama harcama farkı (Welch t-testi): t = {variant['t']:.2f}, p = {variant['p (harcama)']:.3f} → {spend_verdict}
+          (bootstrap güven aralığı: {variant['Harcama Farkı Alt (TL)']:+.2f} / {variant['Harcama Farkı Üst (TL)']:+.2f} TL)
         """)
         
         # Özet tablo
-        ab_summary = pd.DataFrame({
-            'Grup': ['A', 'B'],
-            'Kullanıcı Sayısı': [ab_data[ab_data['grup'] == 'A'].shape[0], ab_data[ab_data['grup'] == 'B'].shape[0]],
-            'Dönüşüm Sayısı': [ab_data[ab_data['grup'] == 'A']['donusum'].sum(), ab_data[ab_data['grup'] == 'B']['donusum'].sum()],
-            'Dönüşüm Oranı (%)': [ab_data[ab_data['grup'] == 'A']['donusum'].mean() * 100, ab_data[ab_data['grup'] == 'B']['donusum'].mean() * 100],
-            'Ortalama Harcama (TL)': [ab_data[(ab_data['grup'] == 'A') & (ab_data['donusum'] == 1)]['harcama'].mean(), 
-                                    ab_data[(ab_data['grup'] == 'B') & (ab_data['donusum'] == 1)]['harcama'].mean()]
-        })
-        st.dataframe(ab_summary.round(2), width="stretch")
+        ab_summary = ab_result[['Kullanıcı', 'Dönüşüm', 'Dönüşüm Oranı (%)', 'p (dönüşüm)',
+                                'Ortalama Harcama (TL)', 'p (harcama)']].rename_axis('Grup').reset_index()
+        st.dataframe(ab_summary.round(3), width="stretch", hide_index=True)
+    
+    # Canlı sıralı test: olaylar gruplar halinde akar, yalnızca varyant birikimleri güncellenir (app/ab_sequential.py)
+    st.markdown("#### 📡 Canlı Sıralı Test (mSPRT)")
+    st.markdown("<p style='color: #6B7280;'>Her an geçerli p-değerleri sonuçlara istenildiği kadar sık bakılmasına izin verir; geçmiş olaylar saklanmaz ve yeniden taranmaz.</p>", unsafe_allow_html=True)
+    
+    @getattr(st, 'fragment', lambda fn: fn)
+    def ab_streaming_panel():
+        col1, col2 = st.columns(2)
+        with col1:
+            next_batch = st.button("▶️ 10.000 olay akıt", key="ab_stream_next")
+        with col2:
+            reset = st.button("↺ Sıfırla", key="ab_stream_reset")
+        if reset or 'ab_stream' not in st.session_state:
+            st.session_state['ab_stream'] = StreamingABTest(['A', 'B'])
+        stream = st.session_state['ab_stream']
+        if next_batch:
+            batch = generate_ab_test_data(10_000, seed=1000 + stream.events // 10_000)
+            stream.update(batch['grup'], batch['donusum'], batch['harcama'])
+        
+        stream_result = stream.results()
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("İşlenen Olay", f"{stream.events:,}")
+        with col2:
+            st.metric("B Dönüşüm p-değeri", f"{stream_result.loc['B', 'p (dönüşüm)']:.4f}",
+                      f"{stream_result.loc['B', 'Oran Farkı (puan)']:+.2f} puan")
+        with col3:
+            st.metric("B Harcama p-değeri", f"{stream_result.loc['B', 'p (harcama)']:.4f}",
+                      f"{stream_result.loc['B', 'Harcama Farkı (TL)']:+.2f} TL")
+        if stream.history:
+            fig_stream = px.line(stream.history_frame(), x='Olay', y='p-değeri', color='Test', log_y=True,
+                                 title='Her An Geçerli p-değerleri')
+            fig_stream.add_hline(y=stream.alpha, line_dash='dash', line_color='red')
+            fig_stream.update_layout(height=350, plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
+            st.plotly_chart(fig_stream, use_container_width=True, key="chart_ab_stream")
+    
+    ab_streaming_panel()
     st.markdown("""</div>""", unsafe_allow_html=True)
     
     # Müşteri Segmentasyonu
@@ -1550,37 +1631,75 @@ with menu[3]:
     Bu örnek, müşterileri harcama, alışveriş sıklığı ve müşteri süresi değişkenlerine göre segmentlere ayırmaktadır.</p>
     """, unsafe_allow_html=True)
     
-    # Segmentasyon verileri ve 3D görselleştirme
-    with st.spinner("Müşteri segmentasyonu hazırlanıyor..."):
-        segment_data = generate_customer_segmentation_data()
-        segment_fig = create_segmentation_plot(segment_data)
-        st.plotly_chart(segment_fig, use_container_width=True, key="chart_17")
-    
-    # Segment özeti ve açıklama
-    with st.expander("Segment Detayları"):
-        st.write("""
-        **Müşteri Segmentleri:**
-        
-        * **Yüksek Değer:** Yüksek harcama, yüksek alışveriş sıklığı ve uzun müşteri süresi
-        * **Orta Değer:** Orta seviye harcama, orta sıklık ve orta müşteri süresi
-        * **Düşük Değer:** Düşük harcama, düşük sıklık ve kısa müşteri süresi
-        * **Yeni Müşteri:** Düşük harcama, düşük sıklık ve çok kısa müşteri süresi
-        """)
-        
-        # Segment özeti tablosu
-        segment_summary = segment_data.groupby('segment').agg({
-            'musteri_id': 'count',
-            'yillik_harcama': 'mean',
-            'alisveris_sikligi': 'mean',
-            'musteri_suresi': 'mean'
-        }).reset_index()
-        
-        segment_summary.columns = ['Segment', 'Müşteri Sayısı', 'Ort. Yıllık Harcama (TL)', 
-                                'Ort. Alışveriş Sıklığı (yıllık)', 'Ort. Müşteri Süresi (yıl)']
-        
-        st.dataframe(segment_summary.round(2), width="stretch")
-    st.markdown("""</div>""", unsafe_allow_html=True)
-    
+    # Segmentasyon verileri, mini-batch k-means segmentleri ve 3D görselleştirme (app/segmentation.py);
+    # büyük müşteri sayılarında grafik voksel toplamı ya da tabakalı örneklemle bayt bütçesine sığdırılır
+    @getattr(st, 'fragment', lambda fn: fn)
+    def segmentation_panel():
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            segment_k = st.selectbox("Segment sayısı", ["Otomatik"] + [k for k in K_CANDIDATES if k <= 6], index=3,
+                                     key="ds_segment_k",
+                                     help="Otomatik: 2-8 küme arasından örneklenmiş silhouette skoru en yüksek olan seçilir")
+        with col2:
+            segment_n = st.selectbox("Müşteri sayısı", [500, 100_000, 1_000_000], format_func=lambda n: f"{n:,}",
+                                     key="ds_segment_n")
+        with col3:
+            lod_labels = {'auto': 'Otomatik', 'voxel': 'Voksel toplamı', 'sample': 'Tabakalı örneklem'}
+            segment_lod = st.selectbox("Ayrıntı düzeyi", list(lod_labels), format_func=lod_labels.get,
+                                       key="ds_segment_lod",
+                                       help="Otomatik: bayt bütçesine sığan veri nokta nokta, sığmayan voksel olarak çizilir")
+        with st.spinner("Müşteri segmentasyonu hazırlanıyor..."):
+            cached = st.session_state.get('segment_data')
+            if cached is None or cached[0] != segment_n:
+                cached = (segment_n, generate_customer_segmentation_data(segment_n))
+                st.session_state['segment_data'] = cached
+            segment_data = cached[1]
+            if cached_segmenter is not None:
+                segmenter = cached_segmenter(segment_data, None if segment_k == "Otomatik" else segment_k,
+                                             backend=ds_backend, data_key=('demo', segment_n, 42))
+                segment_data['segment'] = segmenter.label(segment_data)
+                st.caption(f"{segmenter.n_clusters} segment · silhouette {segmenter.silhouette:.3f} · "
+                           f"{get_backend(ds_backend).name} mini-batch k-means")
+
+            # Yakınlaştırılan bölge için yalnızca o bölgedeki müşteriler ayrıntılı çizilir
+            region = {}
+            with st.expander("🔍 Bölgeye Yakınlaştır"):
+                for column, label in [('yillik_harcama', 'Yıllık Harcama (TL)'),
+                                      ('alisveris_sikligi', 'Alışveriş Sıklığı (yıllık)'),
+                                      ('musteri_suresi', 'Müşteri Süresi (yıl)')]:
+                    low, high = float(segment_data[column].min()), float(segment_data[column].max())
+                    selected = st.slider(label, low, high, (low, high), key=f"ds_zoom_{column}_{segment_n}")
+                    if selected != (low, high):
+                        region[column] = selected
+            segment_fig = create_segmentation_plot(segment_data, region=region, lod=segment_lod)
+            st.plotly_chart(segment_fig, use_container_width=True, key="chart_17")
+        
+        # Segment özeti ve açıklama
+        with st.expander("Segment Detayları"):
+            st.write("""
+            **Müşteri Segmentleri:** Segmentler standartlaştırılmış özellikler üzerinde mini-batch k-means ile
+            bulunur ve merkezlerine göre adlandırılır (dört segmentte):
+        
+            * **Yüksek Değer:** Yüksek harcama, yüksek alışveriş sıklığı ve uzun müşteri süresi
+            * **Orta Değer:** Orta seviye harcama, orta sıklık ve orta müşteri süresi
+            * **Düşük Değer:** Düşük harcama, düşük sıklık ve kısa müşteri süresi
+            * **Yeni Müşteri:** Düşük harcama, düşük sıklık ve çok kısa müşteri süresi
+            """)
+        
+            # Segment özeti tablosu
+            segment_summary = segment_data.groupby('segment').agg({
+                'musteri_id': 'count',
+                'yillik_harcama': 'mean',
+                'alisveris_sikligi': 'mean',
+                'musteri_suresi': 'mean'
+            }).reset_index()
+        
+            segment_summary.columns = ['Segment', 'Müşteri Sayısı', 'Ort. Yıllık Harcama (TL)', 
+                                    'Ort. Alışveriş Sıklığı (yıllık)', 'Ort. Müşteri Süresi (yıl)']
+        
+            st.dataframe(segment_summary.round(2), width="stretch")
+
+    segmentation_panel()
     # Regresyon Modeli
     st.markdown("""<div class="card">""", unsafe_allow_html=True)
     st.markdown("<h3>Regresyon Analizi</h3>", unsafe_allow_html=True)
@@ -1592,7 +1711,7 @@ with menu[3]:
     # Regresyon modeli ve görselleştirme
     with st.spinner("Regresyon modeli hazırlanıyor..."):
         X_reg, y_reg = generate_regression_data()
-        reg_model, reg_fig = create_regression_plot(X_reg, y_reg)
+        reg_model, reg_fig = create_regression_plot(X_reg, y_reg, backend=ds_backend)
         st.plotly_chart(reg_fig, use_container_width=True, key="chart_18")
     
     # Model performans detayları
@@ -1606,12 +1725,8 @@ with menu[3]:
         **Model Parametreleri:**
         """)
         
-        st.code("""
-        RandomForestRegressor(
-            n_estimators=100,  # Ağaç sayısı
-            random_state=42    # Sonuçların tekrarlanabilirliği için
-        )
-        """)
+        if ds_backend_info is not None:
+            st.code(ds_backend_info.regressor_code)
         
         # En önemli özellikler
         feature_importance = pd.DataFrame({
@@ -1633,9 +1748,38 @@ with menu[4]:
     """, unsafe_allow_html=True)
     st.markdown("""</div>""", unsafe_allow_html=True)
     
-    # HR verilerini oluştur
+    # HR verilerini oluştur; grafik ve metrikler tek geçişte oluşturulan toplam küpünden okunur (app/hr_cube.py)
     with st.spinner('İK verileri hazırlanıyor...'):
-        employee_data = generate_employee_data(n_employees=200)
+        employee_data, hr_cube = load_demo_cube(n_employees=200)
+    hr_data_key = ('demo', 200, 42)
+
+    # HRIS dışa aktarımı yüklenirse demo verisi yerine içe aktarılan çalışanlar kullanılır (app/hr_import.py)
+    with st.expander("📥 İK Verisi İçe Aktar (CSV / Parquet)"):
+        hr_upload = st.file_uploader("HRIS dışa aktarım dosyası", type=['csv', 'parquet'], key="hr_upload")
+        if hr_upload is not None and st.session_state.get('hr_upload_id') != hr_upload.file_id:
+            # Aynı oturumdaki yeni yüklemeler çalışan_id bazında artımlı işlenir
+            hr_store = st.session_state.setdefault('hr_store', EmployeeStore(path=None))
+            try:
+                with st.spinner('İK verisi içe aktarılıyor...'):
+                    hr_store.refresh(hr_upload, file_format='parquet' if hr_upload.name.endswith('.parquet') else 'csv')
+                st.session_state['hr_upload_id'] = hr_upload.file_id
+            except ValueError as e:
+                st.error(f"İçe aktarma hatası: {e}")
+        hr_store = st.session_state.get('hr_store')
+        if hr_store is not None and hr_store.version:
+            manifest = hr_store.manifest
+            st.caption(f"Sürüm {manifest['version']} ({manifest['mode']}): {manifest['rows']:,} çalışan, "
+                       f"{manifest['inserted']:,} yeni, {manifest['updated']:,} güncellenen, "
+                       f"{manifest['deleted']:,} silinen, {manifest['rejected']:,} reddedilen satır "
+                       f"({manifest.get('kept_previous', 0):,} çalışanın önceki kaydı korundu, "
+                       f"{manifest['seconds']:.2f} sn)")
+            if len(hr_store.errors):
+                st.dataframe(hr_store.errors, width="stretch")
+        else:
+            st.caption("Dosya yüklenmezse 200 çalışanlık demo verisi gösterilir.")
+    if hr_store is not None and hr_store.manifest['rows']:
+        employee_data, hr_cube = hr_store.employees.reset_index(), hr_store.cube
+        hr_data_key = None  # İçe aktarılan veride önbellek anahtarı veriden hesaplanır
     
     # İşten Ayrılma Analizi
     st.markdown("""<div class="card">""", unsafe_allow_html=True)
@@ -1647,7 +1791,7 @@ with menu[4]:
     """, unsafe_allow_html=True)
     
     # İşten ayrılma grafiği
-    fig_attrition = create_attrition_department_chart(employee_data)
+    fig_attrition = create_attrition_department_chart(hr_cube)
     st.plotly_chart(fig_attrition, use_container_width=True, key="chart_19")
     
     # Özet metrikler
@@ -1655,7 +1799,7 @@ with menu[4]:
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        total_attrition_rate = employee_data['işten_ayrılma'].mean() * 100
+        total_attrition_rate = hr_cube.mean('işten_ayrılma') * 100
         st.metric(
             label="Genel İşten Ayrılma Oranı", 
             value=f"{total_attrition_rate:.1f}%",
@@ -1664,8 +1808,9 @@ with menu[4]:
         )
         
     with col2:
-        high_risk_dept = employee_data.groupby('departman')['işten_ayrılma'].mean().idxmax()
-        high_risk_rate = employee_data[employee_data['departman'] == high_risk_dept]['işten_ayrılma'].mean() * 100
+        dept_attrition = hr_cube.rollup(['departman'], ['işten_ayrılma']).set_index('departman')['işten_ayrılma_ort']
+        high_risk_dept = dept_attrition.idxmax()
+        high_risk_rate = dept_attrition.max() * 100
         
         st.metric(
             label="En Riskli Departman", 
@@ -1674,7 +1819,7 @@ with menu[4]:
         )
         
     with col3:
-        avg_satisfaction = employee_data['tatmin_skoru'].mean()
+        avg_satisfaction = hr_cube.mean('tatmin_skoru')
         st.metric(
             label="Ortalama Çalışan Memnuniyeti", 
             value=f"{avg_satisfaction:.1f}/10",
@@ -1690,13 +1835,12 @@ with menu[4]:
     Bu grafik, departmanlar arasındaki maaş farklılıklarını ve aykırı değerleri gösterir.</p>
     """, unsafe_allow_html=True)
     
-    fig_salary = create_salary_distribution_chart(employee_data)
+    fig_salary = create_salary_distribution_chart(employee_data, cube=hr_cube)
     st.plotly_chart(fig_salary, use_container_width=True, key="chart_21")
     
     # Maaş özet istatistikleri
     st.subheader("Maaş Özet İstatistikleri")
-    salary_stats = employee_data.groupby('departman')['aylık_maaş'].agg(['mean', 'median', 'min', 'max']).reset_index()
-    salary_stats.columns = ['Departman', 'Ortalama', 'Medyan', 'Minimum', 'Maksimum']
+    salary_stats = hr_cube.salary_summary(employee_data)
     
     # Formatla (TL ekle ve yuvarla)
     for col in ['Ortalama', 'Medyan', 'Minimum', 'Maksimum']:
@@ -1713,26 +1857,27 @@ with menu[4]:
     Bu analiz, performans değerlendirme sisteminin etkinliğini ve potansiyel önyargıları değerlendirmenize olanak tanır.</p>
     """, unsafe_allow_html=True)
     
-    fig_performance = create_performance_distribution_chart(employee_data)
+    fig_performance = create_performance_distribution_chart(hr_cube)
     st.plotly_chart(fig_performance, use_container_width=True, key="chart_22")
     
-    # Performans ve maaş ilişkisi
+    # Performans ve maaş ilişkisi (departman × performans puanı başına ortalama maaş)
     st.subheader("Performans ve Maaş İlişkisi")
+    perf_salary = hr_cube.rollup(['departman', 'performans_grubu'], ['aylık_maaş', 'şirket_deneyimi_yıl'])
     fig_perf_salary = px.scatter(
-        employee_data,
-        x='performans_puanı',
-        y='aylık_maaş',
+        perf_salary,
+        x='performans_grubu',
+        y='aylık_maaş_ort',
         color='departman',
-        size='şirket_deneyimi_yıl',
-        hover_data=['pozisyon', 'cinsiyet', 'yaş'],
+        size='çalışan_sayısı',
+        hover_data=['şirket_deneyimi_yıl_ort', 'aylık_maaş_std'],
         opacity=0.7,
-        title='Performans Puanı ve Maaş İlişkisi'
+        title='Performans Puanı ve Ortalama Maaş İlişkisi'
     )
     
     fig_perf_salary.update_layout(
         height=500,
         xaxis_title='Performans Puanı',
-        yaxis_title='Aylık Maaş (TL)',
+        yaxis_title='Ortalama Aylık Maaş (TL)',
         plot_bgcolor='rgba(0,0,0,0)',
         paper_bgcolor='rgba(0,0,0,0)'
     )
@@ -1751,7 +1896,7 @@ with menu[4]:
         Bu grafik, yıllar içinde işe alınan çalışan sayılarını göstermektedir.</p>
         """, unsafe_allow_html=True)
         
-        fig_hiring = create_hiring_trends_chart(employee_data)
+        fig_hiring = create_hiring_trends_chart(hr_cube)
         st.plotly_chart(fig_hiring, use_container_width=True, key="chart_24")
         st.markdown("""</div>""", unsafe_allow_html=True)
     
@@ -1763,7 +1908,7 @@ with menu[4]:
         Bu analiz, cinsiyet dengesi açısından iyileştirme gerektiren alanları belirlemenize yardımcı olur.</p>
         """, unsafe_allow_html=True)
         
-        fig_demographics = create_department_demographics_chart(employee_data)
+        fig_demographics = create_department_demographics_chart(hr_cube)
         st.plotly_chart(fig_demographics, use_container_width=True, key="chart_25")
         st.markdown("""</div>""", unsafe_allow_html=True)
     
@@ -1775,7 +1920,7 @@ with menu[4]:
     Bu analiz, tatmin skorlarının işten ayrılma olasılığı üzerindeki etkisini gösterir.</p>
     """, unsafe_allow_html=True)
     
-    fig_satisfaction = create_satisfaction_vs_attrition_chart(employee_data)
+    fig_satisfaction = create_satisfaction_vs_attrition_chart(hr_cube)
     st.plotly_chart(fig_satisfaction, use_container_width=True, key="chart_26")
     
     st.markdown("""
@@ -1792,6 +1937,50 @@ with menu[4]:
     """, unsafe_allow_html=True)
     st.markdown("""</div>""", unsafe_allow_html=True)
     
+    # Kıdem Sağkalım Analizi
+    st.markdown("""<div class="card">""", unsafe_allow_html=True)
+    st.markdown("<h3>⏳ Kıdeme Göre Çalışan Tutma (Kaplan–Meier)</h3>", unsafe_allow_html=True)
+    st.markdown("""
+    <p>Ortalama ayrılma oranı, çalışanların ne kadar süre sonra ayrıldığını göstermez. Kaplan–Meier eğrileri,
+    henüz ayrılmamış çalışanları da (sansürlü gözlem) hesaba katarak her kıdem yılında şirkette kalma olasılığını
+    tahmin eder ve seçilen gruplar arasındaki tutma farklarını ortaya koyar.</p>
+    """, unsafe_allow_html=True)
+    
+    # Tabaka seçimi değiştiğinde yalnızca bu bölüm yeniden çalışır; eğriler seçim başına önbellekte tutulur
+    @getattr(st, 'fragment', lambda fn: fn)
+    def hr_survival_panel():
+        strata = st.multiselect("Gruplama", list(STRATA), default=['departman'], key="hr_survival_strata",
+                                help="Birden fazla seçim kombinasyonlara göre eğri üretir")
+        curves = cached_kaplan_meier(employee_data, strata, data_key=hr_data_key)
+        st.plotly_chart(create_tenure_survival_chart(curves), use_container_width=True, key="chart_hr_survival")
+        st.dataframe(curves.summary().round(1), width="stretch", hide_index=True)
+    
+    hr_survival_panel()
+    st.markdown("""</div>""", unsafe_allow_html=True)
+    
+    # Ücret Eşitliği Analizi
+    st.markdown("""<div class="card">""", unsafe_allow_html=True)
+    st.markdown("<h3>⚖️ Ücret Eşitliği Analizi</h3>", unsafe_allow_html=True)
+    st.markdown("""
+    <p>Ham ücret farkı, kadın ve erkek çalışanların deneyim, kıdem, performans ve eğitim dağılımlarındaki
+    farkları da içerir. Her grupta log(maaş) bu etkenler üzerine regresyonla açıklanır; cinsiyet katsayısı
+    diğer etkenler sabitken kalan (düzeltilmiş) ücret farkını verir. Kırmızı noktalar %95 düzeyinde anlamlı farklardır.</p>
+    """, unsafe_allow_html=True)
+    
+    # Tüm grupların regresyonu tek toplu çözümle hesaplanır ve veri sürümü başına önbellekte tutulur
+    @getattr(st, 'fragment', lambda fn: fn)
+    def hr_pay_equity_panel():
+        grouping = st.radio("Gruplama", list(GROUPINGS), horizontal=True, key="hr_pay_equity_grouping")
+        equity_gaps = cached_pay_equity(employee_data, GROUPINGS[grouping], data_key=hr_data_key).gap_table()
+        if equity_gaps.empty:
+            st.info(f"Raporlanabilir grup yok: her grupta en az {MIN_GROUP_SIZE} çalışan ve iki cinsiyet gerekir.")
+            return
+        st.plotly_chart(create_pay_equity_chart(equity_gaps), use_container_width=True, key="chart_hr_pay_equity")
+        st.dataframe(equity_gaps.round(2), width="stretch", hide_index=True)
+    
+    hr_pay_equity_panel()
+    st.markdown("""</div>""", unsafe_allow_html=True)
+    
     # İşten Ayrılma Nedenleri - En Alta Taşındı
     st.markdown("""<div class="card">""", unsafe_allow_html=True)
     st.markdown("<h3>📊 İşten Ayrılma Nedenleri Analizi</h3>", unsafe_allow_html=True)
@@ -1801,8 +1990,7 @@ with menu[4]:
     """, unsafe_allow_html=True)
     
     # İşten ayrılma nedenleri grafiği - Güzel renkler
-    reasons_data = employee_data[employee_data['işten_ayrılma']]['ayrılma_nedeni'].value_counts().reset_index()
-    reasons_data.columns = ['Ayrılma Nedeni', 'Çalışan Sayısı']
+    reasons_data = hr_cube.attrition_reasons()
     
     # Mor, pudra, somon renk paleti
     custom_colors = [
@@ -1874,8 +2062,7 @@ with menu[4]:
     """, unsafe_allow_html=True)
     
     # İşten ayrılma nedenleri grafiği - Güzel renkler
-    reasons_data = employee_data[employee_data['işten_ayrılma']]['ayrılma_nedeni'].value_counts().reset_index()
-    reasons_data.columns = ['Ayrılma Nedeni', 'Çalışan Sayısı']
+    reasons_data = hr_cube.attrition_reasons()
     
     # Mor, pudra, somon renk paleti
     custom_colors = [
@@ -1959,56 +2146,20 @@ with menu[5]:  # RFM Analizi sekmesi
         plt.style.use('seaborn-v0_8-darkgrid')
         sns.set_palette("husl")
         
-        # 1. VERİ SETİ OLUŞTURMA (Gerçekçi E-ticaret Verisi)
-        np.random.seed(42)
-        
-        # 1000 müşteri verisi oluştur
-        n_customers = 1000
-        customer_ids = [f'C{str(i).zfill(5)}' for i in range(1, n_customers + 1)]
+        # 1. VERİ SETİ: Churn ve Cohort sekmeleriyle ortak sipariş olayları ve özellik deposu
+        current_date = ANALYSIS_DATE
+        order_events, customer_features, feature_manifest = load_demo_features()
         
-        # Farklı müşteri davranış profilleri
-        data = []
-        current_date = datetime(2024, 10, 1)
-        
-        for cid in customer_ids:
-            # Müşteri tipi belirleme
-            customer_type = np.random.choice(['şampiyon', 'sadık', 'risk_altında', 'kayıp', 'yeni'], 
-                                             p=[0.15, 0.25, 0.20, 0.25, 0.15])
-            
-            if customer_type == 'şampiyon':
-                n_orders = np.random.randint(15, 40)
-                last_order_days = np.random.randint(1, 30)
-                avg_order_value = np.random.uniform(500, 2000)
-            elif customer_type == 'sadık':
-                n_orders = np.random.randint(8, 20)
-                last_order_days = np.random.randint(20, 60)
-                avg_order_value = np.random.uniform(300, 1000)
-            elif customer_type == 'risk_altında':
-                n_orders = np.random.randint(5, 15)
-                last_order_days = np.random.randint(90, 180)
-                avg_order_value = np.random.uniform(200, 800)
-            elif customer_type == 'kayıp':
-                n_orders = np.random.randint(2, 8)
-                last_order_days = np.random.randint(180, 365)
-                avg_order_value = np.random.uniform(100, 500)
-            else:  # yeni
-                n_orders = np.random.randint(1, 3)
-                last_order_days = np.random.randint(1, 45)
-                avg_order_value = np.random.uniform(150, 600)
-            
-            for _ in range(n_orders):
-                order_date = current_date - timedelta(days=np.random.randint(last_order_days, last_order_days + 200))
-                order_value = avg_order_value * np.random.uniform(0.7, 1.3)
-                
-                data.append({
-                    'MusteriID': cid,
-                    'SiparisTarihi': order_date,
-                    'SiparisUcreti': round(order_value, 2)
-                })
-        
-        df = pd.DataFrame(data)
+        df = order_events[['CustomerID', 'OrderDate', 'OrderValue']].rename(columns={
+            'CustomerID': 'MusteriID',
+            'OrderDate': 'SiparisTarihi',
+            'OrderValue': 'SiparisUcreti'
+        })
         
-    st.success(f"✓ Toplam {len(df)} sipariş, {df['MusteriID'].nunique()} benzersiz müşteri")
+    rfm_approx_distinct = st.checkbox("Yaklaşık tekil sayım (HyperLogLog)", value=False, key="rfm_hll_toggle",
+                                      help="Çok büyük olay tablolarında tam hash kümesi yerine sabit bellekli taslak kullanır")
+    unique_customers = distinct_count(df['MusteriID'], approximate=rfm_approx_distinct)
+    st.success(f"✓ Toplam {len(df)} sipariş, {unique_customers} benzersiz müşteri")
     st.success(f"✓ Tarih Aralığı: {df['SiparisTarihi'].min().date()} - {df['SiparisTarihi'].max().date()}")
     
     # Ham veri önizleme
@@ -2019,12 +2170,13 @@ with menu[5]:  # RFM Analizi sekmesi
         # 2. RFM METRİKLERİNİ HESAPLAMA
         analysis_date = current_date + timedelta(days=1)
         
-        rfm = df.groupby('MusteriID').agg({
-            'SiparisTarihi': lambda x: (analysis_date - x.max()).days,  # Recency
-            'SiparisUcreti': ['count', 'sum']  # Frequency ve Monetary
-        }).reset_index()
-        
-        rfm.columns = ['MusteriID', 'Yenilik', 'Siklik', 'Parasal']
+        # Recency, Frequency ve Monetary özellik deposundaki müşteri toplamlarından okunur
+        rfm = pd.DataFrame({
+            'MusteriID': customer_features['CustomerID'],
+            'Yenilik': (analysis_date - customer_features['LastOrderDate']).dt.days,  # Recency
+            'Siklik': customer_features['TotalOrders'],  # Frequency
+            'Parasal': customer_features['TotalSpent']  # Monetary
+        })
         
         # 3. RFM SKORLAMASI (1-5 arası)
         # Recency için ters sıralama (düşük recency = yüksek skor)
@@ -2297,56 +2449,26 @@ with menu[6]:
     st.markdown("### 🎯 Cohort Verisi Oluşturma")
     
     with st.spinner("📊 Cohort verisi oluşturuluyor..."):
-        # 1. VERİ SETİ OLUŞTURMA
-        np.random.seed(42)
-        
-        # 12 aylık cohort verisi oluştur
-        start_date = datetime(2024, 1, 1)
-        n_customers_per_cohort = np.random.randint(150, 300, 12)  # Her ay için farklı müşteri sayısı
-        
-        data = []
+        # 1. VERİ SETİ: RFM ve Churn sekmeleriyle ortak sipariş olayları ve özellik deposu
+        order_events, customer_features, feature_manifest = load_demo_features()
         
-        for cohort_month in range(12):
-            cohort_date = start_date + timedelta(days=cohort_month * 30)
-            n_customers = n_customers_per_cohort[cohort_month]
-            
-            # Her cohort için müşteriler
-            for customer_idx in range(n_customers):
-                customer_id = f'C{cohort_month:02d}{customer_idx:04d}'
-                
-                # İlk alışveriş (cohort ayı)
-                first_purchase = cohort_date + timedelta(days=np.random.randint(0, 30))
-                data.append({
-                    'CustomerID': customer_id,
-                    'OrderDate': first_purchase,
-                    'OrderValue': np.random.uniform(50, 500),
-                    'CohortMonth': cohort_date
-                })
-                
-                # Retention simülasyonu (azalan olasılıkla tekrar alışveriş)
-                retention_probability = 0.7  # İlk ay %70 retention
-                
-                for month in range(1, 12):
-                    if np.random.random() < retention_probability:
-                        # Bu müşteri bu ayda da alışveriş yaptı
-                        purchase_date = cohort_date + timedelta(days=month * 30 + np.random.randint(0, 30))
-                        
-                        # Sadece analiz tarihinden önce olan siparişleri ekle
-                        if purchase_date <= datetime(2024, 10, 1):
-                            data.append({
-                                'CustomerID': customer_id,
-                                'OrderDate': purchase_date,
-                                'OrderValue': np.random.uniform(50, 500),
-                                'CohortMonth': cohort_date
-                            })
-                    
-                    # Her ay retention olasılığı azalır
-                    retention_probability *= 0.85
-        
-        df_cohort = pd.DataFrame(data)
+        # Cohort ayı, özellik deposundaki ilk sipariş tarihidir
+        df_cohort = order_events[['CustomerID', 'OrderDate', 'OrderValue']].merge(
+            customer_features[['CustomerID', 'FirstOrderDate']], on='CustomerID', how='left'
+        ).rename(columns={'FirstOrderDate': 'CohortMonth'})
+    
+    # Tekil müşteri sayımı modu (tam / HyperLogLog)
+    col1, col2 = st.columns(2)
+    with col1:
+        cohort_approx_distinct = st.checkbox("Yaklaşık tekil sayım (HyperLogLog)", value=False, key="cohort_hll_toggle",
+                                             help="Cohort hücreleri için birleştirilebilir HyperLogLog taslakları kullanır")
+    with col2:
+        hll_precision = st.slider("HyperLogLog hassasiyeti (p)", min_value=8, max_value=16, value=12,
+                                  key="cohort_hll_precision", disabled=not cohort_approx_distinct,
+                                  help="Hücre başına 2^p register; göreli hata ≈ 1.04/√(2^p)")
     
     st.success(f"✓ Toplam {len(df_cohort)} sipariş")
-    st.success(f"✓ {df_cohort['CustomerID'].nunique()} benzersiz müşteri")
+    st.success(f"✓ {distinct_count(df_cohort['CustomerID'], cohort_approx_distinct, hll_precision)} benzersiz müşteri")
     st.success(f"✓ Tarih Aralığı: {df_cohort['OrderDate'].min().date()} - {df_cohort['OrderDate'].max().date()}")
     
     # Ham veri önizleme
@@ -2371,7 +2493,13 @@ with menu[6]:
         
         # 3. COHORT ANALİZİ - MÜŞTERİ SAYISI
         # Her cohort ve index için benzersiz müşteri sayısı
-        cohort_data = df_cohort.groupby(['CohortMonth', 'CohortIndex'])['CustomerID'].nunique().reset_index()
+        if cohort_approx_distinct:
+            # Bölüm bazlı taslaklar oluşturulup hücre bazında birleştirilir
+            cohort_sketches = CellSketches.from_frame(df_cohort, ['CohortMonth', 'CohortIndex'], 'CustomerID',
+                                                      precision=hll_precision)
+            cohort_data = cohort_sketches.counts(name='CustomerCount').reset_index()
+        else:
+            cohort_data = df_cohort.groupby(['CohortMonth', 'CohortIndex'])['CustomerID'].nunique().reset_index()
         cohort_data.columns = ['CohortMonth', 'CohortIndex', 'CustomerCount']
         
         # Pivot tablo oluştur
@@ -2684,75 +2812,17 @@ with menu[7]:
     st.markdown("### 🎯 Churn Verisi Oluşturma")
     
     with st.spinner("🤖 Churn prediction verisi oluşturuluyor..."):
-        # 1. VERİ SETİ OLUŞTURMA
-        np.random.seed(42)
-        
+        # 1. VERİ SETİ OLUŞTURMA (sütun bazında vektörel üretim)
         n_customers = 2000
         current_date = datetime(2024, 10, 1)
         
-        data = []
-        
-        for i in range(n_customers):
-            customer_id = f'C{str(i).zfill(5)}'
-            
-            # Müşteri profili belirleme
-            if np.random.random() < 0.30:  # %30 churn olmuş müşteri
-                is_churned = 1
-                days_since_last = np.random.randint(90, 365)
-                total_orders = np.random.randint(1, 8)
-                avg_order_value = np.random.uniform(50, 300)
-                total_spent = total_orders * avg_order_value
-                customer_lifetime_days = np.random.randint(60, 400)
-                complaints = np.random.randint(0, 4)
-                support_tickets = np.random.randint(0, 5)
-                discount_usage = np.random.randint(0, 3)
-                email_open_rate = np.random.uniform(0, 0.4)
-                last_nps_score = np.random.randint(1, 6)
-            else:  # %70 aktif müşteri
-                is_churned = 0
-                days_since_last = np.random.randint(1, 89)
-                total_orders = np.random.randint(3, 50)
-                avg_order_value = np.random.uniform(100, 1000)
-                total_spent = total_orders * avg_order_value
-                customer_lifetime_days = np.random.randint(90, 800)
-                complaints = np.random.randint(0, 2)
-                support_tickets = np.random.randint(0, 3)
-                discount_usage = np.random.randint(1, 8)
-                email_open_rate = np.random.uniform(0.3, 0.9)
-                last_nps_score = np.random.randint(6, 11)
-            
-            # Türkiye'ye özgü kategoriler
-            product_categories = ['Elektronik', 'Giyim', 'Ev & Yaşam', 'Kitap', 'Spor', 'Kozmetik']
-            preferred_category = np.random.choice(product_categories)
-            
-            payment_methods = ['Kredi Kartı', 'Havale', 'Kapıda Ödeme', 'Mobil Ödeme']
-            preferred_payment = np.random.choice(payment_methods, p=[0.5, 0.2, 0.2, 0.1])
-            
-            cities = ['İstanbul', 'Ankara', 'İzmir', 'Bursa', 'Antalya', 'Adana', 'Konya']
-            city = np.random.choice(cities, p=[0.35, 0.15, 0.12, 0.1, 0.08, 0.1, 0.1])
-            
-            data.append({
-                'CustomerID': customer_id,
-                'DaysSinceLastOrder': days_since_last,
-                'TotalOrders': total_orders,
-                'AvgOrderValue': round(avg_order_value, 2),
-                'TotalSpent': round(total_spent, 2),
-                'CustomerLifetimeDays': customer_lifetime_days,
-                'OrderFrequency': round(total_orders / (customer_lifetime_days / 30), 2),
-                'Complaints': complaints,
-                'SupportTickets': support_tickets,
-                'DiscountUsage': discount_usage,
-                'EmailOpenRate': round(email_open_rate, 2),
-                'LastNPSScore': last_nps_score,
-                'PreferredCategory': preferred_category,
-                'PreferredPayment': preferred_payment,
-                'City': city,
-                'IsChurned': is_churned
-            })
-        
-        df_churn = pd.DataFrame(data)
+        # Özellikler RFM ve Cohort sekmeleriyle ortak sipariş olaylarından türetilir (app/feature_store.py)
+        order_events, customer_features, feature_manifest = load_demo_features(n_customers=n_customers)
+        df_churn = customer_features.drop(columns=['FirstOrderDate', 'LastOrderDate'])
     
     st.success(f"✓ {len(df_churn)} müşteri verisi oluşturuldu")
+    st.caption(f"Özellik deposu sürüm {feature_manifest['version']} · {len(order_events):,} sipariş olayı · "
+               f"son yenileme: {feature_manifest['mode']} ({feature_manifest['new_events']:,} yeni olay)")
     churn_rate = df_churn['IsChurned'].mean() * 100
     st.success(f"✓ Churn Oranı: {churn_rate:.1f}%")
     
@@ -2773,44 +2843,65 @@ with menu[7]:
     
     with st.spinner("🤖 Machine Learning modeli eğitiliyor..."):
         # 2. MAKİNE ÖĞRENMESİ MODELİ
-        from sklearn.model_selection import train_test_split
-        from sklearn.ensemble import RandomForestClassifier
-        from sklearn.metrics import classification_report, confusion_matrix, roc_auc_score, roc_curve
-        from sklearn.preprocessing import StandardScaler
-        
-        # Kategorik değişkenleri encode et
-        df_encoded = df_churn.copy()
-        df_encoded['PreferredCategory_Encoded'] = pd.Categorical(df_churn['PreferredCategory']).codes
-        df_encoded['PreferredPayment_Encoded'] = pd.Categorical(df_churn['PreferredPayment']).codes
-        df_encoded['City_Encoded'] = pd.Categorical(df_churn['City']).codes
-        
-        # Feature seçimi
-        numeric_features = ['DaysSinceLastOrder', 'TotalOrders', 'AvgOrderValue', 'TotalSpent',
-                           'CustomerLifetimeDays', 'OrderFrequency', 'Complaints', 'SupportTickets',
-                           'DiscountUsage', 'EmailOpenRate', 'LastNPSScore']
-        
-        features = numeric_features + ['PreferredCategory_Encoded', 'PreferredPayment_Encoded', 'City_Encoded']
-        X = df_encoded[features]
-        y = df_encoded['IsChurned']
-        
-        # Train-test split
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.25, random_state=42, stratify=y)
-        
-        # Scaling
-        scaler = StandardScaler()
-        X_train_scaled = scaler.fit_transform(X_train)
-        X_test_scaled = scaler.transform(X_test)
-        
-        # Random Forest Model
-        model = RandomForestClassifier(n_estimators=100, max_depth=10, random_state=42, class_weight='balanced')
-        model.fit(X_train_scaled, y_train)
-        
-        # Tahminler
-        y_pred = model.predict(X_test_scaled)
-        y_pred_proba = model.predict_proba(X_test_scaled)[:, 1]
-        
-        # Model performansı
-        roc_auc = roc_auc_score(y_test, y_pred_proba)
+        # Kategorik değişkenleri sabit kategori listeleriyle encode et ve feature seçimi
+        features = CHURN_FEATURES
+        X = encode_churn_features(df_churn)
+        y = df_churn['IsChurned']
+        
+        if SKLEARN_AVAILABLE:
+            # Train-test split
+            X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.25, random_state=42, stratify=y)
+            
+            # Scaling + Random Forest Model (hiperparametre aramasından uygulanan parametreler varsa onlarla)
+            churn_model_params = st.session_state.get('churn_model_params', {'n_estimators': 100, 'max_depth': 10})
+            scaler, model = fit_churn_model(X_train, y_train, random_state=42, **churn_model_params)
+            X_test_scaled = scaler.transform(X_test)
+            
+            # Tahminler
+            y_pred = model.predict(X_test_scaled)
+            y_pred_proba = model.predict_proba(X_test_scaled)[:, 1]
+            
+            # Tüm müşteriler için churn olasılığı
+            churn_proba = model.predict_proba(scaler.transform(X))[:, 1]
+            
+            # Açıklamalar ve what-if simülasyonu için derlenmiş orman
+            scoring_forest = compile_forest(model, scaler, features)
+            
+            # Skorlama gruplarında girdi kayması için eğitim dağılımı referansı
+            drift_reference = DriftReference.fit(X_train)
+            
+            # Toplu skorlama (app/churn_scoring.py) ve sklearn'siz ortamlar için modeli sakla. Sürüm kimliği
+            # model içeriğinden türetilir; dosyalar yalnızca model değiştiğinde yazılır, böylece her yeniden
+            # çalıştırmada dışa aktarılmış ONNX modeli eskimez (servis sürümü eşleşmeyen ONNX'i kullanmaz)
+            scoring_forest.model_version = churn_model_version(scoring_forest.version, churn_model_params)
+            try:
+                model_files = (CHURN_MODEL_PATH, COMPILED_CHURN_MODEL_PATH, DRIFT_REFERENCE_PATH)
+                if (not all(os.path.exists(path) for path in model_files)
+                        or saved_model_version() != scoring_forest.model_version):
+                    save_churn_model(scaler, model, version=scoring_forest.model_version)
+                    scoring_forest.save(COMPILED_CHURN_MODEL_PATH)
+                    drift_reference.save(DRIFT_REFERENCE_PATH)
+            except (OSError, ValueError, KeyError) as e:
+                st.warning(f"Churn modeli kaydedilemedi: {e}")
+        else:
+            # sklearn yoksa önceden derlenmiş orman (yalnızca NumPy) ile skorlama
+            if not os.path.exists(COMPILED_CHURN_MODEL_PATH):
+                st.warning("⚠️ Derlenmiş churn modeli bulunamadı - Churn Prediction için sklearn gerekli")
+                st.stop()
+            model = CompiledForest.load(COMPILED_CHURN_MODEL_PATH)
+            scoring_forest = model
+            drift_reference = (DriftReference.load(DRIFT_REFERENCE_PATH) if os.path.exists(DRIFT_REFERENCE_PATH)
+                               else DriftReference.fit(X))
+            churn_proba = model.predict_proba(X.to_numpy())[:, 1]
+            
+            # Ayrı test seti olmadığından tüm müşteriler üzerinde değerlendirilir
+            y_test = y
+            y_pred_proba = churn_proba
+            y_pred = (churn_proba >= 0.5).astype(int)
+        
+        # Model performansı: tüm eşiklerdeki metrikler model sürümü başına bir kez hesaplanır
+        churn_sweep = cached_threshold_sweep(scoring_forest.version, y_test, y_pred_proba)
+        roc_auc = churn_sweep.roc_auc
         accuracy = (y_pred == y_test).mean()
         
         # Feature importance
@@ -2820,13 +2911,10 @@ with menu[7]:
         }).sort_values('Importance', ascending=False)
         
         # Tüm müşteriler için risk skoru
-        X_all_scaled = scaler.transform(df_encoded[features])
-        df_churn['ChurnRiskScore'] = model.predict_proba(X_all_scaled)[:, 1] * 100
+        df_churn['ChurnRiskScore'] = churn_proba * 100
         
         # Risk segmentleri
-        df_churn['RiskSegment'] = pd.cut(df_churn['ChurnRiskScore'], 
-                                        bins=[0, 25, 50, 75, 100],
-                                        labels=['Düşük Risk', 'Orta Risk', 'Yüksek Risk', 'Kritik Risk'])
+        df_churn['RiskSegment'] = risk_segments(df_churn['ChurnRiskScore'])
     
     st.success("✓ Model eğitimi tamamlandı")
     
@@ -2841,6 +2929,69 @@ with menu[7]:
     with col3:
         st.metric("En Önemli Faktör", feature_importance.iloc[0]['Feature'][:15] + "...")
     
+    # Hiperparametre araması (stratified k-fold CV, successive halving)
+    if SKLEARN_AVAILABLE:
+        with st.expander("🔧 Hiperparametre Araması (Stratified K-Fold CV)"):
+            st.write("""
+            Parametre ızgarası stratified k-fold çapraz doğrulama ile paralel süreçlerde değerlendirilir.
+            Fold sonuçları veri ve parametrelere göre önbelleğe alınır; tekrarlanan aramalar yalnızca eksik fold'ları hesaplar.
+            Successive halving ile zayıf adaylar az sayıda fold sonrasında elenir.
+            """)
+            st.code(str(DEFAULT_PARAM_GRID))
+        
+            col1, col2 = st.columns(2)
+            with col1:
+                tuning_folds = st.slider("Fold sayısı", min_value=3, max_value=10, value=5, key="churn_tuning_folds")
+            with col2:
+                tuning_budget = st.slider("Zaman bütçesi (sn)", min_value=10, max_value=600, value=120, step=10,
+                                          key="churn_tuning_budget")
+        
+            if st.button("Aramayı Başlat", key="churn_tuning_run"):
+                with st.spinner("🔧 Hiperparametre araması yapılıyor..."):
+                    st.session_state['churn_tuning_result'] = tune_churn_model(
+                        X, y, n_splits=tuning_folds, time_budget=tuning_budget)
+        
+            tuning_result = st.session_state.get('churn_tuning_result')
+            if tuning_result is not None and tuning_result['best_params'] is None:
+                st.warning("⏱️ Zaman bütçesi hiçbir fold tamamlanmadan doldu; bütçeyi artırıp tekrar deneyin.")
+            elif tuning_result is not None:
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("CV ROC-AUC (en iyi)", f"{tuning_result['best_score']:.3f}")
+                with col2:
+                    st.metric("Hesaplanan Fold", tuning_result['evaluated_folds'])
+                with col3:
+                    st.metric("Önbellekten Gelen Fold", tuning_result['cached_folds'])
+                st.write(f"**En iyi parametreler:** {tuning_result['best_params']}")
+                st.dataframe(tuning_result['results'].round(4), width='stretch')
+                # En iyi parametreler churn modelini yeniden eğitir; skorlar, açıklamalar ve kayıtlı model güncellenir
+                if churn_model_params == tuning_result['best_params']:
+                    st.caption("✓ En iyi parametreler churn modelinde kullanılıyor.")
+                elif st.button("En İyi Parametreleri Modele Uygula", key="churn_tuning_apply"):
+                    st.session_state['churn_model_params'] = tuning_result['best_params']
+                    st.rerun()
+    
+    # GİRDİ KAYMASI (DRIFT) İZLEME
+    st.markdown("### 📡 Girdi Kayması İzleme (PSI / KS)")
+    st.markdown("<p style='color: #6B7280;'>Skorlama grubundaki özellik dağılımları eğitim verisinden saklanan kutu oranlarıyla karşılaştırılır (PSI < 0.1 stabil, 0.1-0.25 orta, > 0.25 belirgin kayma).</p>", unsafe_allow_html=True)
+    
+    drift_batch = X_test if SKLEARN_AVAILABLE else X
+    simulate_drift = st.checkbox("Kaymış skorlama grubu simüle et", value=False, key="churn_drift_simulate",
+                                 help="Son siparişten geçen süreyi %50 ve şikayetleri 1 artırarak kaymayı gösterir")
+    if simulate_drift:
+        drift_batch = drift_batch.assign(DaysSinceLastOrder=drift_batch['DaysSinceLastOrder'] * 1.5,
+                                         Complaints=drift_batch['Complaints'] + 1)
+    drift_report = DriftMonitor(drift_reference).update(drift_batch)
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("En Yüksek PSI", f"{drift_report['PSI'].max():.3f}")
+    with col2:
+        st.metric("En Yüksek KS", f"{drift_report['KS'].max():.3f}")
+    with col3:
+        st.metric("Kayma Uyarısı Olan Özellik", int((drift_report['Durum'] != 'Stabil').sum()))
+    st.dataframe(drift_report.sort_values('PSI', ascending=False).round(4), width='stretch')
+    
     # 3. GÖRSELLEŞTİRMELER
     st.markdown("### 📈 Churn Prediction Dashboard")
     
@@ -2883,7 +3034,7 @@ with menu[7]:
     
     # 4. Confusion Matrix
     ax4 = plt.subplot(3, 3, 4)
-    cm = confusion_matrix(y_test, y_pred)
+    cm = churn_sweep.confusion_matrix(0.5)
     sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', ax=ax4, 
                 xticklabels=['Aktif', 'Churn'], yticklabels=['Aktif', 'Churn'])
     ax4.set_ylabel('Gerçek', fontsize=10)
@@ -2892,8 +3043,7 @@ with menu[7]:
     
     # 5. ROC Curve
     ax5 = plt.subplot(3, 3, 5)
-    fpr, tpr, _ = roc_curve(y_test, y_pred_proba)
-    ax5.plot(fpr, tpr, color='darkorange', lw=2, label=f'ROC curve (AUC = {roc_auc:.2f})')
+    ax5.plot(churn_sweep.fpr, churn_sweep.tpr, color='darkorange', lw=2, label=f'ROC curve (AUC = {roc_auc:.2f})')
     ax5.plot([0, 1], [0, 1], color='navy', lw=2, linestyle='--', label='Random')
     ax5.set_xlim([0.0, 1.0])
     ax5.set_ylim([0.0, 1.05])
@@ -2960,10 +3110,58 @@ with menu[7]:
     # Streamlit'te grafikleri göster
     st.pyplot(fig, use_container_width=True)
     
+    # EŞİK VE MALİYET ANALİZİ
+    st.markdown("### 🎚️ Eşik ve Maliyet Analizi")
+    st.markdown("<p style='color: #6B7280;'>Eşik değiştikçe confusion matrix önceden hesaplanan eşik taramasından okunur; model yeniden çalıştırılmaz.</p>", unsafe_allow_html=True)
+    
+    # Kaydırıcı değişikliklerinde yalnızca bu bölüm yeniden çalışır
+    @getattr(st, 'fragment', lambda fn: fn)
+    def churn_threshold_panel():
+        col1, col2 = st.columns(2)
+        with col1:
+            cost_fp = st.number_input("Yanlış alarm maliyeti (TL / müşteri)", min_value=0, value=50, step=10,
+                                      key="churn_cost_fp", help="Churn etmeyecek müşteriye yapılan kampanya harcaması")
+        with col2:
+            cost_fn = st.number_input("Kaçırılan churn maliyeti (TL / müşteri)", min_value=0, value=500, step=50,
+                                      key="churn_cost_fn", help="Fark edilmeden kaybedilen müşterinin değeri")
+        
+        best_threshold, best_cost = churn_sweep.optimal_threshold(cost_fp, cost_fn)
+        threshold = st.slider("Karar eşiği", 0.0, 1.0, 0.5, step=0.01, key="churn_threshold")
+        cm_threshold = churn_sweep.confusion_matrix(threshold)
+        (tn, fp), (fn, tp) = cm_threshold
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Precision", f"{tp / max(tp + fp, 1):.3f}")
+        with col2:
+            st.metric("Recall", f"{tp / max(tp + fn, 1):.3f}")
+        with col3:
+            st.metric("Toplam Maliyet", f"{fp * cost_fp + fn * cost_fn:,.0f} TL")
+        with col4:
+            st.metric("Maliyet Optimum Eşik", f"{best_threshold:.2f}" if np.isfinite(best_threshold) else "Hiçbiri",
+                      help=f"Toplam maliyet {best_cost:,.0f} TL" + ("" if np.isfinite(best_threshold)
+                                                                    else " (hiçbir müşteriyi işaretlememek en ucuz)"))
+        
+        col1, col2 = st.columns([1, 2])
+        with col1:
+            st.dataframe(pd.DataFrame(cm_threshold, index=['Gerçek: Aktif', 'Gerçek: Churn'],
+                                      columns=['Tahmin: Aktif', 'Tahmin: Churn']), width='stretch')
+        with col2:
+            threshold_curve = churn_sweep.curve().iloc[1:]
+            threshold_curve['Maliyet'] = churn_sweep.costs(cost_fp, cost_fn)[1:]
+            fig_cost = px.line(threshold_curve, x='Threshold', y='Maliyet', title='Eşiğe Göre Toplam Maliyet')
+            fig_cost.add_vline(x=threshold, line_dash='dash', line_color='red')
+            fig_cost.update_layout(height=300)
+            st.plotly_chart(fig_cost, use_container_width=True, key="chart_churn_threshold_cost")
+    
+    churn_threshold_panel()
+    
     # 4. YÜKSEK RİSKLİ MÜŞTERİLER
     st.markdown("### ⚠️ Yüksek Riskli Müşteriler (Top 20)")
     
-    high_risk = df_churn[df_churn['ChurnRiskScore'] >= 75].sort_values('ChurnRiskScore', ascending=False).head(20)
+    # Kritik risk: RiskSegment'in son bandı (75, 100]; tüm bölümler aynı maskeyi kullanır
+    critical_mask = (df_churn['RiskSegment'] == RISK_LABELS[-1]).to_numpy()
+    high_risk = df_churn[critical_mask].sort_values('ChurnRiskScore', ascending=False).head(20)
     
     if len(high_risk) > 0:
         st.dataframe(high_risk[['CustomerID', 'ChurnRiskScore', 'DaysSinceLastOrder', 'TotalOrders', 
@@ -2973,6 +3171,78 @@ with menu[7]:
     else:
         st.success("✅ Kritik risk seviyesinde müşteri bulunmuyor.")
     
+    # MÜŞTERİ BAZINDA RİSK NEDENLERİ (derlenmiş orman üzerinde ağaç yolu katkıları)
+    st.markdown("### 🧭 Müşteri Bazında Risk Nedenleri")
+    
+    if critical_mask.any():
+        with st.spinner("🧭 Risk nedenleri hesaplanıyor..."):
+            explanation = explain_customers(scoring_forest, X.to_numpy()[critical_mask])
+        reasons = explanation['reasons']
+        reasons.insert(0, 'CustomerID', df_churn.loc[critical_mask, 'CustomerID'].to_numpy())
+        reasons.insert(1, 'ChurnRiskScore', df_churn.loc[critical_mask, 'ChurnRiskScore'].to_numpy())
+        
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            st.dataframe(reasons.sort_values('ChurnRiskScore', ascending=False).head(20).round(2), width='stretch')
+        with col2:
+            # Kritik segmentin tamamında en sık görülen birincil nedenler
+            top_reasons = reasons['Reason1'].value_counts().reset_index()
+            top_reasons.columns = ['Neden', 'Müşteri Sayısı']
+            fig_reason_codes = px.bar(top_reasons, x='Müşteri Sayısı', y='Neden', orientation='h',
+                                      title='Kritik Segmentte Birincil Risk Nedenleri')
+            fig_reason_codes.update_layout(yaxis={'categoryorder': 'total ascending'}, height=400)
+            st.plotly_chart(fig_reason_codes, use_container_width=True, key="chart_churn_reasons")
+        st.caption(f"Katkılar olasılık puanı cinsindendir; temel risk {explanation['bias'] * 100:.1f} puan. "
+                   f"{int(critical_mask.sum())} kritik riskli müşteri açıklandı.")
+    else:
+        st.info("Açıklanacak kritik riskli müşteri yok")
+    
+    # WHAT-IF SİMÜLASYONU
+    st.markdown("### 🔮 What-If Simülasyonu")
+    st.markdown("<p style='color: #6B7280;'>Seçilen segmentteki müşteriler için senaryo uygulanır; yalnızca özellikleri değişen müşteriler yeniden skorlanır.</p>", unsafe_allow_html=True)
+    
+    # Simülatör oturumda saklanır; model skorları değişmedikçe yeniden kurulmaz
+    whatif_scores = df_churn['ChurnRiskScore'].to_numpy()
+    simulator = st.session_state.get('churn_whatif')
+    if simulator is None or not np.array_equal(simulator.base_scores, whatif_scores):
+        simulator = WhatIfSimulator(lambda values: scoring_forest.predict_proba(values)[:, 1] * 100,
+                                    X.to_numpy(), base_scores=whatif_scores)
+        st.session_state['churn_whatif'] = simulator
+    
+    # Kaydırıcı değişikliklerinde yalnızca bu bölüm yeniden çalışır (model yeniden eğitilmez)
+    @getattr(st, 'fragment', lambda fn: fn)
+    def churn_whatif_panel():
+        simulator = st.session_state['churn_whatif']
+        target_segments = st.multiselect("Senaryonun uygulanacağı segmentler", RISK_LABELS,
+                                         default=RISK_LABELS[2:], key="churn_whatif_segments")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            complaint_cut = st.slider("Şikayet azaltma", 0, 3, 0, key="churn_whatif_complaints")
+        with col2:
+            ticket_cut = st.slider("Destek talebi azaltma", 0, 3, 0, key="churn_whatif_tickets")
+        with col3:
+            email_lift = st.slider("Email açma artışı (puan)", 0, 30, 0, step=5, key="churn_whatif_email")
+        with col4:
+            nps_lift = st.slider("NPS artışı", 0, 4, 0, key="churn_whatif_nps")
+        
+        mask = np.isin(simulator.base_codes, [RISK_LABELS.index(label) for label in target_segments])
+        result = simulator.apply({
+            'Complaints': -complaint_cut,
+            'SupportTickets': -ticket_cut,
+            'EmailOpenRate': email_lift / 100,
+            'LastNPSScore': nps_lift,
+        }, mask=mask)
+        
+        col1, col2, col3, col4 = st.columns(4)
+        for column, label in zip((col1, col2, col3, col4), RISK_LABELS):
+            with column:
+                st.metric(f"{label} (Projeksiyon)", result['counts'][label],
+                          delta=result['delta'][label], delta_color="normal" if label == RISK_LABELS[0] else "inverse")
+        st.caption(f"{result['rescored']} müşterinin özellikleri değişti, {result['predicted']} müşteri yeniden skorlandı")
+    
+    churn_whatif_panel()
+    
     # 5. STRATEJİK ÖNERİLER
     st.markdown("### 💡 Risk Segmentine Göre Aksiyon Planı")
     
@@ -3098,7 +3368,7 @@ with menu[7]:
     with col3:
         st.metric("ROC-AUC Score", f"{roc_auc:.3f}")
     with col4:
-        high_risk_count = len(df_churn[df_churn['ChurnRiskScore'] >= 75])
+        high_risk_count = int(critical_mask.sum())
         st.metric("Kritik Risk Müşteri", high_risk_count)
     
     st.markdown("""</div>""", unsafe_allow_html=True)
@@ -0,0 +1,354 @@
+"""
+Mini-batch k-means ile müşteri segmentasyonu.
+Özellikler (yıllık harcama, alışveriş sıklığı, müşteri süresi) akan ortalama /
+varyans birikimleriyle standartlaştırılır; kümeleme sklearn MiniBatchKMeans ya
+da NumPy mini-batch k-means (app/numpy_models.py) ile seçili model arka ucunda
+yapılır. Küme sayısı örneklem üzerinde silhouette skoruyla seçilir. Müşteri
+tablosu parça parça işlenebildiğinden bellek, müşteri sayısından bağımsız olarak
+parça boyutuyla sınırlıdır; yeni müşteriler tek matris çarpımıyla en yakın
+merkeze atanır. Eğitilen merkezler bellekte ve `app/models/customer_segments.npz`
+dosyasında saklanır.
+
+Kullanım:
+    python -m app.segmentation benchmark --customers 10000000
+"""
+
+import argparse
+import hashlib
+import os
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from app.churn import MODEL_DIR
+from app.datascience import SEGMENT_FEATURES, customer_features, get_backend
+from app.numpy_models import nearest_centroid
+
+SEGMENT_MODEL_PATH = os.path.join(MODEL_DIR, 'customer_segments.npz')
+K_CANDIDATES = range(2, 9)
+SELECTION_SAMPLE_SIZE = 20_000  # k seçiminde kümelenen örneklem
+SILHOUETTE_SAMPLE_SIZE = 2000  # silhouette için ikili uzaklık matrisi bu boyutla sınırlı
+STREAM_BATCH_SIZE = 8192  # akışta parça başına bir mini-batch güncellemesi
+CHUNK_SIZE = 500_000
+MEMORY_CACHE_SIZE = 8
+
+_segmenter_cache = {}
+
+
+class StreamingStandardizer:
+    """Parça parça beslenen veriden sütun ortalaması ve varyansı (Chan birleştirmesi)."""
+
+    def __init__(self, n_features):
+        self.count = 0
+        self.mean = np.zeros(n_features)
+        self.m2 = np.zeros(n_features)
+
+    def partial_fit(self, X):
+        n = len(X)
+        if n == 0:
+            return self
+        batch_mean = X.mean(axis=0)
+        batch_m2 = ((X - batch_mean) ** 2).sum(axis=0)
+        total = self.count + n
+        delta = batch_mean - self.mean
+        self.mean = self.mean + delta * n / total
+        self.m2 = self.m2 + batch_m2 + delta ** 2 * self.count * n / total
+        self.count = total
+        return self
+
+    @property
+    def scale(self):
+        std = np.sqrt(self.m2 / max(self.count, 1))
+        return np.where(std > 0, std, 1.0)
+
+    def transform(self, X):
+        return (X - self.mean) / self.scale
+
+
+def silhouette_score(X, labels, sample_size=SILHOUETTE_SAMPLE_SIZE, seed=0):
+    """
+    Örneklenmiş ortalama silhouette skoru.
+
+    a: noktanın kendi kümesine ortalama uzaklığı, b: en yakın diğer kümeye ortalama
+    uzaklığı, s = (b - a) / max(a, b). Küme başına uzaklık toplamları tek matris
+    çarpımıyla (uzaklık matrisi × küme göstergeleri) bulunur.
+    """
+    rng = np.random.default_rng(seed)
+    if len(X) > sample_size:
+        index = rng.choice(len(X), size=sample_size, replace=False)
+        X, labels = X[index], labels[index]
+    labels = np.unique(labels, return_inverse=True)[1]
+    k = labels.max() + 1
+    if k < 2:
+        return 0.0
+    squared = (X ** 2).sum(axis=1)
+    distances = np.sqrt(np.maximum(squared[:, None] + squared[None, :] - 2 * X @ X.T, 0))
+    sums = distances @ (labels[:, None] == np.arange(k)).astype(np.float64)
+    sizes = np.bincount(labels, minlength=k)
+    own = labels[:, None] == np.arange(k)
+    means = sums / np.maximum(sizes - own, 1)
+    a = means[np.arange(len(X)), labels]
+    b = np.where(own, np.inf, means).min(axis=1)
+    scores = np.where(sizes[labels] > 1, (b - a) / np.maximum(np.maximum(a, b), 1e-12), 0.0)
+    return float(scores.mean())
+
+
+def segment_names(centroids):
+    """
+    Merkezlere (orijinal birimlerde) iş anlamlı segment adları verir.
+
+    Kümeler yıllık harcamaya göre sıralanır; dört kümede müşteri süresi en kısa
+    olan küme 'Yeni Müşteri' sayılır.
+    """
+    k = len(centroids)
+    spend = centroids[:, SEGMENT_FEATURES.index('yillik_harcama')]
+    tenure = centroids[:, SEGMENT_FEATURES.index('musteri_suresi')]
+    names = np.empty(k, dtype=object)
+    ranked = list(np.argsort(-spend))
+    if k == 4:
+        newest = int(np.argmin(tenure))
+        names[newest] = 'Yeni Müşteri'
+        ranked.remove(newest)
+    ladder = {1: ['Tüm Müşteriler'], 2: ['Yüksek Değer', 'Düşük Değer'],
+              3: ['Yüksek Değer', 'Orta Değer', 'Düşük Değer']}.get(len(ranked))
+    for rank, cluster in enumerate(ranked):
+        names[cluster] = ladder[rank] if ladder else f'Segment {rank + 1}'
+    return list(names)
+
+
+class CustomerSegmenter:
+    """
+    Standartlaştırma + mini-batch k-means + en yakın merkez ataması.
+
+    Args:
+        n_clusters: Küme sayısı; None ise K_CANDIDATES içinden silhouette ile seçilir
+        backend: Model arka ucu adı ('sklearn', 'numpy', 'compiled', 'auto' / None)
+        seed: Örnekleme ve başlangıç merkezleri için tohum
+    """
+
+    def __init__(self, n_clusters=None, backend=None, seed=42):
+        self.n_clusters = n_clusters
+        self.backend = backend
+        self.seed = seed
+        self.silhouette_scores = {}
+        self.centers = None
+
+    def _select_k(self, sample):
+        backend = get_backend(self.backend)
+        for k in K_CANDIDATES:
+            labels = backend.clusterer(k).fit(sample).labels_
+            self.silhouette_scores[k] = silhouette_score(sample, labels, seed=self.seed)
+        return max(self.silhouette_scores, key=self.silhouette_scores.get)
+
+    def _finish(self, model):
+        self.centers = np.asarray(model.cluster_centers_, dtype=np.float64)
+        self.n_clusters = len(self.centers)
+        self.centroids = self.centers * self.scaler.scale + self.scaler.mean
+        self.names = segment_names(self.centroids)
+        return self
+
+    def fit(self, data):
+        """Bellekteki müşteri tablosu (ya da n × 3 dizi) ile eğitir."""
+        X = _feature_array(data)
+        self.scaler = StreamingStandardizer(X.shape[1]).partial_fit(X)
+        X = self.scaler.transform(X)
+        rng = np.random.default_rng(self.seed)
+        sample = X[rng.choice(len(X), size=SELECTION_SAMPLE_SIZE, replace=False)] if len(X) > SELECTION_SAMPLE_SIZE else X
+        if self.n_clusters is None:
+            self.n_clusters = self._select_k(sample)
+        model = get_backend(self.backend).clusterer(self.n_clusters).fit(X)
+        self._finish(model)
+        self.silhouette_scores.setdefault(self.n_clusters, silhouette_score(X, self.assign_standardized(X), seed=self.seed))
+        return self
+
+    def fit_stream(self, make_chunks):
+        """
+        Parça parça okunan müşteri verisiyle eğitir; tablo hiçbir zaman belleğe alınmaz.
+
+        Args:
+            make_chunks: Her çağrıda (n × 3) özellik parçalarını baştan üreten fonksiyon
+        """
+        rng = np.random.default_rng(self.seed)
+        # 1. geçiş: ortalama / varyans ve k seçimi için rastgele örneklem
+        self.scaler = StreamingStandardizer(len(SEGMENT_FEATURES))
+        samples = []
+        for chunk in make_chunks():
+            chunk = _feature_array(chunk)
+            self.scaler.partial_fit(chunk)
+            samples.append(chunk[rng.random(len(chunk)) < 0.01])
+        sample = np.concatenate(samples)
+        if len(sample) > SELECTION_SAMPLE_SIZE:
+            sample = sample[rng.choice(len(sample), size=SELECTION_SAMPLE_SIZE, replace=False)]
+        sample = self.scaler.transform(sample)
+        if self.n_clusters is None:
+            self.n_clusters = self._select_k(sample)
+
+        # 2. geçiş: örneklemde eğitilen merkezler her parçadan bir mini-batch ile güncellenir
+        model = get_backend(self.backend).clusterer(self.n_clusters).fit(sample)
+        for chunk in make_chunks():
+            chunk = self.scaler.transform(_feature_array(chunk))
+            model.partial_fit(chunk[rng.integers(0, len(chunk), size=min(STREAM_BATCH_SIZE, len(chunk)))])
+        self._finish(model)
+        self.silhouette_scores.setdefault(self.n_clusters,
+                                          silhouette_score(sample, self.assign_standardized(sample), seed=self.seed))
+        return self
+
+    @property
+    def silhouette(self):
+        return self.silhouette_scores.get(self.n_clusters)
+
+    def assign_standardized(self, X, chunk_size=CHUNK_SIZE):
+        labels = np.empty(len(X), dtype=np.int32)
+        for start in range(0, len(X), chunk_size):
+            labels[start:start + chunk_size] = nearest_centroid(X[start:start + chunk_size], self.centers)[0]
+        return labels
+
+    def assign(self, data, chunk_size=CHUNK_SIZE):
+        """Müşterileri (eğitimde görülmemiş olanlar dahil) en yakın merkeze atar; küme indeksleri döner."""
+        X = _feature_array(data)
+        labels = np.empty(len(X), dtype=np.int32)
+        for start in range(0, len(X), chunk_size):
+            block = self.scaler.transform(X[start:start + chunk_size])
+            labels[start:start + chunk_size] = nearest_centroid(block, self.centers)[0]
+        return labels
+
+    def label(self, data):
+        """Segment adlarını kategorik seri olarak döndürür."""
+        return pd.Categorical.from_codes(self.assign(data), categories=self.names)
+
+    def summary(self):
+        """Segment merkezleri (orijinal birimlerde)."""
+        frame = pd.DataFrame(self.centroids, columns=SEGMENT_FEATURES)
+        frame.insert(0, 'segment', self.names)
+        return frame
+
+    def save(self, path=SEGMENT_MODEL_PATH, cache_key=''):
+        """Merkezleri ve standartlaştırma istatistiklerini kaydeder; cache_key eğitildiği veri / ayarları tanımlar."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp.npz'
+        np.savez(tmp_path, cache_key=np.array(cache_key), centers=self.centers, mean=self.scaler.mean, m2=self.scaler.m2,
+                 count=self.scaler.count, names=np.array(self.names),
+                 silhouette_k=np.array(list(self.silhouette_scores), dtype=np.int64),
+                 silhouette=np.array(list(self.silhouette_scores.values()), dtype=np.float64))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=SEGMENT_MODEL_PATH):
+        with np.load(path) as arrays:
+            segmenter = cls(n_clusters=len(arrays['centers']))
+            segmenter.scaler = StreamingStandardizer(arrays['centers'].shape[1])
+            segmenter.scaler.mean, segmenter.scaler.m2 = arrays['mean'], arrays['m2']
+            segmenter.scaler.count = int(arrays['count'])
+            segmenter.centers = arrays['centers']
+            segmenter.centroids = segmenter.centers * segmenter.scaler.scale + segmenter.scaler.mean
+            segmenter.names = [str(name) for name in arrays['names']]
+            segmenter.silhouette_scores = dict(zip(arrays['silhouette_k'].tolist(), arrays['silhouette'].tolist()))
+            segmenter.cache_key = str(arrays['cache_key']) if 'cache_key' in arrays else ''
+        return segmenter
+
+
+def _feature_array(data):
+    if isinstance(data, pd.DataFrame):
+        data = data[SEGMENT_FEATURES]
+    return np.asarray(data, dtype=np.float64)
+
+
+def _cache_key_text(key):
+    return '|'.join(map(str, key))
+
+
+def _load_segmenter(key):
+    """Diskteki model verilen anahtarla eğitilmişse yükler; yoksa ya da okunamazsa None."""
+    if not os.path.exists(SEGMENT_MODEL_PATH):
+        return None
+    try:
+        segmenter = CustomerSegmenter.load(SEGMENT_MODEL_PATH)
+    except (OSError, ValueError, KeyError):
+        return None
+    return segmenter if segmenter.cache_key == _cache_key_text(key) else None
+
+
+def cached_segmenter(data, n_clusters=None, backend=None, data_key=None):
+    """
+    Segment merkezlerini veri sürümü, küme sayısı ve arka uç başına bir kez eğitir.
+
+    Eğitilen model bellekte tutulur ve SEGMENT_MODEL_PATH dosyasına yazılır; süreç
+    yeniden başladığında dosyadaki model aynı anahtarla eğitilmişse yeniden eğitilmez.
+
+    Args:
+        data (DataFrame): Müşteri tablosu (SEGMENT_FEATURES sütunları)
+        n_clusters: Küme sayısı; None ise silhouette ile seçilir
+        backend: Model arka ucu adı
+        data_key: Verinin sürüm anahtarı; verilmezse veriden hash hesaplanır
+
+    Returns:
+        CustomerSegmenter
+    """
+    if data_key is None:
+        data_key = hashlib.sha1(pd.util.hash_pandas_object(data[SEGMENT_FEATURES], index=False)
+                                .to_numpy().tobytes()).hexdigest()
+    key = (data_key, n_clusters, get_backend(backend).name)
+    segmenter = _segmenter_cache.pop(key, None)
+    if segmenter is None:
+        segmenter = _load_segmenter(key)
+    if segmenter is None:
+        segmenter = CustomerSegmenter(n_clusters=n_clusters, backend=backend).fit(data)
+        try:
+            segmenter.save(cache_key=_cache_key_text(key))
+        except OSError:
+            pass  # disk önbelleği isteğe bağlı; yazılamazsa yalnızca bellekte tutulur
+    _segmenter_cache[key] = segmenter
+    while len(_segmenter_cache) > MEMORY_CACHE_SIZE:
+        _segmenter_cache.pop(next(iter(_segmenter_cache)))
+    return segmenter
+
+
+def benchmark_segmentation(n_customers=10_000_000, chunk_size=CHUNK_SIZE, backend=None, n_clusters=None):
+    """Parça parça üretilen müşterilerle eğitim ve atama süresini, tepe bellek kullanımını ölçer."""
+    def make_chunks():
+        for index, start in enumerate(range(0, n_customers, chunk_size)):
+            yield customer_features(min(chunk_size, n_customers - start), np.random.default_rng(index))[0]
+
+    backend_name = get_backend(backend).name  # arka uç import süresi ölçüme girmesin
+    tracemalloc.start()
+    start = time.perf_counter()
+    segmenter = CustomerSegmenter(n_clusters=n_clusters, backend=backend).fit_stream(make_chunks)
+    fit_seconds = time.perf_counter() - start
+
+    assign_seconds = 0.0
+    counts = np.zeros(segmenter.n_clusters, dtype=np.int64)
+    for chunk in make_chunks():
+        start = time.perf_counter()
+        counts += np.bincount(segmenter.assign(chunk), minlength=segmenter.n_clusters)
+        assign_seconds += time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    full_matrix = n_customers * len(SEGMENT_FEATURES) * 8
+    print(f"{n_customers:,} müşteri, {chunk_size:,} satırlık parçalar, arka uç: {backend_name}")
+    print("  silhouette: " + ', '.join(f"k={k}: {score:.3f}" for k, score in segmenter.silhouette_scores.items()))
+    print(f"  eğitim (istatistik + mini-batch geçişi, veri üretimi dahil) {fit_seconds:6.2f} sn")
+    print(f"  atama {assign_seconds:6.2f} sn ({n_customers / assign_seconds:,.0f} müşteri/sn)")
+    print(f"  tepe bellek {peak / 2 ** 20:,.0f} MB (tam özellik matrisi {full_matrix / 2 ** 20:,.0f} MB)")
+    for name, count in zip(segmenter.names, counts):
+        print(f"    {name:>14}: {count:>12,}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mini-batch k-means müşteri segmentasyonu")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    bench_parser = subparsers.add_parser('benchmark', help="Akışlı eğitim ve atama verimini ölç")
+    bench_parser.add_argument('--customers', type=int, default=10_000_000)
+    bench_parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    bench_parser.add_argument('--backend', default=None, help="sklearn, numpy, compiled ya da auto")
+    bench_parser.add_argument('--clusters', type=int, default=None, help="Verilmezse silhouette ile seçilir")
+
+    args = parser.parse_args(argv)
+    if args.command == 'benchmark':
+        benchmark_segmentation(args.customers, args.chunk_size, args.backend, args.clusters)
+
+
+if __name__ == '__main__':
+    main()
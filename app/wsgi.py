@@ -12,6 +12,8 @@ import threading
 import signal
 import time
 
+from app.churn_service import setup_churn_routes
+
 # Streamlit'i çalıştıran thread
 def run_streamlit():
     sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
@@ -33,6 +35,7 @@ streamlit_process = run_streamlit()
 
 # Düzenli olarak sistemin çalışıp çalışmadığını kontrol eden heartbeat
 async def heartbeat_checker():
+    global streamlit_process
     while True:
         # Log çıktısı
         print(f"[{time.ctime()}] Heartbeat kontrol ediliyor...")
@@ -42,7 +45,6 @@ async def heartbeat_checker():
             if streamlit_process.poll() is not None:
                 print("Streamlit süreci çökmüş, yeniden başlatılıyor...")
                 # Streamlit'i yeniden başlat
-                global streamlit_process
                 streamlit_process = run_streamlit()
                 
         except Exception as e:
@@ -59,6 +61,7 @@ async def handle(request):
 app = web.Application()
 app.router.add_get("/", handle)
 app.router.add_get("/health", handle)  # Sağlık kontrolü endpoint'i
+setup_churn_routes(app)  # Mikro-gruplu churn skorlama: /score/churn, /metrics/churn, /metrics/churn/drift
 
 # WSGI/ASGI adaptörü
 def wsgi_app(environ, start_response):
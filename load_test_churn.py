@@ -0,0 +1,120 @@
+"""
+/score/churn endpoint'i için yerel yük testi.
+Eşzamanlı istemcilerle istek gönderir; istemci tarafı gecikme yüzdeliklerini ve
+sunucunun /metrics/churn çıktısını (p50/p99, grup boyutları) raporlar.
+
+Kullanım:
+    python load_test_churn.py --local                      # Servisi bu süreçte başlatıp test eder
+    python load_test_churn.py --url http://localhost:8000  # Çalışan sunucuyu test eder
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import aiohttp
+import numpy as np
+from aiohttp import web
+
+from app.churn import generate_churn_data
+from app.churn_service import load_registered_model, setup_churn_routes, NDJSON_CONTENT_TYPE
+
+
+def build_payloads(n_requests, rows_per_request, ndjson=False, seed=0):
+    """Sentetik müşterilerden istek gövdeleri hazırlar."""
+    customers = generate_churn_data(n_customers=n_requests * rows_per_request, seed=seed).drop(columns='IsChurned')
+    records = json.loads(customers.to_json(orient='records', force_ascii=False))
+    chunks = [records[i:i + rows_per_request] for i in range(0, len(records), rows_per_request)]
+    if ndjson:
+        return ['\n'.join(json.dumps(record, ensure_ascii=False) for record in chunk) for chunk in chunks]
+    return [json.dumps({'customers': chunk}, ensure_ascii=False) for chunk in chunks]
+
+
+async def run_load_test(url, n_requests=2000, concurrency=64, rows_per_request=1, ndjson=False):
+    """İstekleri `concurrency` eşzamanlı istemciyle gönderir ve gecikme özetini döndürür."""
+    payloads = build_payloads(n_requests, rows_per_request, ndjson)
+    content_type = NDJSON_CONTENT_TYPE if ndjson else 'application/json'
+    latencies = np.empty(len(payloads))
+    queue = asyncio.Queue()
+    for i in range(len(payloads)):
+        queue.put_nowait(i)
+
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=concurrency)) as session:
+        async def client():
+            while not queue.empty():
+                i = queue.get_nowait()
+                start = time.perf_counter()
+                async with session.post(f'{url}/score/churn', data=payloads[i].encode('utf-8'),
+                                        headers={'Content-Type': content_type}) as response:
+                    response.raise_for_status()
+                    await response.read()
+                latencies[i] = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        seconds = time.perf_counter() - start
+
+        async with session.get(f'{url}/metrics/churn') as response:
+            server_metrics = await response.json()
+
+    p50, p99 = np.percentile(latencies, [50, 99])
+    return {
+        'requests': len(payloads),
+        'rows': len(payloads) * rows_per_request,
+        'seconds': seconds,
+        'requests_per_sec': len(payloads) / seconds,
+        'client_p50_ms': p50,
+        'client_p99_ms': p99,
+        'server': server_metrics,
+    }
+
+
+async def run_local(port, max_batch_size=None, max_wait_ms=None, engine=None, **options):
+    """Servisi (Streamlit olmadan) bu süreçte başlatıp yük testini çalıştırır."""
+    batcher_options = {name: value for name, value in (('max_batch_size', max_batch_size),
+                                                       ('max_wait_ms', max_wait_ms)) if value is not None}
+    app = setup_churn_routes(web.Application(), model=load_registered_model(engine), **batcher_options)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', port).start()
+    try:
+        return await run_load_test(f'http://127.0.0.1:{port}', **options)
+    finally:
+        await runner.cleanup()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Churn skorlama endpoint'i yük testi")
+    parser.add_argument('--url', default='http://localhost:8000')
+    parser.add_argument('--local', action='store_true', help="Servisi bu süreçte başlat")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--rows-per-request', type=int, default=1)
+    parser.add_argument('--ndjson', action='store_true')
+    parser.add_argument('--max-batch-size', type=int, help="Yalnızca --local: mikro-grup boyutu")
+    parser.add_argument('--max-wait-ms', type=float, help="Yalnızca --local: mikro-grup bekleme süresi")
+    parser.add_argument('--engine', choices=['auto', 'onnx', 'compiled', 'sklearn'],
+                        help="Yalnızca --local: skorlama motoru (varsayılan: CHURN_SCORING_ENGINE)")
+    args = parser.parse_args(argv)
+
+    options = {'n_requests': args.requests, 'concurrency': args.concurrency,
+               'rows_per_request': args.rows_per_request, 'ndjson': args.ndjson}
+    if args.local:
+        stats = asyncio.run(run_local(args.port, max_batch_size=args.max_batch_size,
+                                      max_wait_ms=args.max_wait_ms, engine=args.engine, **options))
+    else:
+        stats = asyncio.run(run_load_test(args.url, **options))
+
+    server = stats['server']
+    print(f"{stats['requests']:,} istek ({stats['rows']:,} satır) {stats['seconds']:.2f} sn içinde "
+          f"-> {stats['requests_per_sec']:,.0f} istek/sn")
+    print(f"İstemci gecikmesi: p50 {stats['client_p50_ms']:.2f} ms, p99 {stats['client_p99_ms']:.2f} ms")
+    print(f"Sunucu gecikmesi:  p50 {server['latency_p50_ms']:.2f} ms, p99 {server['latency_p99_ms']:.2f} ms")
+    print(f"Mikro-gruplar: {server['batches']:,} grup, ortalama {server['batch_size_mean']:.1f} satır, "
+          f"en fazla {server['batch_size_max']} satır (model: {server['model']})")
+
+
+if __name__ == '__main__':
+    main()